@@ -11,7 +11,7 @@ a = Analysis(
         ('assets/changelog/changelog.txt', 'assets/changelog'),
         ('assets/Subtle.ico', 'assetx'),
     ],
-    hiddenimports=[],
+    hiddenimports=['markdown', 'qtawesome'],  # Loaded through lazy_import, which PyInstaller cannot follow
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
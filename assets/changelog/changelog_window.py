@@ -3,7 +3,9 @@ from PyQt5.QtWidgets import (QMainWindow, QApplication, QVBoxLayout, QWidget, QL
 from PyQt5.QtGui import QPalette, QFont, QPainter
 from PyQt5.QtCore import Qt
 import os
-import qtawesome as qta
+from assets.modules.lazy_loader import lazy_import
+
+qta = lazy_import('qtawesome')
 
 class VersionBlock(QWidget):
     def __init__(self, version, changes, parent=None):
@@ -0,0 +1,96 @@
+import os
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QLineEdit, QComboBox, QFileDialog, QMessageBox
+from subtl.core import DEFAULT_TEMPLATE, create_output_dirs, plan_fan_out, plan_outputs
+from assets.modules.theme import set_role
+
+COLLISION_LABELS = {
+    "overwrite": "Overwrite",
+    "rename": "Keep both (add a number)",
+    "skip": "Skip the file",
+    "error": "Stop before writing",
+}
+
+def flat_outputs(outputs):
+    """Returns (file_path, save_path) per planned output, spreading a fan-out plan into one pair per format."""
+    flat = []
+    for file_path, save_path in outputs:
+        if isinstance(save_path, list):
+            flat.extend((file_path, target_path) for _, target_path in save_path)
+        else:
+            flat.append((file_path, save_path))
+    return flat
+
+class BatchOutputOptions(QWidget):
+    """Output folder, file name template and collision policy for writing a batch without a dialog per file."""
+
+    def __init__(self, template=DEFAULT_TEMPLATE, parent=None):
+        super().__init__(parent)
+        self.output_dir = ""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        folder_layout = QHBoxLayout()
+        self.folder_button = QPushButton("Select Output Folder")
+        set_role(self.folder_button, "action")
+        self.folder_button.clicked.connect(self.select_output_dir)
+        folder_layout.addWidget(self.folder_button)
+        self.folder_label = QLabel("No output folder selected")
+        folder_layout.addWidget(self.folder_label, 1)
+        layout.addLayout(folder_layout)
+
+        template_layout = QHBoxLayout()
+        template_layout.addWidget(QLabel("File names:"))
+        self.template_input = QLineEdit(template)
+        self.template_input.setToolTip("Fields: {stem} {base} {lang} {ext} {fmt} {index} {parent}\n"
+                                       "e.g. {base}.{lang}.{fmt} or {lang}/{stem}.{fmt}")
+        template_layout.addWidget(self.template_input, 1)
+        template_layout.addWidget(QLabel("If a file exists:"))
+        self.collision_dropdown = QComboBox()
+        # Overwrite comes first, so the tools default to the same policy as the command line
+        for policy in COLLISION_LABELS:
+            self.collision_dropdown.addItem(COLLISION_LABELS[policy], policy)
+        template_layout.addWidget(self.collision_dropdown)
+        layout.addLayout(template_layout)
+
+    def select_output_dir(self):
+        output_dir = QFileDialog.getExistingDirectory(self, "Select Output Folder", self.output_dir)
+        if output_dir:
+            self.output_dir = output_dir
+            self.folder_label.setText(output_dir)
+        return output_dir
+
+    def plan(self, file_paths, fmt=None):
+        """Returns (file_path, save_path) pairs for a batch, save_path None for skipped files, or None if it cannot be written.
+
+        Asks for the output folder once if none is selected yet, and creates any
+        subfolders the template names. With a list of formats the pairs are
+        (file_path, [(fmt, save_path), ...]) as from plan_fan_out, again with
+        save_path None for the formats that are skipped.
+        """
+        if not self.output_dir and not self.select_output_dir():
+            return None
+        template = self.template_input.text().strip() or DEFAULT_TEMPLATE
+        collision = self.collision_dropdown.currentData()
+        try:
+            if isinstance(fmt, list):
+                outputs = plan_fan_out(file_paths, self.output_dir, template, fmt, collision)
+                create_output_dirs(flat_outputs(outputs))
+            else:
+                outputs = plan_outputs(file_paths, self.output_dir, template, fmt, collision)
+                create_output_dirs(outputs)
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return None
+        return outputs
+
+    def summary(self, succeeded, outputs):
+        """Describes how a planned batch went; succeeded and the counts below are output files, not inputs."""
+        outputs = flat_outputs(outputs)
+        skipped = sum(1 for _, save_path in outputs if not save_path)
+        failed = len(outputs) - skipped - succeeded
+        message = f"{succeeded} files written to {os.path.normpath(self.output_dir)}."
+        if skipped:
+            message += f"\n{skipped} skipped because their results already exist."
+        if failed:
+            message += f"\n{failed} failed, see the log for details."
+        return message
@@ -1,5 +1,32 @@
+import atexit
+import copy
 import json
 import os
+import threading
+import weakref
+
+# Seconds to wait after the last change before writing, so a burst of setters costs one write
+SAVE_DELAY = 0.5
+
+# Configs with changes that have not reached the disk yet, flushed when the app exits
+_pending_configs = weakref.WeakSet()
+
+def flush_configs():
+    """Writes every pending config change to disk now."""
+    for config in list(_pending_configs):
+        config.flush()
+
+atexit.register(flush_configs)
+
+# The Config shared by the whole app, created on first use by get_config()
+_shared_config = None
+
+def get_config():
+    """Returns the process-wide Config, reading config.json only the first time."""
+    global _shared_config
+    if _shared_config is None:
+        _shared_config = Config()
+    return _shared_config
 
 class Config:
     CONFIG_FILE = os.path.join(os.path.dirname(__file__), "config.json")
@@ -9,14 +36,23 @@ class Config:
             "safe_area_size": 0,
             "text_size": "small",  # Default text size
             "theme": "dark",       # Default theme
+            "help_viewer": "lite", # Help viewer: "lite" (QTextBrowser) or "full" (QWebEngineView)
             "recent_tools": [],    # Default recent tools
             "tool_usage": {}       # Default tool usage
         }
         self.source = source
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.RLock()
+        # Weak references to change callbacks, see subscribe()
+        self._observers = []
         self.load()
 
     def load(self):
         """Load configuration data from the config file."""
+        # Pending changes go to disk first so reading the file does not undo them
+        self.flush()
+        previous = dict(self.data)
         if os.path.exists(self.CONFIG_FILE):
             try:
                 with open(self.CONFIG_FILE, "r") as file:
@@ -36,25 +72,82 @@ class Config:
         else:
             print("Config file does not exist, using default values.")
 
-        if self.source:
-            print(f"Config loaded by {self.source}: {self.data}")
-        else:
-            print(f"Config loaded: {self.data}")
+        print(f"Config loaded by {self.source} from {self.CONFIG_FILE}" if self.source else f"Config loaded from {self.CONFIG_FILE}")
+
+        for key, value in self.data.items():
+            if previous.get(key) != value:
+                self._notify(key, value)
     def save(self):
-        """Save configuration data to the config file."""
-        try:
-            with open(self.CONFIG_FILE, "w") as file:
-                json.dump(self.data, file, indent=4)
-                file.flush()  # Ensure data is written to disk
-                os.fsync(file.fileno())  # Ensure file is fully written and closed
-            
-            if self.source:
-                print(f"Config saved by {self.source}: {self.data}")
-            else:
-                print(f"Config saved: {self.data}")
-        
-        except Exception as e:
-            print(f"Failed to save config file: {e}")
+        """Schedule the configuration data to be written once changes settle for SAVE_DELAY seconds."""
+        with self._lock:
+            self._dirty = True
+            _pending_configs.add(self)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(SAVE_DELAY, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending configuration changes to the config file now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            _pending_configs.discard(self)
+            content = json.dumps(self.data, indent=4)
+            # Write a temp file and rename it over the config, so a crash never leaves a half-written file
+            temp_path = f"{self.CONFIG_FILE}.tmp"
+            try:
+                with open(temp_path, "w") as file:
+                    file.write(content)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.replace(temp_path, self.CONFIG_FILE)
+                print(f"Config saved by {self.source}" if self.source else "Config saved")
+            except Exception as e:
+                print(f"Failed to save config file: {e}")
+
+    def set_value(self, key, value):
+        """Store a copy of value under key, schedule a save and notify subscribers if it changed."""
+        with self._lock:
+            changed = self.data.get(key) != value
+            # Copied so callers can keep mutating their own dict or list while a write is pending
+            self.data[key] = copy.deepcopy(value)
+        self.save()
+        if changed:
+            self._notify(key, value)
+
+    def subscribe(self, callback):
+        """Call callback(key, value) after every change to a setting.
+
+        Bound methods are held weakly, so a subscribed widget can still be
+        garbage collected; subscribers whose Qt object was deleted are dropped.
+        """
+        if hasattr(callback, "__self__"):
+            self._observers.append(weakref.WeakMethod(callback))
+        else:
+            self._observers.append(lambda: callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling a callback passed to subscribe()."""
+        self._observers = [ref for ref in self._observers if ref() not in (None, callback)]
+
+    def _notify(self, key, value):
+        for ref in list(self._observers):
+            callback = ref()
+            try:
+                if callback is not None:
+                    callback(key, value)
+                    continue
+            except RuntimeError as e:
+                # The subscriber's underlying Qt widget has already been deleted
+                print(f"Dropping config subscriber: {e}")
+            if ref in self._observers:
+                self._observers.remove(ref)
 
     def get_safe_area_size(self):
         return self.data.get("safe_area_size", 0)
@@ -62,8 +155,7 @@ class Config:
     def set_safe_area_size(self, size):
         if not isinstance(size, int):
             raise ValueError(f"Invalid type for safe_area_size: Expected int, got {type(size).__name__}")
-        self.data["safe_area_size"] = size
-        self.save()
+        self.set_value("safe_area_size", size)
 
     def get_text_size(self):
         return self.data.get("text_size", "small")
@@ -71,8 +163,7 @@ class Config:
     def set_text_size(self, size):
         if not isinstance(size, str):
             raise ValueError(f"Invalid type for text_size: Expected str, got {type(size).__name__}")
-        self.data["text_size"] = size
-        self.save()
+        self.set_value("text_size", size)
 
     def get_theme(self):
         return self.data.get("theme", "dark")
@@ -80,23 +171,28 @@ class Config:
     def set_theme(self, theme):
         if not isinstance(theme, str):
             raise ValueError(f"Invalid type for theme: Expected str, got {type(theme).__name__}")
-        self.data["theme"] = theme
-        self.save()
+        self.set_value("theme", theme)
+
+    def get_help_viewer(self):
+        return self.data.get("help_viewer", "lite")
+
+    def set_help_viewer(self, viewer):
+        if not isinstance(viewer, str):
+            raise ValueError(f"Invalid type for help_viewer: Expected str, got {type(viewer).__name__}")
+        self.set_value("help_viewer", viewer)
 
     def get_tool_usage(self):
-        return self.data.get("tool_usage", {})
+        return dict(self.data.get("tool_usage", {}))
 
     def set_tool_usage(self, tool_usage):
         if not isinstance(tool_usage, dict):
             raise ValueError(f"Invalid type for tool_usage: Expected dict, got {type(tool_usage).__name__}")
-        self.data["tool_usage"] = tool_usage
-        self.save()
+        self.set_value("tool_usage", tool_usage)
 
     def get_recent_tools(self):
-        return self.data.get("recent_tools", [])
+        return list(self.data.get("recent_tools", []))
 
     def set_recent_tools(self, recent_tools):
         if not isinstance(recent_tools, list):
             raise ValueError(f"Invalid type for recent_tools: Expected list, got {type(recent_tools).__name__}")
-        self.data["recent_tools"] = recent_tools
-        self.save()
+        self.set_value("recent_tools", recent_tools)
@@ -1,7 +1,9 @@
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QPushButton, QTabBar, QApplication, QSpacerItem, QSizePolicy
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QPalette, QColor, QCursor
-import qtawesome as qta 
+from assets.modules.lazy_loader import lazy_import
+
+qta = lazy_import('qtawesome')
 
 class CustomWindowBar(QWidget):
     def __init__(self, parent=None, app=None):
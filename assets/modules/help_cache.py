@@ -0,0 +1,115 @@
+"""Rendered help cache.
+
+Rendering help.md with the extra, codehilite and toc extensions imports
+markdown and pygments and takes far longer than showing the result, so the
+styled HTML and the header list are kept in a cache file. Each source is
+recorded with its mtime, size and SHA-256: unchanged stamps reuse the cache
+without reading the sources, and a touched file with the same content only
+refreshes the stamps.
+"""
+
+import hashlib
+import json
+import os
+import re
+from assets.modules.lazy_loader import lazy_import
+
+markdown = lazy_import('markdown')
+
+# Bump when the rendering below changes, so caches written by older versions are ignored
+CACHE_VERSION = 1
+# Per-user cache, since a one-file build unpacks the modules into a fresh folder on every launch
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "subtl", "help_cache.json")
+
+HEADER_PATTERN = re.compile(r'^(#+)[ \t]+(.*)', re.MULTILINE)
+
+# Help rendered in this process, keyed by the source stamps it was rendered from
+_rendered = {}
+
+def file_stamp(path):
+    """Returns [mtime_ns, size] for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def read_text(path):
+    """Returns the content of a UTF-8 text file, or an empty string if it does not exist."""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    return ""
+
+def extract_headers(markdown_content):
+    """Returns (level, title) for every header in the markdown content."""
+    return [(len(hashes), title.strip()) for hashes, title in HEADER_PATTERN.findall(markdown_content)]
+
+def render_html(markdown_content, css_content):
+    """Converts markdown to HTML wrapped with the given CSS."""
+    html_content = markdown.markdown(markdown_content, extensions=['extra', 'codehilite', 'toc'], output_format='html5')
+    return f"""
+        <html>
+            <head>
+                <style>{css_content}</style>
+            </head>
+            <body>
+                {html_content}
+            </body>
+        </html>
+        """
+
+def read_cache():
+    """Returns the contents of the cache file, or None if it is missing, unreadable or from another version."""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+    return cache
+
+def write_cache(cache):
+    """Writes the cache file through a temp file so readers never see a partial cache."""
+    temp_path = f"{CACHE_FILE}.tmp"
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(temp_path, CACHE_FILE)
+    except OSError as e:
+        # The cache only saves time; help still works without it
+        print(f"Failed to write help cache: {e}")
+
+def load_help(markdown_path, css_path):
+    """Returns (styled HTML, headers) for the help, rendering only when the sources changed."""
+    stamps = [file_stamp(markdown_path), file_stamp(css_path)]
+    key = json.dumps(stamps)
+    if key in _rendered:
+        return _rendered[key]
+
+    cache = read_cache()
+    if cache is not None and cache.get("stamps") == stamps:
+        result = cache["html"], [tuple(header) for header in cache["headers"]]
+        _rendered[key] = result
+        return result
+
+    markdown_content = read_text(markdown_path)
+    css_content = read_text(css_path)
+    digest = hashlib.sha256(f"{markdown_content}\0{css_content}".encode('utf-8')).hexdigest()
+    if cache is not None and cache.get("digest") == digest:
+        # Touched but unchanged, e.g. after a checkout; keep the HTML and record the new stamps
+        cache["stamps"] = stamps
+    else:
+        cache = {
+            "version": CACHE_VERSION,
+            "stamps": stamps,
+            "digest": digest,
+            "html": render_html(markdown_content, css_content),
+            "headers": extract_headers(markdown_content),
+        }
+    write_cache(cache)
+    result = cache["html"], [tuple(header) for header in cache["headers"]]
+    _rendered[key] = result
+    return result
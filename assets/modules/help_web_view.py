@@ -0,0 +1,21 @@
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage
+from PyQt5.QtGui import QDesktopServices
+
+class ExternalLinkWebView(QWebEngineView):
+    """Custom QWebEngineView to handle external link opening."""
+    def __init__(self):
+        super().__init__()
+        self.setPage(ExternalLinkPage(self))
+
+    def scroll_to_anchor(self, anchor):
+        self.page().runJavaScript(f"document.getElementById('{anchor}').scrollIntoView();")
+
+class ExternalLinkPage(QWebEnginePage):
+    """Page that opens clicked http(s) links in the default web browser."""
+    def acceptNavigationRequest(self, url, type_, is_main_frame):
+        # Check if the navigation request is for an external URL
+        if type_ == QWebEnginePage.NavigationTypeLinkClicked and url.scheme() in ("http", "https"):
+            # Open the URL in the default web browser
+            QDesktopServices.openUrl(url)
+            return False  # Prevent the link from being opened in the QWebEngineView
+        return super().acceptNavigationRequest(url, type_, is_main_frame)
@@ -1,12 +1,14 @@
 import os
 import sys
 import re
-import markdown
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QSplitter, QPushButton
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QSplitter, QPushButton, QTextBrowser
 from PyQt5.QtCore import Qt, QUrl
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtGui import QFont, QDesktopServices
-import qtawesome as qta  # Import QtAwesome for icons
+from PyQt5.QtGui import QFont
+from assets.modules.config import get_config
+from assets.modules.help_cache import load_help
+from assets.modules.lazy_loader import lazy_import
+
+qta = lazy_import('qtawesome')
 
 def resource_path(relative_path):
     """Get the absolute path to a resource. Works for dev and PyInstaller."""
@@ -21,59 +23,30 @@ class HelpWindow(QWidget):
         self.setWindowTitle("Help")
         self.setGeometry(100, 100, 800, 600)  # Set the size of the window
 
-        # Load markdown and CSS files using resource_path
+        # Rendered HTML and headers come from the help cache, markdown only runs when help.md or styles.css changed
         self.markdown_file_path = resource_path("assets/modules/help.md")
-        self.markdown_content = self.read_markdown_file()
-        self.headers = self.extract_headers(self.markdown_content)
-        self.html_content = self.convert_to_html_with_styling()
+        self.css_file_path = resource_path("assets/modules/styles.css")
+        self.html_content, self.headers = load_help(self.markdown_file_path, self.css_file_path)
 
         # Initialize the UI
         self.setup_ui()
 
-    def read_markdown_file(self):
-        """Read the markdown file and return its content."""
-        if os.path.exists(self.markdown_file_path):
-            with open(self.markdown_file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        return ""
-
-    def extract_headers(self, markdown_content):
-        """Extract headers and subheaders from the markdown content."""
-        headers = []
-        lines = markdown_content.split('\n')
-        for line in lines:
-            match = re.match(r'^(#+)\s+(.*)', line)
-            if match:
-                level = len(match.group(1))  # Number of '#' indicates the header level
-                title = match.group(2).strip()
-                headers.append((level, title))
-        return headers
-
-    def convert_to_html_with_styling(self):
-        """Convert markdown to styled HTML using a custom CSS file."""
-        # Define markdown extensions for syntax highlighting, table of contents, and unique IDs
-        extensions = ['extra', 'codehilite', 'toc']
-        html_content = markdown.markdown(self.markdown_content, extensions=extensions, output_format='html5')
-
-        # Load custom CSS for styling
-        css_path = resource_path("assets/modules/styles.css")
-        css_content = ""
-        if os.path.exists(css_path):
-            with open(css_path, 'r', encoding='utf-8') as f:
-                css_content = f.read()
-
-        # Wrap the HTML content with the CSS
-        styled_html = f"""
-        <html>
-            <head>
-                <style>{css_content}</style>
-            </head>
-            <body>
-                {html_content}
-            </body>
-        </html>
+    def create_viewer(self):
+        """Create the help viewer selected in the settings.
+
+        The lite viewer is a QTextBrowser; the full viewer renders with
+        QWebEngineView, which starts a Chromium process, and is only imported
+        when selected. Falls back to the lite viewer if QtWebEngine is missing.
         """
-        return styled_html
+        if get_config().get_help_viewer() == "full":
+            try:
+                from assets.modules.help_web_view import ExternalLinkWebView
+                return ExternalLinkWebView()
+            except ImportError as e:
+                print(f"Full help viewer unavailable, using the lite viewer: {e}")
+        viewer = QTextBrowser()
+        viewer.setOpenExternalLinks(True)  # Open http(s) links in the default web browser
+        return viewer
 
     def setup_ui(self):
         # Main layout using QSplitter for resizable panels
@@ -114,8 +87,8 @@ class HelpWindow(QWidget):
         self.section_list.itemClicked.connect(self.scroll_to_section)
         left_layout.addWidget(self.section_list)
 
-        # Right panel: Markdown viewer using QWebEngineView
-        self.markdown_viewer = ExternalLinkWebView()
+        # Right panel: Markdown viewer
+        self.markdown_viewer = self.create_viewer()
         self.markdown_viewer.setHtml(self.html_content)  # Display the styled HTML content
 
         # Add widgets to the splitter
@@ -129,7 +102,10 @@ class HelpWindow(QWidget):
         """Scroll to the selected section in the markdown viewer."""
         selected_title = item.data(Qt.UserRole)
         anchor = self.generate_anchor(selected_title)
-        self.markdown_viewer.page().runJavaScript(f"document.getElementById('{anchor}').scrollIntoView();")
+        if isinstance(self.markdown_viewer, QTextBrowser):
+            self.markdown_viewer.scrollToAnchor(anchor)
+        else:
+            self.markdown_viewer.scroll_to_anchor(anchor)
 
     def generate_anchor(self, title):
         """Generate an anchor name for a given header title."""
@@ -145,16 +121,3 @@ class HelpWindow(QWidget):
         else:
             self.section_list.show()
             self.toggle_button.setIcon(qta.icon('fa5s.angle-left'))
-
-class ExternalLinkWebView(QWebEngineView):
-    """Custom QWebEngineView to handle external link opening."""
-    def __init__(self):
-        super().__init__()
-
-    def acceptNavigationRequest(self, url, type_, is_main_frame):
-        # Check if the navigation request is for an external URL
-        if type_ == QWebEnginePage.NavigationTypeLinkClicked and url.scheme() == "http" or url.scheme() == "https":
-            # Open the URL in the default web browser
-            QDesktopServices.openUrl(url)
-            return False  # Prevent the link from being opened in the QWebEngineView
-        return super().acceptNavigationRequest(url, type_, is_main_frame)
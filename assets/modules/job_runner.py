@@ -0,0 +1,132 @@
+"""Runs tool operations on a QThreadPool so the window stays responsive.
+
+A Job wraps one subtl.core style call, passes it a progress callback and a
+CancelToken, and reports back through Qt signals, which are delivered to the
+widget on the GUI thread. JobProgress is the matching progress bar with an
+ETA and a Cancel button that tools drop into their layout.
+"""
+
+import time
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QProgressBar, QPushButton
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from subtl.core import CancelToken, JobCancelled
+
+# Jobs that are queued or running, kept referenced so Python does not collect them under the pool
+_active_jobs = set()
+
+class JobSignals(QObject):
+    progress = pyqtSignal(int, int, float)  # done, total, seconds left (-1 while unknown)
+    finished = pyqtSignal(object)  # the operation's return value
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+class Job(QRunnable):
+    """Runs function(*args, progress=..., cancel=..., **kwargs) on a worker thread."""
+
+    def __init__(self, function, *args, **kwargs):
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.token = CancelToken()
+        self.started = None
+
+    def cancel(self):
+        """Asks the operation to stop at its next check."""
+        self.token.cancel()
+
+    def report_progress(self, done, total):
+        elapsed = time.perf_counter() - self.started
+        eta = elapsed * (total - done) / done if done and total else -1.0
+        self.signals.progress.emit(done, total, eta)
+
+    def run(self):
+        self.started = time.perf_counter()
+        try:
+            result = self.function(*self.args, progress=self.report_progress, cancel=self.token, **self.kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            print(f"Job {getattr(self.function, '__name__', self.function)} failed: {e}")
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            _active_jobs.discard(self)
+
+def start_job(function, *args, on_finished=None, on_failed=None, on_cancelled=None, on_progress=None, **kwargs):
+    """Queues function on the global thread pool and returns its Job; callbacks run on the GUI thread."""
+    job = Job(function, *args, **kwargs)
+    for signal, callback in ((job.signals.finished, on_finished), (job.signals.failed, on_failed),
+                             (job.signals.cancelled, on_cancelled), (job.signals.progress, on_progress)):
+        if callback is not None:
+            signal.connect(callback)
+    job.setAutoDelete(False)
+    _active_jobs.add(job)
+    QThreadPool.globalInstance().start(job)
+    return job
+
+def format_eta(seconds):
+    """Formats a number of seconds left as a short ETA label."""
+    if seconds < 0:
+        return "Estimating time left..."
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    if minutes:
+        return f"About {minutes}m {seconds:02}s left"
+    return f"About {seconds}s left"
+
+class JobProgress(QWidget):
+    """Progress bar, ETA and Cancel button for the job a tool is running; hidden while idle."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.job = None
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_bar = QProgressBar(self)
+        self.eta_label = QLabel("", self)
+        self.cancel_button = QPushButton("Cancel", self)
+        self.cancel_button.clicked.connect(self.cancel)
+        layout.addWidget(self.progress_bar, 1)
+        layout.addWidget(self.eta_label)
+        layout.addWidget(self.cancel_button)
+        self.hide()
+
+    def is_busy(self):
+        """Returns whether a job is still running."""
+        return self.job is not None
+
+    def run(self, function, *args, on_finished=None, on_failed=None, on_cancelled=None, **kwargs):
+        """Starts function as a job and shows its progress until it ends."""
+        self.progress_bar.setRange(0, 0)  # Busy indicator until the first report
+        self.eta_label.setText(format_eta(-1))
+        self.cancel_button.setEnabled(True)
+        self.show()
+        self.job = start_job(
+            function, *args,
+            on_progress=self.update_progress,
+            on_finished=lambda result: self.done(on_finished, result),
+            on_failed=lambda message: self.done(on_failed, message),
+            on_cancelled=lambda: self.done(on_cancelled),
+            **kwargs,
+        )
+        return self.job
+
+    def update_progress(self, done, total, eta):
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+        self.eta_label.setText(format_eta(eta))
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_button.setEnabled(False)
+            self.eta_label.setText("Cancelling...")
+
+    def done(self, callback, *result):
+        self.job = None
+        self.hide()
+        if callback is not None:
+            callback(*result)
@@ -0,0 +1,55 @@
+"""Deferred imports and a startup timing report.
+
+Heavy optional modules such as qtawesome and markdown are bound to LazyModule
+stand-ins that import the real module on first attribute access, so they only
+cost startup time once something actually uses them. Every deferred import and
+every milestone passed to mark() is timed for startup_report().
+"""
+
+import importlib
+import time
+
+# Reference point for the report; main.py imports this module before anything heavy
+STARTED = time.perf_counter()
+
+# (label, ms since STARTED, ms taken or None) for each milestone and deferred import
+_events = []
+
+def elapsed_ms():
+    """Returns the milliseconds since this module was imported."""
+    return (time.perf_counter() - STARTED) * 1000
+
+def mark(label):
+    """Records a startup milestone at the current time."""
+    _events.append((label, elapsed_ms(), None))
+
+def timed_import(name):
+    """Imports a module by name and records how long it took."""
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    _events.append((f"import {name}", elapsed_ms(), (time.perf_counter() - started) * 1000))
+    return module
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return getattr(self._module, attribute)
+
+def lazy_import(name):
+    """Returns a stand-in for a module that is only imported when first used."""
+    return LazyModule(name)
+
+def startup_report():
+    """Formats the recorded milestones and deferred imports as a readable report."""
+    lines = ["Startup report (ms since launch):"]
+    for label, at_ms, took_ms in _events:
+        took = f"  (took {took_ms:.1f} ms)" if took_ms is not None else ""
+        lines.append(f"  {at_ms:8.1f}  {label}{took}")
+    return "\n".join(lines)
@@ -2,7 +2,9 @@
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QFrame
 from PyQt5.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QEasingCurve
 from PyQt5.QtGui import QPalette, QFontMetrics
-import qtawesome as qta  # Import QtAwesome for icons
+from assets.modules.lazy_loader import lazy_import
+
+qta = lazy_import('qtawesome')  # QtAwesome for icons, imported when the first icon is built
 
 
 class NotificationBar(QWidget):
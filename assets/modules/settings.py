@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSlider, QComboBox, QMessageBox, QFileDialog
 from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette
-from assets.modules.config import Config
+from assets.modules.config import flush_configs, get_config
 from assets.buttons.toggle_switch import ToggleSwitch  # Import the ToggleSwitch class
 from assets.modules.custom_window_bar import CustomWindowBar
 import os
@@ -16,8 +16,10 @@ class Settings(QWidget):
         self.back_callback = back_callback
         self.main_window = main_window
         self.setFont(QFont("Inter Regular"))
-        self.config = Config(source="Settings")
+        self.config = get_config()
         self.initial_theme = self.config.get_theme()
+        # Theme picked with the toggle, only stored in the config once the settings are saved
+        self.selected_theme = self.initial_theme
         self.init_ui()
 
     def init_ui(self):
@@ -78,12 +80,25 @@ class Settings(QWidget):
         text_size_layout.addWidget(self.text_size_dropdown)
         layout.addLayout(text_size_layout)
 
+        help_viewer_layout = QHBoxLayout()
+        help_viewer_label = QLabel("Help Viewer:")
+        help_viewer_label.setStyleSheet(f"color: {text_color}; font-size: 26px;")
+        help_viewer_layout.addWidget(help_viewer_label)
+        self.help_viewer_dropdown = QComboBox()
+        # "lite" needs no web engine, "full" renders help in QWebEngineView
+        self.help_viewer_dropdown.addItems(["lite", "full"])
+        self.help_viewer_dropdown.setCurrentText(self.config.get_help_viewer())
+        self.help_viewer_dropdown.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
+        help_viewer_layout.addWidget(self.help_viewer_dropdown)
+        layout.addLayout(help_viewer_layout)
+
         theme_layout = QHBoxLayout()
         theme_label_light = QLabel("Light")
         theme_label_light.setStyleSheet(f"color: {text_color}; font-size: 26px;")
         theme_layout.addWidget(theme_label_light)
         self.theme_toggle = ToggleSwitch()
-        self.theme_toggle.set_state(self.config.get_theme())
+        self.selected_theme = self.config.get_theme()
+        self.theme_toggle.set_state(self.selected_theme)
         self.theme_toggle.mousePressEvent = self.toggle_theme
         theme_layout.addWidget(self.theme_toggle)
         theme_label_dark = QLabel("Dark")
@@ -173,7 +188,7 @@ class Settings(QWidget):
         current_state = self.theme_toggle.get_state()
         new_state = "light" if current_state == "dark" else "dark"
         self.theme_toggle.set_state(new_state)
-        self.config.data["theme"] = new_state
+        self.selected_theme = new_state
         self.apply_theme()
 
     def apply_theme(self):
@@ -184,9 +199,8 @@ class Settings(QWidget):
         # Save the settings
         self.config.set_safe_area_size(self.safe_area_slider.value())
         self.config.set_text_size(self.text_size_dropdown.currentText())
-        self.config.set_theme(self.config.data["theme"])
-        self.config.save()
-        self.config.load()
+        self.config.set_help_viewer(self.help_viewer_dropdown.currentText())
+        self.config.set_theme(self.selected_theme)
         # Check if the theme has changed
         self.new_theme = self.config.get_theme()
         if self.initial_theme != self.new_theme:
@@ -218,8 +232,8 @@ class Settings(QWidget):
                 self.relaunch_app()
             else:
                 self.config.set_theme(self.initial_theme)
+                self.selected_theme = self.initial_theme
                 self.theme_toggle.set_state(self.initial_theme)  # Update toggle position
-                self.config.save()
                 # If the user chooses not to relaunch, just refresh the settings
                 if self.main_window is not None:
                     self.main_window.refresh_settings()
@@ -237,6 +251,8 @@ class Settings(QWidget):
         script_path = sys.argv[0]
         # Close the current application
         self.main_window.close()
+        # Settings must be on disk before the new instance reads them
+        flush_configs()
         # Relaunch the application
         subprocess.Popen([sys.executable, script_path])
         sys.exit()
@@ -255,6 +271,8 @@ class Settings(QWidget):
             destination_path = os.path.join(directory, "config.json")
 
             try:
+                # Pending changes go to disk first so the export is current
+                self.config.flush()
                 # Copy the config.json file to the selected directory
                 shutil.copy(original_config_path, destination_path)
                 QMessageBox.information(self, "Export Successful", f"Config file exported successfully to:\n{destination_path}")
@@ -316,7 +334,7 @@ class Settings(QWidget):
 
             # Validate the structure of the loaded config
             required_keys = {"safe_area_size", "text_size", "theme"}
-            optional_keys = {"recent_tools": [], "tool_usage": {}}
+            optional_keys = {"recent_tools": [], "tool_usage": {}, "help_viewer": "lite"}
 
             # Check for missing required keys
             missing_keys = required_keys - new_config_data.keys()
@@ -328,6 +346,7 @@ class Settings(QWidget):
                 "safe_area_size": int,
                 "text_size": str,
                 "theme": str,
+                "help_viewer": str,
                 "recent_tools": list,
                 "tool_usage": dict,
             }
@@ -341,6 +360,7 @@ class Settings(QWidget):
             # Validate specific values
             valid_text_sizes = {"small", "default", "large", "huge"}
             valid_themes = {"light", "dark"}
+            valid_help_viewers = {"lite", "full"}
 
             if new_config_data["safe_area_size"] < 0:
                 raise ValueError("Invalid value for 'safe_area_size': Must be non-negative.")
@@ -351,7 +371,11 @@ class Settings(QWidget):
             if new_config_data["theme"] not in valid_themes:
                 raise ValueError(f"Invalid value for 'theme': Must be one of {valid_themes}.")
 
-            # Replace the current config.json with the new data
+            if new_config_data["help_viewer"] not in valid_help_viewers:
+                raise ValueError(f"Invalid value for 'help_viewer': Must be one of {valid_help_viewers}.")
+
+            # Replace the current config.json with the new data, after pending changes so they cannot overwrite it
+            self.config.flush()
             current_config_path = os.path.join(os.path.dirname(__file__), "config.json")
             try:
                 with open(current_config_path, "w") as file:
@@ -397,9 +421,9 @@ class Settings(QWidget):
                     self.relaunch_app()
                 else:
                     # Revert to the original theme if the user chooses not to relaunch
-                    self.config.set_theme(current_theme)
-                    self.theme_toggle.set_state(current_theme)  # Update toggle position
-                    self.config.save()
+                    self.config.set_theme(self.initial_theme)
+                    self.selected_theme = self.initial_theme
+                    self.theme_toggle.set_state(self.initial_theme)  # Update toggle position
 
             QMessageBox.information(self, "Load Successful", "Settings loaded successfully.")
 
@@ -413,4 +437,10 @@ class Settings(QWidget):
         self.safe_area_slider.setValue(self.config.get_safe_area_size())
         self.safe_area_value_label.setText(f"{self.config.get_safe_area_size()} px")
         self.text_size_dropdown.setCurrentText(self.config.get_text_size())
+        self.help_viewer_dropdown.setCurrentText(self.config.get_help_viewer())
         self.theme_toggle.set_state(self.config.get_theme())
+
+    def reset_theme(self):
+        """Forget a theme toggled but not saved, so a reused page compares against the saved theme."""
+        self.initial_theme = self.selected_theme = self.config.get_theme()
+        self.theme_toggle.set_state(self.selected_theme)
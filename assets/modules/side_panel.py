@@ -1,14 +1,12 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem, QPushButton, QMessageBox
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QPalette
-from assets.modules.config import Config
-from assets.changelog.changelog_window import ChangelogWindow
-from assets.modules.help_window import HelpWindow  # Import the HelpWindow class
+from assets.modules.config import get_config
 
 class SidePanel(QWidget):
     def __init__(self, parent=None, open_settings_callback=None):
         super().__init__(parent)
-        self.config = Config()
+        self.config = get_config()
         self.open_settings_callback = open_settings_callback
         self.current_palette()
         self.setup_ui(open_settings_callback)
@@ -94,6 +92,7 @@ class SidePanel(QWidget):
     def open_changelog_window(self):
         # Check if changelog window is already open
         if not hasattr(self, 'changelog_window') or not self.changelog_window.isVisible():
+            from assets.changelog.changelog_window import ChangelogWindow
             self.changelog_window = ChangelogWindow(self)
             self.changelog_window.show()
         else:
@@ -103,6 +102,8 @@ class SidePanel(QWidget):
     def open_help_window(self):
         # Ensure the HelpWindow is created without a parent to make it a separate window
         if not hasattr(self, 'help_window') or not self.help_window.isVisible():
+            # Imported here so QtWebEngine and markdown only load once help is opened
+            from assets.modules.help_window import HelpWindow
             self.help_window = HelpWindow()  # No parent passed here
             self.help_window.show()
         else:
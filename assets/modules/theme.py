@@ -0,0 +1,125 @@
+"""Application palettes and one cached application stylesheet.
+
+Widgets do not build stylesheets of their own. Tool pages set the "toolPage"
+object name and their buttons and fields set a "role" property, and the
+application stylesheet has the rules for them. A theme or text size change is
+then a single setStyleSheet on the QApplication, and opening a tool parses no
+stylesheet at all.
+"""
+
+from PyQt5.QtGui import QColor, QPalette
+
+# Palette colors of each theme
+THEMES = {
+    "dark": {
+        "window": "#2c2f38", "window_text": "#ffffff", "base": "#2c2f38", "alternate_base": "#42454f",
+        "tooltip_base": "#ffffff", "tooltip_text": "#ffffff", "text": "#ffffff", "button": "#212329",
+        "button_text": "#ffffff", "bright_text": "#ff0000", "highlight": "#4b6eaf", "highlighted_text": "#ffffff",
+    },
+    "light": {
+        "window": "#ffffff", "window_text": "#000000", "base": "#ffffff", "alternate_base": "#f0f0f0",
+        "tooltip_base": "#000000", "tooltip_text": "#000000", "text": "#000000", "button": "#dcdcdc",
+        "button_text": "#000000", "bright_text": "#ff0000", "highlight": "#4b6eaf", "highlighted_text": "#000000",
+    },
+}
+DEFAULT_THEME = "dark"
+
+PALETTE_ROLES = {
+    "window": QPalette.Window, "window_text": QPalette.WindowText, "base": QPalette.Base,
+    "alternate_base": QPalette.AlternateBase, "tooltip_base": QPalette.ToolTipBase,
+    "tooltip_text": QPalette.ToolTipText, "text": QPalette.Text, "button": QPalette.Button,
+    "button_text": QPalette.ButtonText, "bright_text": QPalette.BrightText, "highlight": QPalette.Highlight,
+    "highlighted_text": QPalette.HighlightedText,
+}
+
+# Pixel font size of each text size setting
+FONT_SIZES = {"small": 18, "default": 26, "large": 34, "huge": 42}
+DEFAULT_FONT_SIZE = 26
+# Compact tool pages use smaller text, as Merge SRT always has
+COMPACT_FONT_OFFSET = 12
+
+STYLESHEET_TEMPLATE = """
+QMainWindow QWidget {{ font-size: {font_size}px; }}
+QWidget#toolPage, QWidget#toolPage QWidget {{ background-color: {window}; }}
+QWidget#toolPage[compact="true"], QWidget#toolPage[compact="true"] QWidget {{ font-size: {compact_font_size}px; }}
+QWidget#toolPage QLabel {{ color: {text}; }}
+QWidget#toolPage QLineEdit, QWidget#toolPage QComboBox, QWidget#toolPage QListWidget {{ color: {text}; }}
+QWidget#toolPage QWidget[role="field"] {{ background-color: {button}; }}
+QWidget#toolPage QLineEdit[role="field"] {{ padding: 10px; }}
+QWidget#toolPage QFrame[role="separator"] {{ color: #3c3f41; }}
+QWidget#toolPage QPushButton[role="action"] {{
+    border: 2px solid {highlight};
+    color: {button_text};
+    border-radius: 10px;
+    padding: 10px;
+    background-color: {button};
+}}
+QWidget#toolPage QPushButton[role="action"]:hover {{
+    border-color: {hover};
+    background-color: {hover};
+}}
+QWidget#toolPage QPushButton[role="flat"] {{
+    background-color: {button};
+    color: {button_text};
+    border-radius: 5px;
+    padding: 10px;
+}}
+QWidget#toolPage QPushButton[role="flat"][selected="true"] {{ background-color: {highlight}; }}
+"""
+
+# Built palettes and stylesheets, so switching back to a theme or text size costs nothing
+_palettes = {}
+_stylesheets = {}
+# The (theme, text size) currently set on the application
+_applied = None
+
+def theme_colors(theme):
+    """Returns the color names of a theme, falling back to the default theme."""
+    return THEMES.get(theme, THEMES[DEFAULT_THEME])
+
+def font_size_for(text_size):
+    """Returns the pixel font size of a text size setting."""
+    return FONT_SIZES.get(text_size, DEFAULT_FONT_SIZE)
+
+def build_palette(theme):
+    """Returns the QPalette of a theme."""
+    if theme not in _palettes:
+        palette = QPalette()
+        for name, color in theme_colors(theme).items():
+            palette.setColor(PALETTE_ROLES[name], QColor(color))
+        _palettes[theme] = palette
+    return _palettes[theme]
+
+def build_stylesheet(theme, text_size):
+    """Returns the application stylesheet for a theme and text size."""
+    key = (theme, text_size)
+    if key not in _stylesheets:
+        colors = theme_colors(theme)
+        font_size = font_size_for(text_size)
+        _stylesheets[key] = STYLESHEET_TEMPLATE.format(
+            font_size=font_size,
+            compact_font_size=font_size - COMPACT_FONT_OFFSET,
+            hover=QColor(colors["highlight"]).darker().name(),
+            **colors
+        )
+    return _stylesheets[key]
+
+def apply_theme(app, theme, text_size):
+    """Sets the palette and stylesheet of the whole application, doing nothing if they are already set."""
+    global _applied
+    if _applied == (theme, text_size):
+        return
+    _applied = (theme, text_size)
+    app.setPalette(build_palette(theme))
+    app.setStyleSheet(build_stylesheet(theme, text_size))
+
+def set_role(widget, role):
+    """Gives a widget the look the application stylesheet defines for a role."""
+    widget.setProperty("role", role)
+
+def set_selected(widget, selected):
+    """Marks a widget selected or not, re-polishing only that widget."""
+    widget.setProperty("selected", selected)
+    # Property selectors are only re-evaluated on polish
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
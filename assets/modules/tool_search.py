@@ -0,0 +1,119 @@
+"""Search index for the main menu's tool list.
+
+Every tool's name, categories and description are normalised into tokens
+once, when the menu is built. A query token is looked up in the sorted
+vocabulary for exact and prefix matches and in a trigram index for infix and
+misspelled matches, so a keystroke only touches the tokens sharing a trigram
+with the query instead of rescanning every tool. One- and two-letter query
+tokens have no inner trigrams, so their infix matches come from a scan of the
+vocabulary instead.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# How much a match in each field counts towards a tool's score
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "description": 1.0}
+
+# Share of a query token's trigrams a vocabulary token must contain to count as a fuzzy match
+MIN_TRIGRAM_SIMILARITY = 0.5
+# Query tokens shorter than this only have padded edge trigrams, so their infix matches are found by a scan
+MIN_TRIGRAM_QUERY = 3
+
+def normalize(text):
+    """Lower-cases text and strips accents so "Sous-titres" matches "sous titres"."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text):
+    """Returns the normalised word tokens of text."""
+    return TOKEN_PATTERN.findall(normalize(text))
+
+def trigrams(token):
+    """Returns the set of trigrams of a token, padded so short tokens still have some."""
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class ToolSearchIndex:
+    """Ranked fuzzy search over (name, description, categories) tool entries."""
+
+    def __init__(self, tools):
+        self.count = len(tools)
+        # token -> {entry index: best field weight of that token in the entry}
+        self.postings = {}
+        for index, (name, description, categories) in enumerate(tools):
+            fields = (("name", name), ("category", " ".join(categories)), ("description", description))
+            for field, text in fields:
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    entries = self.postings.setdefault(token, {})
+                    entries[index] = max(entries.get(index, 0.0), weight)
+        self.vocabulary = sorted(self.postings)
+        # trigram -> vocabulary tokens containing it
+        self.trigram_index = {}
+        for token in self.vocabulary:
+            for trigram in trigrams(token):
+                self.trigram_index.setdefault(trigram, []).append(token)
+
+    def match_token(self, query_token):
+        """Returns {vocabulary token: match quality in (0, 1]} for one query token."""
+        matches = {}
+        # Exact and prefix matches sit next to each other in the sorted vocabulary
+        position = bisect_left(self.vocabulary, query_token)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(query_token):
+            token = self.vocabulary[position]
+            matches[token] = 1.0 if token == query_token else 0.9
+            position += 1
+
+        if len(query_token) < MIN_TRIGRAM_QUERY:
+            # Too short to be misspelled, and the vocabulary is small enough to scan for infixes
+            for token in self.vocabulary:
+                if token not in matches and query_token in token:
+                    matches[token] = 0.7
+            return matches
+
+        # Infix and misspelled matches share most of the query token's trigrams
+        query_trigrams = trigrams(query_token)
+        shared = {}
+        for trigram in query_trigrams:
+            for token in self.trigram_index.get(trigram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        for token, count in shared.items():
+            if token in matches:
+                continue
+            if query_token in token:
+                matches[token] = 0.7
+                continue
+            similarity = count / len(query_trigrams)
+            if similarity >= MIN_TRIGRAM_SIMILARITY:
+                matches[token] = 0.5 * similarity
+        return matches
+
+    def search(self, query):
+        """Returns the indices of the entries matching every word of query, best match first.
+
+        An empty query matches every entry in its original order.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return list(range(self.count))
+
+        scores = None
+        for query_token in query_tokens:
+            token_scores = {}
+            for token, quality in self.match_token(query_token).items():
+                for index, weight in self.postings[token].items():
+                    score = quality * weight
+                    if score > token_scores.get(index, 0.0):
+                        token_scores[index] = score
+            if scores is None:
+                scores = token_scores
+            else:
+                # Every query word has to match somewhere in the entry
+                scores = {index: scores[index] + score for index, score in token_scores.items() if index in scores}
+            if not scores:
+                return []
+        return sorted(scores, key=lambda index: (-scores[index], index))
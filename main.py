@@ -1,16 +1,42 @@
 import sys
-import qtawesome as qta
+import multiprocessing
+from assets.modules.lazy_loader import lazy_import, mark, startup_report
 from PyQt5.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QPushButton, QWidget, QLabel, QScrollArea, QMessageBox, QSplitter, QFrame, QStackedWidget, QLineEdit, QGridLayout, QSizePolicy
 from PyQt5.QtGui import QPalette, QColor, QFont, QFontDatabase
 from PyQt5.QtCore import Qt, QPropertyAnimation, QPoint, QTimer 
+mark("PyQt5 loaded")
 
-from tools.subtitle_converter import SubtitleConverter
-from tools.subtitle_shifter import SubtitleShifter
 from assets.modules.side_panel import SidePanel
 from assets.modules.settings import Settings
-from assets.modules.config import Config
+from assets.modules.config import get_config
 from assets.modules.custom_window_bar import CustomWindowBar  # Import the CustomWindowBar
 from assets.modules.notification_bar import NotificationBar  # Import the NotificationBar
+from assets.modules.tool_search import ToolSearchIndex
+from assets.modules.theme import apply_theme as apply_app_theme
+mark("app modules loaded")
+
+# Icons are only drawn once the window is built, so qtawesome and its fonts load then
+qta = lazy_import('qtawesome')
+
+# MainWindow attributes that point into one tab's main menu, swapped in when that tab is shown
+MENU_ATTRIBUTES = (
+    "top_bar", "menu_button", "search_field", "notification_bar", "category_buttons", "active_categories",
+    "tool_buttons", "tools", "tools_dict", "search_index", "scroll_area", "all_tools_widget", "all_tools_grid",
+    "most_used_label", "most_used_widget", "most_used_layout", "recent_label", "recent_widget", "recent_layout",
+)
+
+class TabPages(QStackedWidget):
+    """The pages of one tab: its main menu and every tool opened in it, each built once and kept."""
+
+    def __init__(self):
+        super().__init__()
+        self.menu_page = None
+        # Values of MENU_ATTRIBUTES for this tab's main menu
+        self.menu_state = {}
+        # Tool and settings widgets by name, kept with their state while the tab is open
+        self.tool_pages = {}
+        # Tool names shown in the Most Used and Recent Tools rows, so they are only rebuilt when they change
+        self.usage_rows = None
 
 class MainWindow(QMainWindow):
     def __init__(self, app):
@@ -41,7 +67,8 @@ class MainWindow(QMainWindow):
         self.layout = QVBoxLayout(self.central_widget)
         self.setCentralWidget(self.central_widget)
 
-        self.config = Config(source="MainWindow")
+        self.config = get_config()
+        self.config.subscribe(self.on_config_changed)
         self.main_menu_active = True
 
         self.custom_window_bar = CustomWindowBar(self, self.app)
@@ -49,7 +76,7 @@ class MainWindow(QMainWindow):
 
         self.custom_window_bar.setup_initial_tabs()  # Add this line to create initial tabs
 
-        self.tab_contents = QStackedWidget()
+        # Holds the contents created for the initial tabs, so tab bar and content indices match
         self.layout.addWidget(self.tab_contents)
 
         self.side_panel = SidePanel(self, self.open_settings)
@@ -60,60 +87,14 @@ class MainWindow(QMainWindow):
         self.main_content_layout = QVBoxLayout(self.main_content)
         self.main_content.setLayout(self.main_content_layout)
 
-        self.top_bar = QHBoxLayout()
         self.top_bar_added = False
-        self.menu_button = None
-
-        self.create_new_tab_content()
 
     def apply_theme(self):
-        self.config = Config(source="MainWindow")
+        self.config = get_config()
         theme = self.config.get_theme()
         print(f"Applying theme: {theme}")
-        palette = QPalette()
-        if theme == "dark":
-            palette.setColor(QPalette.Window, QColor(44, 47, 56))
-            palette.setColor(QPalette.WindowText, Qt.white)
-            palette.setColor(QPalette.Base, QColor(44, 47, 56))
-            palette.setColor(QPalette.AlternateBase, QColor(66, 69, 79))
-            palette.setColor(QPalette.ToolTipBase, Qt.white)
-            palette.setColor(QPalette.ToolTipText, Qt.white)
-            palette.setColor(QPalette.Text, Qt.white)
-            palette.setColor(QPalette.Button, QColor(33, 35, 41))
-            palette.setColor(QPalette.ButtonText, Qt.white)
-            palette.setColor(QPalette.BrightText, Qt.red)
-            palette.setColor(QPalette.Highlight, QColor(75, 110, 175))
-            palette.setColor(QPalette.HighlightedText, Qt.white)
-        elif theme == "light":
-            palette.setColor(QPalette.Window, Qt.white)
-            palette.setColor(QPalette.WindowText, Qt.black)
-            palette.setColor(QPalette.Base, Qt.white)
-            palette.setColor(QPalette.AlternateBase, QColor(240, 240, 240))
-            palette.setColor(QPalette.ToolTipBase, Qt.black)
-            palette.setColor(QPalette.ToolTipText, Qt.black)
-            palette.setColor(QPalette.Text, Qt.black)
-            palette.setColor(QPalette.Button, QColor(220, 220, 220))
-            palette.setColor(QPalette.ButtonText, Qt.black)
-            palette.setColor(QPalette.BrightText, Qt.red)
-            palette.setColor(QPalette.Highlight, QColor(75, 110, 175))
-            palette.setColor(QPalette.HighlightedText, Qt.black)
-        else:
-            palette.setColor(QPalette.Window, QColor(44, 47, 56))
-            palette.setColor(QPalette.WindowText, Qt.white)
-            palette.setColor(QPalette.Base, QColor(44, 47, 56))
-            palette.setColor(QPalette.AlternateBase, QColor(66, 69, 79))
-            palette.setColor(QPalette.ToolTipBase, Qt.white)
-            palette.setColor(QPalette.ToolTipText, Qt.white)
-            palette.setColor(QPalette.Text, Qt.white)
-            palette.setColor(QPalette.Button, QColor(44, 47, 56))
-            palette.setColor(QPalette.ButtonText, Qt.white)
-            palette.setColor(QPalette.BrightText, Qt.red)
-            palette.setColor(QPalette.Highlight, QColor(75, 110, 175))
-            palette.setColor(QPalette.HighlightedText, Qt.white)
-
-        self.app.setPalette(palette)
-        self.setPalette(palette)
-        self.update()
+        # Palette and stylesheet are built once per theme and text size, and only set when they change
+        apply_app_theme(self.app, theme, self.config.get_text_size())
 
     def create_new_tab_content(self):
         # Create a new splitter for the tab
@@ -128,6 +109,8 @@ class MainWindow(QMainWindow):
         new_main_content = QWidget()
         new_main_content_layout = QVBoxLayout(new_main_content)
         new_main_content.setLayout(new_main_content_layout)
+        # The main menu and tools are pages of one stack, so switching between them keeps their state
+        new_main_content_layout.addWidget(TabPages())
 
         # Add the side panel and main content to the splitter
         new_splitter.addWidget(new_side_panel)
@@ -139,7 +122,7 @@ class MainWindow(QMainWindow):
         self.tab_contents.setCurrentWidget(new_splitter)
 
         # Replicate the main menu layout in the new tab
-        self.main_menu(new_main_content_layout)
+        self.main_menu()
 
     def remove_tab_content(self, index):
         widget = self.tab_contents.widget(index)
@@ -149,81 +132,110 @@ class MainWindow(QMainWindow):
 
     def display_tab_content(self, index):
         self.tab_contents.setCurrentIndex(index)
+        pages = self.current_pages()
+        if pages is not None and pages.menu_page is not None:
+            self.restore_menu_state(pages)
+            self.main_menu_active = pages.currentWidget() is pages.menu_page
 
-    def main_menu(self, layout=None):
-        # Get the current main content layout for the active tab
+    def current_pages(self):
+        """Return the TabPages of the active tab, or None if there is no tab."""
         current_splitter = self.tab_contents.currentWidget()
-        if current_splitter is not None:
-            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
-            main_content_layout = main_content.layout()
-            self.main_menu_active = True
-            # Clear the existing layout
-            self.clear_layout(main_content_layout)
-
-            # Add the top bar with the menu button
-            top_bar_widget = QWidget()
-            self.top_bar = QHBoxLayout(top_bar_widget)
-            self.top_bar.setContentsMargins(0, 0, 0, 0)
-
-            self.menu_button = QPushButton()
-            menu_icon = qta.icon('fa.bars')
-            self.menu_button.setIcon(menu_icon)
-            self.menu_button.setFixedSize(30, 30)
-            self.menu_button.setStyleSheet("color: {button_text_color}; background-color: transparent; border: none; border-radius: 3px;")
-            self.menu_button.clicked.connect(self.toggle_side_panel)
-
-            self.search_field = QLineEdit()
-            self.search_field.setPlaceholderText("Search tools...")
-            self.search_field.setFixedWidth(700)
-            
-            palette = self.app.palette()
-            self.text_color = palette.color(QPalette.Text).name()
-            self.background_color = palette.color(QPalette.Base).name()
-            self.placeholder_color = palette.color(QPalette.PlaceholderText).name()
-            self.button_color = palette.color(QPalette.Button).name()
-            self.button_text_color = palette.color(QPalette.ButtonText).name()
-            self.highlight_color = self.app.palette().color(QPalette.Highlight).name()
-            self.base_color = self.app.palette().color(QPalette.Base).name()
-            self.text_color = self.app.palette().color(QPalette.Text).name()
-            self.highlight_text_color = self.app.palette().color(QPalette.HighlightedText).name()
-            self.border_color = palette.color(QPalette.Highlight).name()
-            self.button_color = palette.color(QPalette.Button).name()
-            self.hover_background_color = palette.color(QPalette.Highlight).name()
-            self.hover_border_color = palette.color(QPalette.Highlight).darker().name()
-            
-            search_icon = qta.icon('fa5s.search', color=self.text_color)
-            self.search_field.addAction(search_icon, QLineEdit.LeadingPosition)
-            self.search_field.setStyleSheet(f"""
-                QLineEdit {{
-                    background-color: {self.button_color};
-                    color: {self.button_text_color};
-                    border: 2px solid {self.highlight_color};
-                    border-radius: 20px;
-                    padding: 5px 5px 5px 35px;
-                }}
-                QLineEdit::placeholder {{
-                    color: {self.placeholder_color};
-                }}
-            """)
+        if current_splitter is None:
+            return None
+        main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
+        return main_content.layout().itemAt(0).widget()
+
+    def restore_menu_state(self, pages):
+        """Point the main menu attributes at the given tab's menu."""
+        for name, value in pages.menu_state.items():
+            setattr(self, name, value)
+
+    def main_menu(self, checked=False):
+        """Show the active tab's main menu, building it the first time."""
+        pages = self.current_pages()
+        if pages is None:
+            return
+        self.main_menu_active = True
+        if pages.menu_page is None:
+            pages.menu_page = QWidget()
+            self.build_main_menu(QVBoxLayout(pages.menu_page))
+            pages.menu_state = {name: getattr(self, name) for name in MENU_ATTRIBUTES}
+            pages.addWidget(pages.menu_page)
+        else:
+            self.restore_menu_state(pages)
+        self.refresh_usage_rows(pages)
+        pages.setCurrentWidget(pages.menu_page)
 
-            self.search_field.textChanged.connect(self.filter_tools)
+    def build_main_menu(self, main_content_layout):
+        """Build the top bar, notifications and tool grid of a main menu into a layout."""
+        # Each tab's menu has its own category filters
+        self.active_categories = set()
+        self.category_buttons = {}
 
-            self.top_bar.addWidget(self.menu_button, alignment=Qt.AlignLeft)
-            self.top_bar.addWidget(self.search_field, alignment=Qt.AlignRight)
-            main_content_layout.addWidget(top_bar_widget)
-    
-            # Add the NotificationBar below the top bar
-            self.notification_bar = NotificationBar(self)
-            if hasattr(self, 'notification_bar'):
-                main_content_layout.addWidget(self.notification_bar)
-    
-            # Add categories and tools dynamicallym
-            self.add_categories_and_tools(main_content_layout)
-    
-            # Apply theme and text size
-            self.apply_text_size()
-            self.apply_theme()
-            self.update_tool_button_visibility()
+        # Add the top bar with the menu button
+        top_bar_widget = QWidget()
+        self.top_bar = QHBoxLayout(top_bar_widget)
+        self.top_bar.setContentsMargins(0, 0, 0, 0)
+
+        self.menu_button = QPushButton()
+        menu_icon = qta.icon('fa.bars')
+        self.menu_button.setIcon(menu_icon)
+        self.menu_button.setFixedSize(30, 30)
+        self.menu_button.setStyleSheet("color: {button_text_color}; background-color: transparent; border: none; border-radius: 3px;")
+        self.menu_button.clicked.connect(self.toggle_side_panel)
+
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("Search tools...")
+        self.search_field.setFixedWidth(700)
+        
+        palette = self.app.palette()
+        self.text_color = palette.color(QPalette.Text).name()
+        self.background_color = palette.color(QPalette.Base).name()
+        self.placeholder_color = palette.color(QPalette.PlaceholderText).name()
+        self.button_color = palette.color(QPalette.Button).name()
+        self.button_text_color = palette.color(QPalette.ButtonText).name()
+        self.highlight_color = self.app.palette().color(QPalette.Highlight).name()
+        self.base_color = self.app.palette().color(QPalette.Base).name()
+        self.text_color = self.app.palette().color(QPalette.Text).name()
+        self.highlight_text_color = self.app.palette().color(QPalette.HighlightedText).name()
+        self.border_color = palette.color(QPalette.Highlight).name()
+        self.button_color = palette.color(QPalette.Button).name()
+        self.hover_background_color = palette.color(QPalette.Highlight).name()
+        self.hover_border_color = palette.color(QPalette.Highlight).darker().name()
+        
+        search_icon = qta.icon('fa5s.search', color=self.text_color)
+        self.search_field.addAction(search_icon, QLineEdit.LeadingPosition)
+        self.search_field.setStyleSheet(f"""
+            QLineEdit {{
+                background-color: {self.button_color};
+                color: {self.button_text_color};
+                border: 2px solid {self.highlight_color};
+                border-radius: 20px;
+                padding: 5px 5px 5px 35px;
+            }}
+            QLineEdit::placeholder {{
+                color: {self.placeholder_color};
+            }}
+        """)
+
+        self.search_field.textChanged.connect(self.filter_tools)
+
+        self.top_bar.addWidget(self.menu_button, alignment=Qt.AlignLeft)
+        self.top_bar.addWidget(self.search_field, alignment=Qt.AlignRight)
+        main_content_layout.addWidget(top_bar_widget)
+
+        # Add the NotificationBar below the top bar
+        self.notification_bar = NotificationBar(self)
+        if hasattr(self, 'notification_bar'):
+            main_content_layout.addWidget(self.notification_bar)
+
+        # Add categories and tools dynamicallym
+        self.add_categories_and_tools(main_content_layout)
+
+        # Apply theme and text size
+        self.apply_text_size()
+        self.apply_theme()
+        self.update_tool_button_visibility()
 
     def add_categories_and_tools(self, layout):
         # Create main horizontal layout (categories + scroll area)
@@ -253,6 +265,8 @@ class MainWindow(QMainWindow):
 
         self.tools = tools
         self.tools_dict = tools_dict
+        # Tokens and trigrams of every tool, built once so each keystroke is a lookup instead of a rescan
+        self.search_index = ToolSearchIndex(tools)
 
         # Get unique categories
         all_categories = set()
@@ -264,7 +278,6 @@ class MainWindow(QMainWindow):
             btn = QPushButton(category.upper())
             btn.setCheckable(True)
             # Apply dynamic text size based on app's configuration
-            self.config = Config(source="MainWindow")
             text_size = self.config.get_text_size()
             font_size = {
                 "small": 10,
@@ -324,18 +337,8 @@ class MainWindow(QMainWindow):
         most_used_layout = QHBoxLayout(most_used_widget)
         most_used_layout.setContentsMargins(0, 0, 0, 0)
         self.most_used_widget = most_used_widget
-
-        self.tool_usage = self.config.get_tool_usage()
-        has_tool_usage = any(self.tool_usage.values())
-
-        if has_tool_usage:
-            for tool_name in sorted(self.tool_usage, key=lambda x: -self.tool_usage[x])[:3]:
-                button, _ = self.create_tool_button(tool_name, self.tools_dict.get(tool_name, ("Popular tool", []))[0], self.tools_dict.get(tool_name, ("Popular tool", []))[1])
-                most_used_layout.addWidget(button)
-            layout.addWidget(most_used_widget)
-        else:
-            most_used_label.hide()
-            most_used_widget.hide()
+        self.most_used_layout = most_used_layout
+        layout.addWidget(most_used_widget)
 
         # Add Recent Tools section
         recent_label = QLabel("Recent Tools")
@@ -347,18 +350,9 @@ class MainWindow(QMainWindow):
         recent_layout = QHBoxLayout(recent_widget)
         recent_layout.setContentsMargins(0, 0, 0, 0)
         self.recent_widget = recent_widget
-
-        self.recent_tools = self.config.get_recent_tools()
-        has_recent_tools = len(self.recent_tools) > 0
-
-        if has_recent_tools:
-            for tool_name in self.recent_tools[:3]:
-                button, _ = self.create_tool_button(tool_name, self.tools_dict.get(tool_name, ("Recently used tool", []))[0], self.tools_dict.get(tool_name, ("Recently used tool", []))[1])
-                recent_layout.addWidget(button)
-            layout.addWidget(recent_widget)
-        else:
-            recent_label.hide()
-            recent_widget.hide()
+        self.recent_layout = recent_layout
+        layout.addWidget(recent_widget)
+        # Both rows are filled by refresh_usage_rows() whenever the menu is shown
 
         # Add All Tools section
         all_tools_label = QLabel("All Tools")
@@ -367,6 +361,8 @@ class MainWindow(QMainWindow):
 
         all_tools_widget = QWidget()
         all_tools_grid = QGridLayout(all_tools_widget)
+        self.all_tools_widget = all_tools_widget
+        self.all_tools_grid = all_tools_grid
         all_tools_grid.setHorizontalSpacing(20)
         all_tools_grid.setVerticalSpacing(20)
         all_tools_grid.setColumnStretch(0, 0)  # Prevent column stretching
@@ -512,6 +508,28 @@ class MainWindow(QMainWindow):
     
         return button, description_label
     
+    def refresh_usage_rows(self, pages):
+        """Refill the Most Used and Recent Tools rows if the usage in the config changed since they were built."""
+        tool_usage = self.config.get_tool_usage()
+        most_used = sorted(tool_usage, key=lambda x: -tool_usage[x])[:3] if any(tool_usage.values()) else []
+        recent = self.config.get_recent_tools()[:3]
+        if pages.usage_rows != (most_used, recent):
+            pages.usage_rows = (most_used, recent)
+            self.fill_tool_row(self.most_used_layout, most_used, "Popular tool")
+            self.fill_tool_row(self.recent_layout, recent, "Recently used tool")
+        if self.search_field.text().strip() or self.active_categories:
+            self.on_tag_selected()
+        else:
+            self.on_tag_deselected()
+
+    def fill_tool_row(self, layout, tool_names, fallback_description):
+        """Replace the buttons in a row of tools."""
+        self.clear_layout(layout)
+        for tool_name in tool_names:
+            description, categories = self.tools_dict.get(tool_name, (fallback_description, []))
+            button, _ = self.create_tool_button(tool_name, description, categories)
+            layout.addWidget(button)
+
     def on_tag_selected(self):
         self.most_used_label.hide()
         self.most_used_widget.hide()
@@ -519,50 +537,57 @@ class MainWindow(QMainWindow):
         self.recent_widget.hide()
 
     def on_tag_deselected(self):
-        self.most_used_label.show()
-        self.most_used_widget.show()
-        self.recent_label.show()
-        self.recent_widget.show()
+        # Rows without any tools stay hidden
+        has_most_used = self.most_used_layout.count() > 0
+        has_recent = self.recent_layout.count() > 0
+        self.most_used_label.setVisible(has_most_used)
+        self.most_used_widget.setVisible(has_most_used)
+        self.recent_label.setVisible(has_recent)
+        self.recent_widget.setVisible(has_recent)
 
     def tool_selected(self, tool_name):
-        self.tool_usage[tool_name] = self.tool_usage.get(tool_name, 0) + 1
+        # Read from the shared config, since other tabs may have updated the usage since this menu was built
+        tool_usage = self.config.get_tool_usage()
+        tool_usage[tool_name] = tool_usage.get(tool_name, 0) + 1
 
         # Update recent tools
-        if tool_name in self.recent_tools:
-            self.recent_tools.remove(tool_name)
-        self.recent_tools.insert(0, tool_name)
-        if len(self.recent_tools) > 3:
-            self.recent_tools = self.recent_tools[:3]
+        recent_tools = self.config.get_recent_tools()
+        if tool_name in recent_tools:
+            recent_tools.remove(tool_name)
+        recent_tools.insert(0, tool_name)
 
-        self.config.set_tool_usage(self.tool_usage)
-        self.config.set_recent_tools(self.recent_tools)
+        self.config.set_tool_usage(tool_usage)
+        self.config.set_recent_tools(recent_tools[:3])
 
         self.notification_bar.add_notification("⏰", f"Reminder: You last used the {tool_name} tool just now.")
-        # Get the current splitter for the active tab
-        current_splitter = self.tab_contents.currentWidget()
-        if current_splitter is not None:
-            # Get the main content widget for the current tab
-            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
-            main_content_layout = main_content.layout()
-            if tool_name == "Longer Appearance SRT":
+        # Get the pages of the active tab
+        pages = self.current_pages()
+        if pages is not None:
+            # Tools already opened in this tab are shown again as they were left
+            tool_widget = pages.tool_pages.get(tool_name)
+            if tool_widget is not None:
+                self.load_tool(pages, tool_widget)
+            elif tool_name == "Longer Appearance SRT":
                 from tools.longer_appearance import LongerAppearanceSRT
-                tool_widget = LongerAppearanceSRT(parent=main_content, back_callback=self.main_menu)
+                tool_widget = LongerAppearanceSRT(parent=pages, back_callback=self.main_menu)
                 tool_widget.setFont(self.inter_regular_font)
-                self.load_tool(tool_widget, main_content_layout)
+                self.load_tool(pages, tool_widget, tool_name)
             elif tool_name == "Merge SRT Files":
                 from tools.merge_srt import MergeSRT
-                tool_widget = MergeSRT(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
+                tool_widget = MergeSRT(parent=pages, back_callback=self.main_menu)
+                self.load_tool(pages, tool_widget, tool_name)
             elif tool_name == "Subtitle Converter":
-                tool_widget = SubtitleConverter(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
+                from tools.subtitle_converter import SubtitleConverter
+                tool_widget = SubtitleConverter(parent=pages, back_callback=self.main_menu)
+                self.load_tool(pages, tool_widget, tool_name)
             elif tool_name == "Subtitle Shifter":
-                tool_widget = SubtitleShifter(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
+                from tools.subtitle_shifter import SubtitleShifter
+                tool_widget = SubtitleShifter(parent=pages, back_callback=self.main_menu)
+                self.load_tool(pages, tool_widget, tool_name)
             elif tool_name == "Multilingual Merge":
                 from tools.multilingual_tool import MultilingualTool
-                tool_widget = MultilingualTool(parent=main_content, back_callback=self.main_menu)
-                self.load_tool(tool_widget, main_content_layout)
+                tool_widget = MultilingualTool(parent=pages, back_callback=self.main_menu)
+                self.load_tool(pages, tool_widget, tool_name)
             else:
                 msg_box = QMessageBox()
                 msg_box.setText("More tools will be added soon!")
@@ -587,20 +612,13 @@ class MainWindow(QMainWindow):
             if child.widget():
                 child.widget().deleteLater()
 
-    def load_tool(self, tool_widget, layout):
+    def load_tool(self, pages, tool_widget, name=None):
+        """Show a tool widget in a tab; pass name to keep a newly built widget as one of the tab's pages."""
         self.main_menu_active = False
-
-            # Clear the existing layout
-        while layout.count():
-            child = layout.takeAt(0)  # Remove items sequentially
-            if child.widget():
-                child.widget().deleteLater()  # Properly destroy widgets
-            elif child.layout():
-                # Recursively clear nested layouts (if any exist)
-                self.clear_layout(child.layout())
-        # Add the tool widget to the layout
-        layout.addWidget(tool_widget)
-        tool_widget.show()
+        if name is not None:
+            pages.tool_pages[name] = tool_widget
+            pages.addWidget(tool_widget)
+        pages.setCurrentWidget(tool_widget)
 
     def toggle_side_panel(self):
         # Get the current splitter for the active tab
@@ -615,36 +633,33 @@ class MainWindow(QMainWindow):
                 current_splitter.setSizes([self.width() // 2, self.width() // 2])  # Show the side panel
 
     def open_settings(self, item=None):
-        # Get the current splitter for the active tab
-        current_splitter = self.tab_contents.currentWidget()
-        if current_splitter is not None:
-            # Get the main content widget for the current tab
-            main_content = current_splitter.widget(1)  # Main content is the second widget in the splitter
-            main_content_layout = main_content.layout()
+        # Get the pages of the active tab
+        pages = self.current_pages()
+        if pages is not None:
+            settings_widget = pages.tool_pages.get("Settings")
+            if settings_widget is not None:
+                # Reused, so show what the config holds now rather than what it held when first opened
+                settings_widget.refresh_ui_from_config()
+                settings_widget.reset_theme()
+                self.load_tool(pages, settings_widget)
+                return
 
             # Create the settings widget
-            settings_widget = Settings(parent=self.main_content, back_callback=self.main_menu, main_window=self)
+            settings_widget = Settings(parent=pages, back_callback=self.main_menu, main_window=self)
             settings_widget.setFont(self.inter_regular_font)
             settings_widget.settings_saved.connect(self.apply_theme)
 
-            # Load the settings widget into the current tab's main content layout
-            self.load_tool(settings_widget, main_content_layout)
+            # Load the settings widget into the current tab's pages
+            self.load_tool(pages, settings_widget, "Settings")
 
     def apply_text_size(self):
-        self.config = Config(source="MainWindow")
-        text_size = self.config.get_text_size()
-        font_size = {
-            "small": 18,
-            "default": 26,
-            "large": 34,
-            "huge": 42
-        }.get(text_size, 26)
+        # Font sizes are part of the application stylesheet
+        apply_app_theme(self.app, self.config.get_theme(), self.config.get_text_size())
 
-        self.setStyleSheet(f"""
-            * {{
-                font-size: {font_size}px;
-            }}
-        """)
+    def on_config_changed(self, key, value):
+        # Text size applies live; a theme change still needs the relaunch offered by Settings
+        if key == "text_size":
+            self.apply_text_size()
 
     def refresh_settings(self):
         print("refreshing the settings")
@@ -688,26 +703,45 @@ class MainWindow(QMainWindow):
             self.filter_tools(self.search_field.text())
 
     def filter_tools(self, search_text):
-        search_text = search_text.lower()
-
-        if search_text.strip():  # Check if there is any non-whitespace text
+        if search_text.strip() or self.active_categories:  # Check if any filter is active
             self.on_tag_selected()
         else:
             self.on_tag_deselected()
 
-        for index, tool in enumerate(self.tools):
+        # Best matches first, limited to the selected categories
+        ranked = [index for index in self.search_index.search(search_text)
+                  if not self.active_categories or set(self.tools[index][2]) & self.active_categories]
+        matched = set(ranked)
+        order = ranked + [index for index in range(len(self.tools)) if index not in matched]
+
+        # Rearrange the grid with updates off, so all changes cost a single layout pass and repaint
+        self.all_tools_widget.setUpdatesEnabled(False)
+        columns = 3
+        for index in order:
+            self.all_tools_grid.removeWidget(self.tool_buttons[index])
+        for position, index in enumerate(order):
             button = self.tool_buttons[index]
-            name = tool[0].lower()
-            desc = tool[1].lower()
-            categories = set(tool[2])
+            self.all_tools_grid.addWidget(button, position // columns, position % columns)
+            # Only touch buttons whose visibility actually changes
+            if button.isHidden() == (index in matched):
+                button.setVisible(index in matched)
+        self.all_tools_widget.setUpdatesEnabled(True)
 
-            text_match = search_text in name or search_text in desc
-            category_match = not self.active_categories or bool(categories & self.active_categories)
-            visible = text_match and category_match
-            button.setVisible(visible)
+def print_startup_report():
+    mark("first event loop pass")
+    print(startup_report())
 
 if __name__ == "__main__":
+    # Batch jobs run in worker processes, which a frozen build has to start through this entry point
+    multiprocessing.freeze_support()
+    # Lets QtWebEngine be imported after the application exists, when the help window is first opened
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    mark("QApplication created")
     window = MainWindow(app)
+    mark("main window built")
     window.show()
+    if "--startup-report" in sys.argv:
+        # Runs once the event loop has painted the first frame
+        QTimer.singleShot(0, print_startup_report)
     sys.exit(app.exec_())
@@ -0,0 +1,267 @@
+"""Headless command line for the subtl.core operations.
+
+    python -m subtl convert "drops/**/*.ass" --from ass --to srt -o out/
+    python -m subtl shift episodes/ --ms 1500 -o shifted/ --workers 16
+    python -m subtl convert drops/ --to vtt -o out/ --template "{base}.{lang}.{fmt}" --on-collision skip
+    python -m subtl convert masters/ --to srt,vtt,ttml,dfxp,sbv -o delivery/
+    python -m subtl convert vendor_drops/ --from auto --to srt -o normalized/
+    python -m subtl shift library/ --ms 1500 -o shifted/ --incremental --prune
+    python -m subtl merge main.srt en.srt fr.srt -o merged.srt --color "#FFFF00"
+
+Per-file operations (convert, shift, extend) accept files, directories and
+glob patterns, name their results from a template (see subtl.core.output) and
+fan the files out over a process pool. With --incremental a manifest in the
+output directory (see subtl.core.manifest) limits a re-run to the inputs whose
+content, parameters or outputs changed; --prune also deletes the outputs of
+inputs that were removed.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from tools.subtitleconverter import AUTO_FORMAT, CONVERTER_VERSION, FORMAT_MODULES
+from . import core
+
+# Files handed to a worker at a time, so tens of thousands of small jobs do not pay one round trip each
+MAX_CHUNK_SIZE = 64
+
+def expand_inputs(patterns, extension):
+    """Expands files, directories and glob patterns into a sorted list of unique file paths.
+
+    Directories are searched recursively for files with the given extension,
+    or with the extension of any supported format when it is "auto".
+    """
+    extensions = set(FORMAT_MODULES) if extension == AUTO_FORMAT else {extension}
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            # One walk of the directory, whatever the number of extensions
+            found = glob.glob(os.path.join(pattern, '**', '*'), recursive=True)
+            paths.update(path for path in found
+                         if os.path.splitext(path)[1][1:] in extensions and os.path.isfile(path))
+        elif glob.has_magic(pattern):
+            paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        elif os.path.isfile(pattern):
+            paths.add(pattern)
+        else:
+            print(f"No such file or directory: {pattern}", file=sys.stderr)
+    return sorted(paths)
+
+def run_job(job):
+    """Runs one (operation, arguments, input, output) job and returns its result record. Runs inside the worker processes."""
+    operation, arguments, input_path, output = job
+    started = time.perf_counter()
+    try:
+        getattr(core, operation)(*arguments)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {
+        'input': input_path,
+        'output': output,
+        'ok': error is None,
+        'error': error,
+        'seconds': round(time.perf_counter() - started, 4),
+    }
+
+def run_jobs(jobs, workers):
+    """Runs jobs over a process pool of the given size, or in this process for a single worker, yielding results in order."""
+    if workers == 1 or len(jobs) == 1:
+        yield from map(run_job, jobs)
+        return
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(jobs) // (workers * 4)))
+    with core.process_pool(workers) as executor:
+        yield from executor.map(run_job, jobs, chunksize=chunk_size)
+
+def file_jobs(args, owned=()):
+    """Builds the per-file jobs of the convert, shift and extend commands.
+
+    Returns the input paths, the jobs and the number of outputs the collision
+    policy skipped. Outputs in owned may be overwritten whatever the policy.
+    """
+    if args.command == 'convert':
+        paths = expand_inputs(args.inputs, args.source_format)
+        formats = [fmt.strip() for fmt in args.target_format.split(',') if fmt.strip()]
+        if len(formats) > 1:
+            # Several formats are written from one parse of each file
+            planned = core.plan_fan_out(paths, args.output_dir, args.template, formats, args.on_collision, owned)
+            planned = [(path, core.planned_targets(targets)) for path, targets in planned]
+            jobs = [('convert_subtitle_many', (path, args.source_format, targets), path, [output for _, output in targets])
+                    for path, targets in planned if targets]
+            return paths, jobs, len(paths) * len(formats) - sum(len(targets) for _, targets in planned)
+        outputs = core.plan_outputs(paths, args.output_dir, args.template, args.target_format, args.on_collision, owned=owned)
+        jobs = [('convert_subtitle', (path, args.source_format, args.target_format, output), path, output)
+                for path, output in outputs if output]
+    else:
+        operation = 'shift_subtitle' if args.command == 'shift' else 'extend_subtitle'
+        paths = expand_inputs(args.inputs, 'srt')
+        outputs = core.plan_outputs(paths, args.output_dir, args.template, None, args.on_collision, owned=owned)
+        jobs = [(operation, (path, args.ms, output), path, output) for path, output in outputs if output]
+    return paths, jobs, len(outputs) - len(jobs)
+
+def job_outputs(job):
+    """Returns the output paths of a job; fan-out jobs have several."""
+    return job[3] if isinstance(job[3], list) else [job[3]]
+
+def job_params(job):
+    """Returns what decides a job's outputs besides its input, for comparing against a manifest."""
+    operation, arguments, input_path, _ = job
+    outputs = set(job_outputs(job))
+
+    def without_paths(value):
+        if isinstance(value, (list, tuple)):
+            return [without_paths(item) for item in value]
+        return None if value in outputs else value
+
+    params = [operation] + [without_paths(argument) for argument in arguments if argument != input_path]
+    if operation.startswith('convert'):
+        # A new converter may write different results from the same input
+        params.append(CONVERTER_VERSION)
+    return params
+
+def stale_jobs(manifest, paths, jobs, args):
+    """Returns the jobs whose outputs are out of date, after pruning the outputs of removed inputs if asked to."""
+    stale = [job for job in jobs if not manifest.is_current(job[2], job_params(job), job_outputs(job))]
+    if len(stale) < len(jobs):
+        print(f"{len(jobs) - len(stale)} files up to date")
+    if args.prune:
+        # Only directories searched in this run say which inputs were removed
+        directories = [pattern for pattern in args.inputs if os.path.isdir(pattern)]
+        removed = manifest.prune(paths, directories)
+        if removed:
+            print(f"Removed {removed} outputs of inputs that no longer exist")
+    return stale
+
+def single_job(args):
+    """Builds the one job of the merge and glue commands."""
+    if args.command == 'merge':
+        colors = args.color if args.color and len(args.color) > 1 else (args.color or [None])[0]
+        return 'save_merged_subtitles', (args.output, args.main, args.secondaries, colors), args.main, args.output
+    return 'glue_subtitles', (args.main, args.secondary, args.offset_ms, args.output), args.main, args.output
+
+def write_summary(results, elapsed, summary_path=None):
+    """Prints a summary of the results and, if asked, writes them all to a JSON file."""
+    failed = [result for result in results if not result['ok']]
+    print(f"{len(results) - len(failed)} succeeded, {len(failed)} failed in {elapsed:.2f}s")
+    if summary_path:
+        summary = {
+            'total': len(results),
+            'succeeded': len(results) - len(failed),
+            'failed': len(failed),
+            'seconds': round(elapsed, 3),
+            'results': results,
+        }
+        with open(summary_path, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, indent=2)
+
+def build_parser():
+    """Builds the argument parser for every command."""
+    parser = argparse.ArgumentParser(prog='subtl', description="Batch subtitle processing without the GUI.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_batch_command(name, help):
+        command = commands.add_parser(name, help=help)
+        command.add_argument('inputs', nargs='+', help="files, directories or glob patterns")
+        command.add_argument('-o', '--output-dir', required=True, help="directory for the results")
+        command.add_argument('-t', '--template', default=core.DEFAULT_TEMPLATE,
+                             help="result file name, from {stem} {base} {lang} {ext} {fmt} {index} {parent} (default: %(default)s)")
+        command.add_argument('--on-collision', choices=core.COLLISION_POLICIES, default='overwrite',
+                             help="when a result file already exists (default: %(default)s)")
+        command.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="worker processes (default: all cores)")
+        command.add_argument('--summary', help="write a JSON summary of every file to this path")
+        command.add_argument('--incremental', action='store_true',
+                             help="only process inputs whose content, parameters or outputs changed since the last run "
+                                  "of this command into this output directory")
+        command.add_argument('--prune', action='store_true',
+                             help="with --incremental, delete the outputs of inputs that no longer exist, "
+                                  "including files gone from the directories given")
+        return command
+
+    convert = add_batch_command('convert', "convert subtitles between formats")
+    convert.add_argument('--from', dest='source_format', default='srt', help="source format, or auto to detect the format of each file (default: srt)")
+    convert.add_argument('--to', dest='target_format', required=True, help="target format, or a comma-separated list to write several formats from one parse")
+    convert.add_argument('--cache-dir', help="folder of the conversion result cache (default: ~/.cache/subtl/conversions)")
+    convert.add_argument('--no-cache', action='store_true', help="neither reuse nor store cached conversion results")
+
+    add_batch_command('shift', "shift every cue by a number of milliseconds").add_argument(
+        '--ms', type=int, required=True, help="shift in milliseconds, negative to move cues earlier")
+    add_batch_command('extend', "keep every cue on screen longer").add_argument(
+        '--ms', type=int, required=True, help="extra milliseconds per cue")
+
+    merge = commands.add_parser('merge', help="stack secondary subtitles onto a main one")
+    merge.add_argument('main', help="main SRT file")
+    merge.add_argument('secondaries', nargs='+', help="secondary SRT files")
+    merge.add_argument('-o', '--output', required=True, help="merged SRT file")
+    merge.add_argument('--color', action='append', help="hex color for the secondaries, once or once per secondary")
+    merge.add_argument('--summary', help="write a JSON summary to this path")
+
+    glue = commands.add_parser('glue', help="append a secondary subtitle after the main one")
+    glue.add_argument('main', help="main SRT file")
+    glue.add_argument('secondary', help="secondary SRT file")
+    glue.add_argument('--offset-ms', type=int, required=True, help="start of the secondary file in milliseconds")
+    glue.add_argument('-o', '--output', required=True, help="glued SRT file")
+    glue.add_argument('--summary', help="write a JSON summary to this path")
+    return parser
+
+def main(argv=None):
+    """Runs the command line and returns the process exit code."""
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    if args.command == 'convert':
+        # Set through the environment so the worker processes see the same cache
+        if args.no_cache:
+            os.environ['SUBTL_NO_CACHE'] = '1'
+        if args.cache_dir:
+            os.environ['SUBTL_CACHE_DIR'] = os.path.abspath(args.cache_dir)
+    if args.command in ('merge', 'glue'):
+        results = [run_job(single_job(args))]
+    else:
+        if args.prune and not args.incremental:
+            print("--prune needs --incremental", file=sys.stderr)
+            return 1
+        manifest = core.Manifest(args.output_dir, args.command) if args.incremental else None
+        try:
+            paths, jobs, skipped = file_jobs(args, manifest.owned_outputs() if manifest else ())
+        except (ValueError, FileExistsError) as e:
+            print(e, file=sys.stderr)
+            return 1
+        if skipped:
+            print(f"{skipped} files skipped because their results already exist")
+        if not paths:
+            print("No input files found.", file=sys.stderr)
+            return 1
+        if manifest:
+            jobs = stale_jobs(manifest, paths, jobs, args)
+        if not jobs:
+            if manifest:
+                manifest.save()
+            return 0
+        try:
+            os.makedirs(args.output_dir, exist_ok=True)
+            core.create_output_dirs([(job[2], output) for job in jobs for output in job_outputs(job)])
+        except OSError as e:
+            print(f"Cannot create output directory {args.output_dir}: {e}", file=sys.stderr)
+            return 1
+        results = []
+        try:
+            # run_jobs yields the results in job order
+            for job, result in zip(jobs, run_jobs(jobs, max(1, args.workers))):
+                if not result['ok']:
+                    print(f"Failed to process {result['input']}: {result['error']}", file=sys.stderr)
+                if manifest:
+                    if result['ok']:
+                        manifest.record(job[2], job_params(job), job_outputs(job))
+                    else:
+                        manifest.forget(job[2])
+                results.append(result)
+        finally:
+            # Keep what finished, so an interrupted run resumes where it stopped
+            if manifest:
+                manifest.save()
+        if args.command == 'convert' and not args.no_cache:
+            core.evict_cache()
+    write_summary(results, time.perf_counter() - started, args.summary)
+    return 0 if all(result['ok'] for result in results) else 1
@@ -0,0 +1,16 @@
+"""Qt-free subtitle operations.
+
+Everything here works on files and plain values and never imports PyQt5, so
+the same code backs the GUI tools and headless workers alike.
+"""
+
+# Merging into a string needs no progress or cancellation, so the tools version is exported as is
+from tools.smprocessing import merge_subtitles
+from .cache import evict_cache
+from .convert import PartialConversionError, convert_subtitle, convert_subtitle_many, convert_subtitles
+from .extend import extend_subtitle, extend_subtitles
+from .jobs import CancelToken, JobCancelled, process_pool, run_batch, run_parallel
+from .manifest import Manifest
+from .merge import glue_subtitles, save_merged_subtitles
+from .output import COLLISION_POLICIES, DEFAULT_TEMPLATE, create_output_dirs, plan_fan_out, plan_outputs, planned_targets
+from .shift import shift_subtitle, shift_subtitle_partial, shift_subtitle_ranges, shift_subtitles
@@ -0,0 +1,135 @@
+"""Content-addressed cache of conversion results.
+
+A result is keyed by the SHA-256 of the input bytes, the source and target
+formats and the converter version, so the same file reaching us under another
+name or folder is converted only once. Entries are plain files; a hit copies
+the cached file to the save path without parsing anything. Eviction removes
+the least recently used entries, by modification time, once the cache grows
+past its size limit.
+
+The cache is configured through environment variables, which the worker
+processes of a batch inherit:
+    SUBTL_CACHE_DIR     cache folder (default: ~/.cache/subtl/conversions)
+    SUBTL_CACHE_MAX_MB  size limit in megabytes (default: 512)
+    SUBTL_NO_CACHE      set to any value to neither read nor write the cache
+"""
+
+import hashlib
+import os
+import shutil
+import time
+from tools.subtitleconverter import CONVERTER_VERSION
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "subtl", "conversions")
+DEFAULT_MAX_MB = 512
+# Eviction trims the cache to this share of the limit, so it does not run again on the next store
+EVICT_TO = 0.8
+# Entries a process stores between two eviction passes; batches also evict when they finish
+EVICT_EVERY = 64
+
+HASH_BLOCK_SIZE = 1 << 20
+
+_stored = 0
+
+def cache_enabled():
+    """Returns whether conversions should use the cache."""
+    return not os.environ.get("SUBTL_NO_CACHE")
+
+def cache_dir():
+    """Returns the cache folder."""
+    return os.environ.get("SUBTL_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+def max_cache_bytes():
+    """Returns the cache size limit in bytes."""
+    try:
+        return int(float(os.environ.get("SUBTL_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+def file_digest(file_path):
+    """Returns the SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_key(content_digest, source_format, target_format):
+    """Returns the key of one conversion of content with the given digest."""
+    return hashlib.sha256(f"{CONVERTER_VERSION}\0{source_format}\0{target_format}\0{content_digest}".encode('utf-8')).hexdigest()
+
+def entry_path(key, target_format):
+    """Returns the file of a cache entry, spread over subfolders so no folder gets huge."""
+    return os.path.join(cache_dir(), key[:2], f"{key}.{target_format}")
+
+def fetch(key, target_format, save_path):
+    """Copies a cached result to save_path and returns True, or returns False on a miss."""
+    path = entry_path(key, target_format)
+    temp_path = f"{save_path}.part"
+    try:
+        shutil.copyfile(path, temp_path)
+        os.replace(temp_path, save_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+    try:
+        # A hit makes the entry the most recently used
+        os.utime(path)
+    except OSError:
+        pass
+    return True
+
+def store(key, target_format, result_path):
+    """Adds a finished result file to the cache; failures only cost a later cache miss."""
+    global _stored
+    path = entry_path(key, target_format)
+    temp_path = f"{path}.{os.getpid()}.part"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(result_path, temp_path)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Failed to cache {result_path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return
+    _stored += 1
+    if _stored % EVICT_EVERY == 0:
+        evict_cache()
+
+def evict_cache(max_bytes=None):
+    """Removes the least recently used entries until the cache is within its limit; returns the bytes freed."""
+    max_bytes = max_cache_bytes() if max_bytes is None else max_bytes
+    stale = time.time() - 3600
+    entries = []
+    total = 0
+    freed = 0
+    for root, _, names in os.walk(cache_dir()):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+                # Leftovers of interrupted stores are dropped once they are an hour old
+                if name.endswith(".part"):
+                    if stat.st_mtime < stale:
+                        os.remove(path)
+                        freed += stat.st_size
+                    continue
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return freed
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes * EVICT_TO:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        freed += size
+    return freed
@@ -0,0 +1,128 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from tools.subtitleconverter import iter_chunks, load, resolve_format
+from tools.smprocessing import write_file
+from . import cache
+from .jobs import JobCancelled, track
+from .output import DEFAULT_TEMPLATE, create_output_dirs, plan_fan_out, plan_outputs, planned_targets
+
+class PartialConversionError(Exception):
+    """Raised when only some formats of a fan-out conversion were written; written counts those that were."""
+
+    def __init__(self, message, written=0):
+        super().__init__(message)
+        self.written = written
+
+def convert_subtitle(file_path, source_format, target_format, save_path, progress=None, cancel=None):
+    """Converts a subtitle file from one format to another and saves the result.
+
+    A file with the same bytes converted before is copied from the result cache
+    without parsing. A source_format of "auto" detects the format from the start of the file.
+    """
+    source_format = resolve_format(file_path, source_format)
+    key = None
+    if cache.cache_enabled():
+        key = cache.cache_key(cache.file_digest(file_path), source_format, target_format)
+        if cache.fetch(key, target_format, save_path):
+            if progress is not None:
+                progress(1, 1)
+            return
+    # Parse once into the shared cue store, then stream it out in the target format
+    with load(file_path, source_format, save_path) as store:
+        if cancel is not None:
+            cancel.check()
+        # Writers yield about one chunk per cue, so chunks stand in for cues in the progress count
+        write_file(save_path, track(iter_chunks(store, target_format), len(store), progress, cancel))
+    if key is not None:
+        cache.store(key, target_format, save_path)
+
+def convert_subtitle_many(file_path, source_format, targets, progress=None, cancel=None):
+    """Converts a subtitle file to several formats from a single parse; targets are (target_format, save_path) pairs.
+
+    Every writer streams from the same cue store, each on its own thread, so
+    delivering N formats costs one parse plus N serializations. Formats found in
+    the result cache are copied from it, and a file is only parsed if one is missing.
+    Returns the number of files written. When only some formats fail the others
+    are still written, and PartialConversionError names the failed ones.
+    """
+    source_format = resolve_format(file_path, source_format)
+    requested = len(targets)
+    keys = {}
+    if cache.cache_enabled():
+        content_digest = cache.file_digest(file_path)
+        keys = {target_format: cache.cache_key(content_digest, source_format, target_format) for target_format, _ in targets}
+        targets = [(target_format, save_path) for target_format, save_path in targets
+                   if not cache.fetch(keys[target_format], target_format, save_path)]
+        if not targets:
+            if progress is not None:
+                progress(1, 1)
+            return requested
+    # A target may overwrite the source, which then has to be read eagerly
+    overwritten = next((save_path for _, save_path in targets
+                        if os.path.exists(save_path) and os.path.samefile(file_path, save_path)), None)
+    with load(file_path, source_format, overwritten) as store:
+        if cancel is not None:
+            cancel.check()
+        store.freeze_text()
+        total = len(store) * len(targets)
+        # Cues written so far by each writer, summed into one progress count
+        cues_written = [0] * len(targets)
+
+        def write_target(slot, target_format, save_path):
+            def report(done, _):
+                cues_written[slot] = done
+                progress(sum(cues_written), total)
+            chunks = iter_chunks(store, target_format)
+            write_file(save_path, track(chunks, len(store), report if progress is not None else None, cancel))
+
+        with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+            futures = [executor.submit(write_target, slot, target_format, save_path)
+                       for slot, (target_format, save_path) in enumerate(targets)]
+    # Leaving the pool waited for every writer, so each failure is known before anything is raised
+    failures = []
+    for (target_format, save_path), future in zip(targets, futures):
+        try:
+            future.result()
+        except JobCancelled:
+            raise
+        except Exception as e:
+            failures.append((target_format, e))
+            continue
+        if target_format in keys:
+            cache.store(keys[target_format], target_format, save_path)
+    written = requested - len(failures)
+    if failures:
+        if not written:
+            raise failures[0][1]
+        raise PartialConversionError("; ".join(f"{target_format}: {e}" for target_format, e in failures), written)
+    return written
+
+def convert_subtitles(file_paths, source_format, target_format, output_dir, template=DEFAULT_TEMPLATE, collision="overwrite", progress=None, cancel=None):
+    """Converts every file, saving each in output_dir under a name from template; progress counts files.
+
+    target_format may also be a list of formats, which are all written from one parse of each file.
+    """
+    if isinstance(target_format, (list, tuple)):
+        planned = [(file_path, planned_targets(targets))
+                   for file_path, targets in plan_fan_out(file_paths, output_dir, template, target_format, collision)]
+        planned = [(file_path, targets) for file_path, targets in planned if targets]
+        create_output_dirs([(file_path, save_path) for file_path, targets in planned for _, save_path in targets])
+        for done, (file_path, targets) in enumerate(planned, start=1):
+            if cancel is not None:
+                cancel.check()
+            convert_subtitle_many(file_path, source_format, targets, cancel=cancel)
+            if progress is not None:
+                progress(done, len(planned))
+        if cache.cache_enabled():
+            cache.evict_cache()
+        return
+    outputs = [output for output in plan_outputs(file_paths, output_dir, template, target_format, collision) if output[1]]
+    create_output_dirs(outputs)
+    for done, (file_path, save_path) in enumerate(outputs, start=1):
+        if cancel is not None:
+            cancel.check()
+        convert_subtitle(file_path, source_format, target_format, save_path, cancel=cancel)
+        if progress is not None:
+            progress(done, len(outputs))
+    if cache.cache_enabled():
+        cache.evict_cache()
@@ -0,0 +1,21 @@
+from tools.cuestore import load_srt
+from tools.smprocessing import write_file
+from .jobs import track
+from .output import DEFAULT_TEMPLATE, create_output_dirs, plan_outputs
+
+def extend_subtitle(file_path, extra_ms, save_path, progress=None, cancel=None):
+    """Keeps every cue of an SRT file on screen extra_ms longer and saves the result."""
+    with load_srt(file_path, save_path) as store:
+        store.extend_end(extra_ms)
+        write_file(save_path, track(store.iter_srt(), len(store), progress, cancel))
+
+def extend_subtitles(file_paths, extra_ms, output_dir, template=DEFAULT_TEMPLATE, collision="overwrite", progress=None, cancel=None):
+    """Extends every file by extra_ms, saving each in output_dir under a name from template; progress counts files."""
+    outputs = [output for output in plan_outputs(file_paths, output_dir, template, None, collision) if output[1]]
+    create_output_dirs(outputs)
+    for done, (file_path, save_path) in enumerate(outputs, start=1):
+        if cancel is not None:
+            cancel.check()
+        extend_subtitle(file_path, extra_ms, save_path, cancel=cancel)
+        if progress is not None:
+            progress(done, len(outputs))
@@ -0,0 +1,135 @@
+"""Progress reporting and cancellation for long-running operations.
+
+Operations take an optional progress callback, called as progress(done, total)
+every PROGRESS_INTERVAL items, and an optional CancelToken that is checked at
+the same points. Both are plain Python so headless callers can use them too.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# Items (usually cues) between two progress reports and cancellation checks
+PROGRESS_INTERVAL = 1000
+# Seconds between two cancellation checks while run_parallel waits for its workers
+CANCEL_POLL_SECONDS = 0.2
+
+class JobCancelled(Exception):
+    """Raised inside an operation once its CancelToken has been cancelled."""
+
+class CancelToken:
+    """Flag shared between an operation and whoever may want to stop it."""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        """Asks the operation to stop at its next check."""
+        self.cancelled = True
+
+    def check(self):
+        """Raises JobCancelled if cancellation has been requested."""
+        if self.cancelled:
+            raise JobCancelled("The operation was cancelled.")
+
+def track(items, total, progress=None, cancel=None):
+    """Passes items through, reporting progress and checking for cancellation every PROGRESS_INTERVAL items."""
+    if progress is None and cancel is None:
+        return items
+    return _track(items, total, progress, cancel)
+
+def _track(items, total, progress, cancel):
+    done = 0
+    for item in items:
+        yield item
+        done += 1
+        if done % PROGRESS_INTERVAL == 0:
+            if cancel is not None:
+                cancel.check()
+            if progress is not None:
+                progress(min(done, total), total)
+    if progress is not None:
+        progress(total, total)
+
+def run_batch(function, jobs, progress=None, cancel=None):
+    """Calls function(*arguments, cancel=cancel) for each tuple of arguments; progress counts jobs.
+
+    A job that fails is logged and skipped so the rest still run. Returns the
+    number of jobs that succeeded. A function that writes several outputs may
+    return how many it wrote, and carry that count as the written attribute of
+    the exception it raises, and then outputs are counted instead of jobs.
+    """
+    succeeded = 0
+    for done, arguments in enumerate(jobs, start=1):
+        if cancel is not None:
+            cancel.check()
+        try:
+            succeeded += job_count(function(*arguments, cancel=cancel))
+        except JobCancelled:
+            raise
+        except Exception as e:
+            print(f"Failed to process {arguments[0]}: {e}")
+            succeeded += getattr(e, 'written', 0)
+        if progress is not None:
+            progress(done, len(jobs))
+    return succeeded
+
+def job_count(result):
+    """Returns what a finished job adds to the succeeded count: its result if it counted its outputs, else 1."""
+    return 1 if result is None else result
+
+def process_pool(workers):
+    """Returns a process pool of the given size whose workers are started with spawn.
+
+    Forking copies every thread's state, which is unsafe from a multi-threaded
+    process such as the GUI, so the workers always start from a fresh interpreter.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+def run_parallel(function, jobs, workers=None, progress=None, cancel=None):
+    """Like run_batch, but runs the jobs over a pool of worker processes; workers defaults to all cores.
+
+    function must be importable by the workers, such as the operations of this
+    package. Only a few jobs per worker are queued at a time and cancellation is
+    checked every CANCEL_POLL_SECONDS, so cancelling drops the jobs that have
+    not started; files already being written are finished.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return run_batch(function, jobs, progress, cancel)
+    succeeded = 0
+    done = 0
+    queued = iter(jobs)
+    pending = {}
+    with process_pool(workers) as executor:
+        try:
+            while True:
+                # Keep every worker busy with one job queued behind it
+                for arguments in queued:
+                    pending[executor.submit(function, *arguments)] = arguments
+                    if len(pending) >= workers * 2:
+                        break
+                if not pending:
+                    break
+                finished, _ = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+                if cancel is not None:
+                    cancel.check()
+                for future in finished:
+                    arguments = pending.pop(future)
+                    try:
+                        succeeded += job_count(future.result())
+                    except BrokenProcessPool:
+                        # The pool itself failed, so every remaining job would too
+                        raise
+                    except Exception as e:
+                        print(f"Failed to process {arguments[0]}: {e}")
+                        succeeded += getattr(e, 'written', 0)
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(jobs))
+        except JobCancelled:
+            for future in pending:
+                future.cancel()
+            raise
+    return succeeded
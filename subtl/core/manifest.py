@@ -0,0 +1,141 @@
+"""Build manifests for incremental batch runs.
+
+A manifest sits in the output folder of a batch and records, for every input,
+its size, mtime and SHA-256, the parameters of the operation that processed it
+and the size, mtime and SHA-256 of every output it produced. A later run over
+the same folder only reprocesses inputs whose content or parameters changed or
+whose outputs went missing or were edited, make-style. Each command keeps its
+own records, so commands sharing an output folder never touch each other's
+outputs. Pruning, which deletes the outputs of inputs that are gone, is only
+done when asked for.
+
+Stamps (size and mtime) are compared first; content is only hashed when a
+stamp differs, so an unchanged library is checked without reading its files.
+"""
+
+import json
+import os
+from .cache import file_digest
+
+MANIFEST_NAME = ".subtl-manifest.json"
+MANIFEST_VERSION = 2
+
+def file_stamp(path):
+    """Returns [size, mtime_ns] for a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+def file_record(path):
+    """Returns the stamp and digest of a file as stored in a manifest."""
+    return {"stamp": file_stamp(path), "digest": file_digest(path)}
+
+def matches(path, record):
+    """Returns whether a file still has the content a record describes, refreshing the record's stamp if only that changed."""
+    stamp = file_stamp(path)
+    if stamp is None:
+        return False
+    if stamp == record["stamp"]:
+        return True
+    if stamp[0] != record["stamp"][0] or file_digest(path) != record["digest"]:
+        return False
+    # Touched but unchanged, e.g. copied or checked out again
+    record["stamp"] = stamp
+    return True
+
+def is_under(path, directory):
+    """Returns whether an absolute path lies inside an absolute directory."""
+    try:
+        return os.path.commonpath([path, directory]) == directory
+    except ValueError:
+        # Paths on different drives
+        return False
+
+class Manifest:
+    """Inputs, parameters and outputs of the previous runs of one command into one output folder."""
+
+    def __init__(self, output_dir, command):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        # Command -> absolute input path -> {"input": record, "params": ..., "outputs": {absolute output path: record}}
+        self.commands = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION:
+                self.commands = manifest["commands"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        # Only the records of this command are read or changed
+        self.entries = self.commands.setdefault(command, {})
+
+    def owned_outputs(self):
+        """Returns the outputs earlier runs of this command wrote, which a new run may overwrite."""
+        return {output for entry in self.entries.values() for output in entry["outputs"]}
+
+    def is_current(self, input_path, params, output_paths):
+        """Returns whether an input's outputs are up to date for the given parameters."""
+        entry = self.entries.get(os.path.abspath(input_path))
+        if entry is None or entry["params"] != params:
+            return False
+        outputs = [os.path.abspath(output_path) for output_path in output_paths]
+        if sorted(outputs) != sorted(entry["outputs"]):
+            return False
+        if not matches(input_path, entry["input"]):
+            return False
+        return all(matches(output, entry["outputs"][output]) for output in outputs)
+
+    def record(self, input_path, params, output_paths):
+        """Records a successful run of an input, removing outputs it wrote before under other names."""
+        input_path = os.path.abspath(input_path)
+        outputs = {os.path.abspath(output_path): file_record(output_path) for output_path in output_paths}
+        old = self.entries.get(input_path)
+        if old is not None:
+            self.remove_outputs(old, keep=outputs)
+        self.entries[input_path] = {"input": file_record(input_path), "params": params, "outputs": outputs}
+
+    def forget(self, input_path):
+        """Drops an input whose run failed, so the next run retries it."""
+        self.entries.pop(os.path.abspath(input_path), None)
+
+    def prune(self, input_paths, directories=()):
+        """Deletes the outputs of orphaned inputs and forgets them; returns the files removed.
+
+        An input is orphaned when it no longer exists, or when it lies in one of
+        the given directories, which this run searched, without being in
+        input_paths. Inputs a run was simply not given are left alone.
+        """
+        keep = {os.path.abspath(input_path) for input_path in input_paths}
+        directories = [os.path.abspath(directory) for directory in directories]
+        removed = 0
+        for input_path in list(self.entries):
+            if input_path in keep:
+                continue
+            if os.path.exists(input_path) and not any(is_under(input_path, directory) for directory in directories):
+                continue
+            removed += self.remove_outputs(self.entries.pop(input_path))
+        return removed
+
+    def remove_outputs(self, entry, keep=()):
+        """Deletes the outputs of an entry that are not in keep and were not edited since they were written."""
+        removed = 0
+        for output, record in entry["outputs"].items():
+            if output in keep or not os.path.exists(output):
+                continue
+            if not matches(output, record):
+                print(f"Keeping {output}: it was changed after it was written")
+                continue
+            try:
+                os.remove(output)
+                removed += 1
+            except OSError as e:
+                print(f"Failed to remove {output}: {e}")
+        return removed
+
+    def save(self):
+        """Writes the manifest through a temp file so an interrupted run never leaves half a manifest."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": MANIFEST_VERSION, "commands": self.commands}, f, separators=(',', ':'))
+        os.replace(temp_path, self.path)
@@ -0,0 +1,27 @@
+from tools.cuestore import CueStore
+from tools.smprocessing import (UnsortedTrackError, iter_sorted_cues, iter_srt_blocks, merge_tracks,
+                                merge_unsorted_subtitles, unify_sorted_cues, write_file)
+from tools.srtstream import count_srt_cues, iter_srt_file
+from .jobs import track
+
+def save_merged_subtitles(save_path, main_file_path, secondary_file_paths, color_hex=None, progress=None, cancel=None):
+    """Merges multiple subtitle files straight into a file; progress counts input cues."""
+    tracks = merge_tracks(main_file_path, secondary_file_paths, color_hex)
+    total = sum(count_srt_cues(path) for path, _ in tracks) if progress is not None else 0
+    try:
+        cues = track(iter_sorted_cues(tracks), total, progress, cancel)
+        write_file(save_path, iter_srt_blocks(unify_sorted_cues(cues)))
+    except UnsortedTrackError:
+        # Files out of start order cannot be streamed, so merge them in memory and rewrite the output
+        write_file(save_path, merge_unsorted_subtitles(tracks))
+
+def glue_subtitles(main_path, secondary_path, offset_ms, save_path, progress=None, cancel=None):
+    """Appends a secondary SRT file after the main one, its cues delayed by offset_ms, and saves the result."""
+    merged = CueStore.from_srt_file(main_path)
+    merged.extend(offset_records(secondary_path, offset_ms))
+    write_file(save_path, track(merged.iter_srt(), len(merged), progress, cancel))
+
+def offset_records(file_path, offset_ms):
+    """Streams the (start_ms, end_ms, text) cues of an SRT file delayed by offset_ms."""
+    for _, start_ms, end_ms, text in iter_srt_file(file_path):
+        yield start_ms + offset_ms, end_ms + offset_ms, text
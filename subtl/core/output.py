@@ -0,0 +1,130 @@
+"""Output paths for batch operations.
+
+A batch writes every result into one output directory, naming each file from
+a template such as "{stem}.{fmt}" or "{base}.{lang}.{fmt}". The paths are
+planned before anything is written, so a collision policy can be applied to
+the whole batch up front instead of asking about each file.
+
+Template fields:
+    stem    file name without its extension ("movie.en")
+    base    stem without a trailing language code ("movie")
+    lang    trailing language code of the stem ("en"), or empty
+    ext     extension of the input file ("srt")
+    fmt     target format, or the input extension when the format does not change
+    index   position of the file in the batch, starting at 1
+    parent  name of the folder holding the input file
+"""
+
+import os
+import re
+
+DEFAULT_TEMPLATE = "{stem}.{fmt}"
+TEMPLATE_FIELDS = ("stem", "base", "lang", "ext", "fmt", "index", "parent")
+
+# rename: add " (2)", " (3)", ... to the name; overwrite: replace files already on disk;
+# skip: leave the input out of the batch; error: refuse to start the batch
+COLLISION_POLICIES = ("rename", "overwrite", "skip", "error")
+
+# "movie.en", "movie.eng", "movie.pt-BR": a short alphabetic code after the last dot
+LANGUAGE_PATTERN = re.compile(r'^(.+)\.([A-Za-z]{2,3}(?:[-_][A-Za-z0-9]{2,4})?)$')
+
+def template_fields(file_path, fmt=None, index=1):
+    """Returns the template fields of one input file."""
+    stem, ext = os.path.splitext(os.path.basename(file_path))
+    ext = ext[1:].lower()
+    match = LANGUAGE_PATTERN.match(stem)
+    base, lang = match.groups() if match else (stem, "")
+    return {
+        "stem": stem,
+        "base": base,
+        "lang": lang,
+        "ext": ext,
+        "fmt": (fmt or ext).lower(),
+        "index": index,
+        "parent": os.path.basename(os.path.dirname(os.path.abspath(file_path))),
+    }
+
+def render_template(template, fields):
+    """Fills in a template, returning a relative path; raises ValueError for an unusable template."""
+    try:
+        name = template.format(**fields)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Invalid output template {template!r} ({e}). Available fields: {', '.join(TEMPLATE_FIELDS)}") from None
+    parts = []
+    for part in re.split(r'[\\/]', name):
+        # Empty fields leave doubled or dangling dots, e.g. "{base}.{lang}.{fmt}" for a file without a language.
+        # Stripping them also turns ".." into nothing, so a template cannot leave the output folder
+        part = re.sub(r'\.{2,}', '.', part).strip('. ')
+        if part:
+            parts.append(part)
+    if not parts:
+        raise ValueError(f"Output template {template!r} gives an empty file name.")
+    return os.path.join(*parts)
+
+def numbered_path(save_path, taken):
+    """Returns save_path with the first free " (n)" suffix that is neither on disk nor already taken."""
+    root, ext = os.path.splitext(save_path)
+    number = 2
+    while True:
+        candidate = f"{root} ({number}){ext}"
+        if not os.path.exists(candidate) and path_key(candidate) not in taken:
+            return candidate
+        number += 1
+
+def path_key(path):
+    """Returns a key that is equal for two spellings of the same path."""
+    return os.path.normcase(os.path.abspath(path))
+
+def plan_outputs(file_paths, output_dir, template=DEFAULT_TEMPLATE, fmt=None, collision="rename", taken=None, owned=()):
+    """Returns a (file_path, save_path) pair per input, with save_path None for inputs the collision policy skips.
+
+    An output collides when the file already exists or when an earlier input of
+    the same batch would write it. Two inputs never write the same file: with
+    "overwrite" such a clash inside the batch is renamed. With "error" the
+    first collision raises FileExistsError before anything has been written.
+    Pass the same taken set to plans that are written together. Files in owned,
+    such as the outputs an earlier run of the same batch wrote, never collide.
+    """
+    if collision not in COLLISION_POLICIES:
+        raise ValueError(f"Unknown collision policy {collision!r}. Use one of: {', '.join(COLLISION_POLICIES)}")
+    planned = []
+    taken = set() if taken is None else taken
+    owned = {path_key(path) for path in owned}
+    for index, file_path in enumerate(file_paths, start=1):
+        save_path = os.path.join(output_dir, render_template(template, template_fields(file_path, fmt, index)))
+        in_batch = path_key(save_path) in taken
+        exists = os.path.exists(save_path) and path_key(save_path) not in owned
+        if in_batch or (collision != "overwrite" and exists):
+            reason = "would be written twice" if in_batch else "already exists"
+            if collision == "error":
+                raise FileExistsError(f"Output file {save_path} {reason}.")
+            if collision == "skip":
+                print(f"Skipping {file_path}: {save_path} {reason}")
+                planned.append((file_path, None))
+                continue
+            save_path = numbered_path(save_path, taken)
+        taken.add(path_key(save_path))
+        planned.append((file_path, save_path))
+    return planned
+
+def plan_fan_out(file_paths, output_dir, template, formats, collision="rename", owned=()):
+    """Returns (file_path, [(fmt, save_path), ...]) per input for converting every input to several formats.
+
+    As with plan_outputs, save_path is None for the formats the collision policy
+    skips. The formats share one plan, so a template without {fmt} gets
+    numbered names instead of one format overwriting another.
+    """
+    taken = set()
+    plans = [plan_outputs(file_paths, output_dir, template, fmt, collision, taken, owned) for fmt in formats]
+    return [(file_path, [(fmt, plan[index][1]) for fmt, plan in zip(formats, plans)])
+            for index, file_path in enumerate(file_paths)]
+
+def planned_targets(targets):
+    """Returns the (fmt, save_path) pairs of a fan-out plan entry that were not skipped."""
+    return [(fmt, save_path) for fmt, save_path in targets if save_path]
+
+def create_output_dirs(outputs):
+    """Creates the folders of every planned output, for templates that put files in subfolders."""
+    for folder in {os.path.dirname(save_path) for _, save_path in outputs if save_path}:
+        if folder:
+            os.makedirs(folder, exist_ok=True)
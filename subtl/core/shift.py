@@ -0,0 +1,39 @@
+from tools.cueindex import CueIndex
+from tools.cuestore import load_srt
+from tools.smprocessing import write_file
+from tools.timecodes import parse_srt_time
+from .jobs import track
+from .output import DEFAULT_TEMPLATE, create_output_dirs, plan_outputs
+
+def shift_subtitle(file_path, ms_shift, save_path, progress=None, cancel=None):
+    """Shifts every cue of an SRT file by ms_shift and saves the result."""
+    # Timings are shifted in place; cue text is only decoded while it is written out
+    with load_srt(file_path, save_path) as store:
+        store.shift(ms_shift)
+        write_file(save_path, track(store.iter_srt(), len(store), progress, cancel))
+
+def shift_subtitles(file_paths, ms_shift, output_dir, template=DEFAULT_TEMPLATE, collision="overwrite", progress=None, cancel=None):
+    """Shifts every file by ms_shift, saving each in output_dir under a name from template; progress counts files."""
+    outputs = [output for output in plan_outputs(file_paths, output_dir, template, None, collision) if output[1]]
+    create_output_dirs(outputs)
+    for done, (file_path, save_path) in enumerate(outputs, start=1):
+        if cancel is not None:
+            cancel.check()
+        shift_subtitle(file_path, ms_shift, save_path, cancel=cancel)
+        if progress is not None:
+            progress(done, len(outputs))
+
+def shift_subtitle_partial(file_path, start_time, end_time, ms_shift, save_path, progress=None, cancel=None):
+    """Shifts the cues starting between two HH:MM:SS,mmm timestamps by ms_shift."""
+    ranges = [(parse_srt_time(start_time), parse_srt_time(end_time), ms_shift)]
+    shift_subtitle_ranges(file_path, ranges, save_path, progress=progress, cancel=cancel)
+
+def shift_subtitle_ranges(file_path, ranges, save_path, by_number=False, progress=None, cancel=None):
+    """Applies (start, end, ms_shift) ranges in one pass; ranges are in ms, or cue numbers when by_number is set."""
+    with load_srt(file_path, save_path) as store:
+        index = CueIndex(store)
+        if by_number:
+            index.shift_numbers(ranges)
+        else:
+            index.shift_times(ranges)
+        write_file(save_path, track(store.iter_srt(), len(store), progress, cancel))
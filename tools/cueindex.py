@@ -0,0 +1,85 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from .timecodes import NUMPY_MIN_BATCH, get_numpy
+
+class CueIndex:
+    """Sorted index over the start times of a CueStore.
+
+    Finding the cues of a time range is a pair of binary searches, and any
+    number of (range, offset) pairs are applied together through a difference
+    array, so k ranges over n cues cost O(n + k log n) instead of k passes.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        start = store.start
+        if all(start[i] <= start[i + 1] for i in range(len(start) - 1)):
+            self.order = None  # Already sorted, positions are cue indices
+            self.sorted_starts = start
+        else:
+            self.order = array('q', sorted(range(len(start)), key=start.__getitem__))
+            self.sorted_starts = array('q', [start[i] for i in self.order])
+
+    def __len__(self):
+        return len(self.sorted_starts)
+
+    def span(self, range_start, range_end):
+        """Returns the (begin, end) positions of the cues starting within [range_start, range_end]."""
+        return bisect_left(self.sorted_starts, range_start), bisect_right(self.sorted_starts, range_end)
+
+    def select(self, range_start, range_end):
+        """Returns the indices of the cues starting within [range_start, range_end], in start order."""
+        begin, end = self.span(range_start, range_end)
+        if self.order is None:
+            return range(begin, end)
+        return self.order[begin:end]
+
+    def offsets_for_times(self, ranges):
+        """Returns the per-cue offset from (range_start, range_end, offset_ms) triples, summing overlaps."""
+        diff = [0] * (len(self) + 1)
+        for range_start, range_end, offset_ms in ranges:
+            begin, end = self.span(range_start, range_end)
+            diff[begin] += offset_ms
+            diff[end] -= offset_ms
+        offsets = list(accumulate(diff[:-1]))
+        if self.order is None:
+            return offsets
+        # Map offsets from start order back to cue order
+        by_cue = [0] * len(offsets)
+        for position, index in enumerate(self.order):
+            by_cue[index] = offsets[position]
+        return by_cue
+
+    def offsets_for_numbers(self, ranges):
+        """Returns the per-cue offset from (first_number, last_number, offset_ms) triples, numbering cues from 1."""
+        count = len(self)
+        diff = [0] * (count + 1)
+        for first, last, offset_ms in ranges:
+            begin = min(max(first - 1, 0), count)
+            end = min(max(last, begin), count)
+            diff[begin] += offset_ms
+            diff[end] -= offset_ms
+        return list(accumulate(diff[:-1]))
+
+    def shift_times(self, ranges):
+        """Shifts the cues starting within each time range by that range's offset, in one pass."""
+        apply_offsets(self.store, self.offsets_for_times(ranges))
+
+    def shift_numbers(self, ranges):
+        """Shifts the cues within each cue number range by that range's offset, in one pass."""
+        apply_offsets(self.store, self.offsets_for_numbers(ranges))
+
+def apply_offsets(store, offsets):
+    """Adds a per-cue offset to the start and end of every cue, clamping at zero."""
+    numpy = get_numpy()
+    if numpy is not None and len(offsets) >= NUMPY_MIN_BATCH:
+        offsets = numpy.asarray(offsets, dtype=numpy.int64)
+        for values in (store.start, store.end):
+            view = numpy.frombuffer(values, dtype=numpy.int64)
+            view += offsets
+            numpy.maximum(view, 0, out=view)
+            del view  # Release the buffer so the array can be resized again
+        return
+    store.start = array('q', [max(0, value + offset) for value, offset in zip(store.start, offsets)])
+    store.end = array('q', [max(0, value + offset) for value, offset in zip(store.end, offsets)])
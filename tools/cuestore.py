@@ -0,0 +1,258 @@
+import mmap
+import os
+from array import array
+from collections import namedtuple
+from itertools import accumulate
+from .srtstream import iter_srt_file, iter_srt_spans, iter_srt_string
+from .timecodes import NUMPY_MIN_BATCH, get_numpy, iter_formatted_times
+
+DEFAULT_STYLE = "Default"
+
+Cue = namedtuple("Cue", ["start", "end", "text", "style"])
+
+class CueStore:
+    """Columnar in-memory container for subtitle cues.
+
+    Timings are kept as int64 millisecond arrays, cue text lives in one shared
+    buffer addressed through an offset table and style names are interned, so
+    every cue costs a handful of machine words instead of several Python objects.
+
+    A store loaded with from_srt_mmap keeps its text in the memory-mapped file
+    instead and decodes a cue only when its text is requested, so timing-only
+    work never touches the text at all.
+    """
+
+    def __init__(self):
+        self.start = array('q')
+        self.end = array('q')
+        self.style_ids = array('I')
+        self.styles = [DEFAULT_STYLE]
+        self._style_lookup = {DEFAULT_STYLE: 0}
+        # Offset table into the shared text buffer, one (begin, end) pair per cue
+        self._text_begin = array('q')
+        self._text_end = array('q')
+        self._text = ""
+        self._pending = []
+        self._size = 0
+        # Encoded source buffer (an mmap) the offsets point into, if loaded lazily
+        self._source = None
+        self._encoding = 'utf-8'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Releases the memory-mapped source file, if any. Its texts are no longer available afterwards."""
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
+    def __len__(self):
+        return len(self.start)
+
+    def __iter__(self):
+        for index in range(len(self.start)):
+            yield self.cue(index)
+
+    def intern_style(self, name):
+        """Returns the interned id of a style name, registering it if needed."""
+        if not name:
+            return 0
+        style_id = self._style_lookup.get(name)
+        if style_id is None:
+            style_id = len(self.styles)
+            self.styles.append(name)
+            self._style_lookup[name] = style_id
+        return style_id
+
+    def append(self, start, end, text, style=None):
+        """Appends a single cue to the store."""
+        if self._source is not None:
+            self._materialize()
+        self.start.append(start)
+        self.end.append(end)
+        self.style_ids.append(self.intern_style(style))
+        self._text_begin.append(self._size)
+        self._pending.append(text)
+        self._size += len(text)
+        self._text_end.append(self._size)
+
+    def extend(self, records):
+        """Appends (start, end, text[, style]) records to the store."""
+        for record in records:
+            self.append(*record)
+
+    def _materialize(self):
+        # Decode every cue into the shared text buffer so str cues can be added
+        texts = list(self.texts())
+        self.close()
+        self._text, self._pending, self._size = "", texts, 0
+        self._text_begin = array('q')
+        self._text_end = array('q')
+        for text in texts:
+            self._text_begin.append(self._size)
+            self._size += len(text)
+            self._text_end.append(self._size)
+
+    def _decode(self, begin, end):
+        return self._source[begin:end].decode(self._encoding, 'replace').replace('\r\n', '\n')
+
+    def _buffer(self):
+        if self._pending:
+            self._pending.insert(0, self._text)
+            self._text = "".join(self._pending)
+            self._pending = []
+        return self._text
+
+    def freeze_text(self):
+        """Joins any pending text into the buffer, so several threads can read the store at once."""
+        if self._source is None:
+            self._buffer()
+
+    def text(self, index):
+        """Returns the text of the cue at the given index."""
+        if self._source is not None:
+            return self._decode(self._text_begin[index], self._text_end[index])
+        return self._buffer()[self._text_begin[index]:self._text_end[index]]
+
+    def style(self, index):
+        """Returns the style name of the cue at the given index."""
+        return self.styles[self.style_ids[index]]
+
+    def cue(self, index):
+        """Returns the cue at the given index as a Cue tuple."""
+        return Cue(self.start[index], self.end[index], self.text(index), self.style(index))
+
+    def texts(self):
+        """Yields the text of every cue in order."""
+        if self._source is not None:
+            for begin, end in zip(self._text_begin, self._text_end):
+                yield self._decode(begin, end)
+            return
+        buffer = self._buffer()
+        for begin, end in zip(self._text_begin, self._text_end):
+            yield buffer[begin:end]
+
+    def shift(self, offset_ms, indices=None):
+        """Shifts start and end times by offset_ms, clamping at zero."""
+        if indices is None:
+            add_in_place(self.start, offset_ms, minimum=0)
+            add_in_place(self.end, offset_ms, minimum=0)
+            return
+        for index in indices:
+            self.start[index] = max(0, self.start[index] + offset_ms)
+            self.end[index] = max(0, self.end[index] + offset_ms)
+
+    def extend_end(self, extra_ms):
+        """Extends the end time of every cue by extra_ms."""
+        add_in_place(self.end, extra_ms)
+
+    def reorder(self, order):
+        """Reorders the cues in place following a list of indices."""
+        self.start = array('q', [self.start[i] for i in order])
+        self.end = array('q', [self.end[i] for i in order])
+        self.style_ids = array('I', [self.style_ids[i] for i in order])
+        self._text_begin = array('q', [self._text_begin[i] for i in order])
+        self._text_end = array('q', [self._text_end[i] for i in order])
+
+    def sort(self):
+        """Sorts the cues by start time, keeping the original order for ties."""
+        start = self.start
+        order = sorted(range(len(start)), key=start.__getitem__)
+        self.reorder(order)
+
+    def take(self, indices):
+        """Returns a new store holding only the cues at the given indices."""
+        subset = CueStore()
+        for index in indices:
+            subset.append(self.start[index], self.end[index], self.text(index), self.style(index))
+        return subset
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a store from (start, end, text[, style]) records."""
+        store = cls()
+        store.extend(records)
+        return store
+
+    @classmethod
+    def from_columns(cls, start, end, texts):
+        """Builds a store from parallel start and end arrays and a list of texts, without per-cue appends."""
+        store = cls()
+        store.start = array('q', start)
+        store.end = array('q', end)
+        store.style_ids = array('I', bytes(4 * len(store.start)))
+        lengths = array('q', accumulate(map(len, texts), initial=0))
+        store._text_begin = lengths[:-1]
+        store._text_end = lengths[1:]
+        store._pending = list(texts)
+        store._size = lengths[-1]
+        return store
+
+    @classmethod
+    def from_srt(cls, content):
+        """Builds a store from SRT content."""
+        return cls.from_records(record[1:] for record in iter_srt_string(content))
+
+    @classmethod
+    def from_srt_file(cls, file_path):
+        """Builds a store by streaming an SRT file from disk."""
+        return cls.from_records(record[1:] for record in iter_srt_file(file_path))
+
+    def iter_srt(self):
+        """Yields the store as SRT blocks with fresh numbering, for streaming to a file."""
+        cues = zip(iter_formatted_times(self.start), iter_formatted_times(self.end), self.texts())
+        for index, (start, end, text) in enumerate(cues, start=1):
+            separator = "\n" if index > 1 else ""
+            yield f"{separator}{index}\n{start} --> {end}\n{text}\n"
+
+    @classmethod
+    def from_srt_mmap(cls, file_path, encoding='utf-8'):
+        """Builds a store over a memory-mapped SRT file, decoding cue text lazily.
+
+        Call close() (or use the store as a context manager) when done, and do
+        not write to the same file while the store is open.
+        """
+        if os.path.getsize(file_path) == 0:
+            return cls()
+        with open(file_path, 'rb') as file:
+            source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        store = cls()
+        store._source = source
+        store._encoding = encoding
+        for start, end, text_begin, text_end in iter_srt_spans(source):
+            store.start.append(start)
+            store.end.append(end)
+            store._text_begin.append(text_begin)
+            store._text_end.append(text_end)
+        store.style_ids = array('I', bytes(4 * len(store.start)))
+        return store
+
+    def to_srt(self):
+        """Formats the store as SRT content with fresh numbering."""
+        return "".join(self.iter_srt())
+
+def add_in_place(values, offset, minimum=None):
+    """Adds offset to every value of an int64 array in place, optionally clamping at a minimum."""
+    numpy = get_numpy()
+    if numpy is not None and len(values) >= NUMPY_MIN_BATCH:
+        # One vectorized add over the array's own buffer, no per-value Python objects
+        view = numpy.frombuffer(values, dtype=numpy.int64)
+        view += offset
+        if minimum is not None:
+            numpy.maximum(view, minimum, out=view)
+        del view  # Release the buffer so the array can be resized again
+        return
+    if minimum is None:
+        values[:] = array('q', [value + offset for value in values])
+    else:
+        values[:] = array('q', [value + offset if value + offset > minimum else minimum for value in values])
+
+def load_srt(file_path, save_path=None):
+    """Loads an SRT file lazily through mmap, or eagerly when the result is going to be saved over it."""
+    if save_path and os.path.exists(save_path) and os.path.samefile(file_path, save_path):
+        return CueStore.from_srt_file(file_path)
+    return CueStore.from_srt_mmap(file_path)
@@ -1,29 +1,25 @@
 import os
-import re
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QListWidget, QLabel, QComboBox
-from PyQt5.QtGui import QFont, QPalette
-from assets.modules.config import Config
+from PyQt5.QtGui import QFont
+from assets.modules.config import get_config
+from assets.modules.theme import set_role
+from subtl.core import extend_subtitle, run_parallel
+from assets.modules.batch_output import BatchOutputOptions
+from assets.modules.job_runner import JobProgress
 
 class LongerAppearanceSRT(QWidget):
     def __init__(self, parent=None, back_callback=None):
         super().__init__(parent)
         self.back_callback = back_callback
         self.setFont(QFont("Inter Regular"))
-        self.config = Config()
+        # Styled by the application stylesheet, see assets/modules/theme.py
+        self.setObjectName("toolPage")
+        self.config = get_config()
         self.setup_ui()
-        self.apply_theme()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
 
-        text_size = self.config.get_text_size()
-        font_size = {
-            "small": 18,
-            "default": 26,
-            "large": 34,
-            "huge": 42
-        }.get(text_size, 26)
-
         # Create a horizontal layout for the back and select files buttons
         button_layout = QHBoxLayout()
 
@@ -56,37 +52,16 @@ class LongerAppearanceSRT(QWidget):
 
         layout.addLayout(dropdown_layout)
 
-    def apply_theme(self):
-        # Retrieve the current palette colors
-        palette = self.parent().palette()
-        text_color = palette.color(QPalette.WindowText).name()
-        background_color = palette.color(QPalette.Window).name()
-        button_color = palette.color(QPalette.Button).name()
-        button_text_color = palette.color(QPalette.ButtonText).name()
-        highlight_color = palette.color(QPalette.Highlight).name()
-        hover_color = palette.color(QPalette.Highlight).darker().name()
-
-        self.setStyleSheet(f"background-color: {background_color};")
-        self.file_list.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
-        self.seconds_label.setStyleSheet(f"color: {text_color};")
-        self.seconds_dropdown.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
-
-        self.back_button.setStyleSheet(f"""
-            QPushButton {{
-                border: 2px solid {highlight_color};
-                color: {button_text_color};
-                border-radius: 10px;
-                padding: 10px;
-                background-color: {button_color};
-            }}
-            QPushButton:hover {{
-                border-color: {hover_color};
-                background-color: {hover_color};
-            }}
-        """)
-
-        self.file_button.setStyleSheet(self.back_button.styleSheet())
-        self.export_button.setStyleSheet(self.back_button.styleSheet())
+        # Where the modified files go and how they are named, so a batch needs no dialog per file
+        self.batch_output = BatchOutputOptions("modified_{stem}.{ext}")
+        layout.addWidget(self.batch_output)
+
+        for button in (self.back_button, self.file_button, self.export_button):
+            set_role(button, "action")
+
+        # Progress of the running export, hidden while idle
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
 
     def browse_files(self):
         file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Subtitle Files", "", "Subtitle Files (*.srt)")
@@ -106,36 +81,21 @@ class LongerAppearanceSRT(QWidget):
             QMessageBox.critical(self, "Error", "No files selected.")
             return
 
-        converted_files = 0
-        for file_path in file_paths:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    srt_data = file.read()
-
-                def adjust_stop_time(match):
-                    stop_time = match.group(2)
-                    hours, minutes, seconds, milliseconds = map(int, re.split('[:,]', stop_time))
-                    total_seconds = hours * 3600 + minutes * 60 + seconds + add_seconds
-                    new_hours = total_seconds // 3600
-                    new_minutes = (total_seconds % 3600) // 60
-                    new_seconds = total_seconds % 60
-                    new_time = f"{new_hours:02}:{new_minutes:02}:{new_seconds:02},{milliseconds:03}"
-                    return f"{match.group(1)} --> {new_time}"
-
-                updated_srt = re.sub(r"(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})", adjust_stop_time, srt_data)
-
-                save_path, _ = QFileDialog.getSaveFileName(self, "Save Modified File", f"modified_{os.path.basename(file_path)}", "Subtitle Files (*.srt)")
-                if save_path:
-                    with open(save_path, 'w', encoding='utf-8') as file:
-                        file.write(updated_srt)
-                    converted_files += 1
-                else:
-                    print(f"Save operation cancelled for {file_path}")
-
-            except Exception as e:
-                print(f"Failed to process {file_path}: {e}")
+        if self.job_progress.is_busy():
+            return
+
+        # Plan every output path up front, then extend the files in parallel in the background
+        outputs = self.batch_output.plan(file_paths)
+        if outputs is None:
+            return
+        jobs = [(file_path, add_seconds * 1000, save_path) for file_path, save_path in outputs if save_path]
+
+        self.job_progress.run(run_parallel, extend_subtitle, jobs,
+                              on_finished=lambda converted_files: self.show_converted(converted_files, outputs),
+                              on_failed=lambda message: QMessageBox.critical(self, "Error", message))
 
+    def show_converted(self, converted_files, outputs):
         if converted_files == 0:
-            QMessageBox.information(self, "No Files Converted", "No files were successfully converted.")
+            QMessageBox.information(self, "No Files Converted", f"No files were successfully converted.\n\n{self.batch_output.summary(0, outputs)}")
         else:
-            QMessageBox.information(self, "Success", f"{converted_files} files converted successfully!")
+            QMessageBox.information(self, "Success", self.batch_output.summary(converted_files, outputs))
@@ -1,9 +1,11 @@
 import os
 from PyQt5.QtWidgets import QWidget, QComboBox, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit, QStackedWidget, QFrame, QSizePolicy, QListWidget, QSpacerItem
-from PyQt5.QtGui import QFont, QColor, QIcon, QPixmap, QPalette
+from PyQt5.QtGui import QFont, QColor, QIcon, QPixmap
 from PyQt5.QtCore import Qt
-from .smprocessing import merge_subtitles, read_file, write_file
-from assets.modules.config import Config
+from subtl.core import glue_subtitles, save_merged_subtitles
+from assets.modules.config import get_config
+from assets.modules.job_runner import JobProgress
+from assets.modules.theme import set_role, set_selected
 from assets.buttons.toggle_switch import ToggleSwitch
 
 class MergeSRT(QWidget):
@@ -11,42 +13,22 @@ class MergeSRT(QWidget):
         super().__init__(parent)
         self.back_callback = back_callback
         self.setFont(QFont("Inter Regular"))
-        self.config = Config()
+        # Styled by the application stylesheet, see assets/modules/theme.py; compact pages use smaller text
+        self.setObjectName("toolPage")
+        self.setProperty("compact", True)
+        self.config = get_config()
         self.main_subtitle_path = ""
         self.secondary_subtitle_paths = []
         self.setup_ui()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
-    
-        # Retrieve the current palette colors
-        palette = self.parent().palette()
-        self.text_color = palette.color(QPalette.WindowText).name()
-        self.background_color = palette.color(QPalette.Window).name()
-        self.button_color = palette.color(QPalette.Button).name()
-        self.button_text_color = palette.color(QPalette.ButtonText).name()
-        self.highlight_color = palette.color(QPalette.Highlight).name()
-        self.hover_color = palette.color(QPalette.Highlight).darker().name()
-    
-        self.setStyleSheet(f"background-color: {self.background_color};")
-        
-        text_size = self.config.get_text_size()
-        self.font_size = {
-            "small": 18,
-            "default": 26,
-            "large": 34,
-            "huge": 42
-        }.get(text_size, 26)
-    
-        button_font_size = self.font_size - 12
-        label_font_size = self.font_size - 12
-        input_font_size = self.font_size - 12
-    
+
         # Back to Home button
-        self.add_button(layout, "Back to Home", self.back_callback, f"background-color: {self.button_color}; color: {self.button_text_color}; border-radius: 5px; padding: 10px; font-size: {button_font_size}px;")
+        self.add_button(layout, "Back to Home", self.back_callback)
     
         # Mode selection
-        self.setup_mode_selection(layout, button_font_size, label_font_size, self.button_color, self.button_text_color, self.highlight_color, self.hover_color)
+        self.setup_mode_selection(layout)
     
         # Separator line
         self.add_separator(layout)
@@ -56,31 +38,34 @@ class MergeSRT(QWidget):
         layout.addWidget(self.stacked_widget)
     
         # Glue End to End mode
-        self.setup_glue_end_to_end_mode(button_font_size, label_font_size, input_font_size, self.button_color, self.button_text_color, self.highlight_color, self.hover_color, self.text_color)
+        self.setup_glue_end_to_end_mode()
     
         # Stacked Merge mode
-        self.setup_stacked_merge_mode(button_font_size, label_font_size, input_font_size, self.button_color, self.button_text_color, self.highlight_color, self.hover_color, self.text_color)
+        self.setup_stacked_merge_mode()
+    
+        # Progress of the running merge, hidden while idle
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
     
         # Show the Glue End to End mode by default
         self.show_glue_end_to_end()
     
-    def add_button(self, layout, text, callback, style):
+    def add_button(self, layout, text, callback, role="flat"):
         button = QPushButton(text)
-        button.setStyleSheet(style)
+        set_role(button, role)
         button.clicked.connect(callback)
         layout.addWidget(button)
         return button
 
-    def add_label(self, layout, text, style):
+    def add_label(self, layout, text):
         label = QLabel(text)
-        label.setStyleSheet(style)
         layout.addWidget(label)
         return label
 
-    def add_input(self, layout, placeholder="", width=500, style="background-color: (self.button_color); color: (self.button_text_color); font-size: 14px; padding: 10px;"):
+    def add_input(self, layout, placeholder="", width=500):
         input_box = QLineEdit()
         input_box.setPlaceholderText(placeholder)
-        input_box.setStyleSheet(style)
+        set_role(input_box, "field")
         input_box.setMinimumWidth(width)
         layout.addWidget(input_box)
         return input_box
@@ -89,76 +74,76 @@ class MergeSRT(QWidget):
         separator = QFrame()
         separator.setFrameShape(QFrame.HLine)
         separator.setFrameShadow(QFrame.Sunken)
-        separator.setStyleSheet("color: #3c3f41;")
+        set_role(separator, "separator")
         layout.addWidget(separator)
 
-    def setup_mode_selection(self, layout, button_font_size, label_font_size, button_color, button_text_color, highlight_color, hover_color):
+    def setup_mode_selection(self, layout):
         mode_layout = QHBoxLayout()
-        self.add_label(mode_layout, "Select Mode:", f"color: {button_text_color}; font-size: {label_font_size}px;")
+        self.add_label(mode_layout, "Select Mode:")
     
-        self.glue_end_to_end_button = self.add_button(mode_layout, "Glue End to End", self.show_glue_end_to_end, self.get_mode_button_style(selected=False, font_size=button_font_size, button_color=button_color, text_color=button_text_color, highlight_color=highlight_color))
-        self.stacked_merge_button = self.add_button(mode_layout, "Stacked Merge", self.show_stacked_merge, self.get_mode_button_style(selected=True, font_size=button_font_size, button_color=button_color, text_color=button_text_color, highlight_color=highlight_color))
+        self.glue_end_to_end_button = self.add_button(mode_layout, "Glue End to End", self.show_glue_end_to_end)
+        self.stacked_merge_button = self.add_button(mode_layout, "Stacked Merge", self.show_stacked_merge)
     
         layout.addLayout(mode_layout)
         
-    def setup_glue_end_to_end_mode(self, button_font_size, label_font_size, input_font_size, button_color, button_text_color, highlight_color, hover_color, text_color):
+    def setup_glue_end_to_end_mode(self):
         self.glue_end_to_end_widget = QWidget()
         glue_layout = QVBoxLayout(self.glue_end_to_end_widget)
     
         # Main subtitle file selection
         main_file_layout = QHBoxLayout()
-        self.main_subtitle_button = self.add_button(main_file_layout, "Select Main Subtitle", self.select_main_subtitle, f"background-color: {button_color}; color: {button_text_color}; border-radius: 5px; padding: 10px; font-size: {button_font_size}px;")
-        self.main_file_preview = self.add_label(main_file_layout, "", f"color: {text_color}; font-size: {label_font_size}px;")
+        self.main_subtitle_button = self.add_button(main_file_layout, "Select Main Subtitle", self.select_main_subtitle)
+        self.main_file_preview = self.add_label(main_file_layout, "")
         glue_layout.addLayout(main_file_layout)
     
         # Secondary subtitle file selection
         secondary_file_layout = QHBoxLayout()
-        self.secondary_subtitle_button = self.add_button(secondary_file_layout, "Select Secondary Subtitle", self.select_secondary_subtitle, f"background-color: {button_color}; color: {button_text_color}; border-radius: 5px; padding: 10px; font-size: {button_font_size}px;")
-        self.secondary_file_preview = self.add_label(secondary_file_layout, "", f"color: {text_color}; font-size: {label_font_size}px;")
+        self.secondary_subtitle_button = self.add_button(secondary_file_layout, "Select Secondary Subtitle", self.select_secondary_subtitle)
+        self.secondary_file_preview = self.add_label(secondary_file_layout, "")
         glue_layout.addLayout(secondary_file_layout)
     
         # Base length input
         base_length_layout = QHBoxLayout()
-        self.base_length_label = self.add_label(base_length_layout, "Length of main subtitle's video:", f"color: {text_color}; font-size: {label_font_size}px;")
+        self.base_length_label = self.add_label(base_length_layout, "Length of main subtitle's video:")
         base_length_layout.addSpacerItem(QSpacerItem(5, 0, QSizePolicy.Fixed, QSizePolicy.Minimum))
-        self.base_length_input = self.add_input(base_length_layout, "00:00:00", 100, f"background-color: #3c3f41; color: white; font-size: {input_font_size}px; padding: 10px;")
+        self.base_length_input = self.add_input(base_length_layout, "00:00:00", 100)
         self.base_length_input.textChanged.connect(self.format_base_length)
         glue_layout.addLayout(base_length_layout)
     
         # Export button
-        self.export_button = self.add_button(glue_layout, "Export", self.glue_end_to_end_merge, f"background-color: {button_color}; color: {button_text_color}; border-radius: 5px; padding: 10px; font-size: {button_font_size}px;")
+        self.export_button = self.add_button(glue_layout, "Export", self.glue_end_to_end_merge)
         glue_layout.addWidget(self.export_button, alignment=Qt.AlignRight)
     
         self.stacked_widget.addWidget(self.glue_end_to_end_widget)
     
-    def setup_stacked_merge_mode(self, button_font_size, label_font_size, input_font_size, button_color, button_text_color, highlight_color, hover_color, text_color):
+    def setup_stacked_merge_mode(self):
         self.stacked_merge_widget = QWidget()
         stacked_layout = QVBoxLayout(self.stacked_merge_widget)
     
         # Main subtitle file selection
         main_file_layout = QHBoxLayout()
-        self.main_subtitle_button = self.add_button(main_file_layout, "Select Main Subtitle", self.select_main_subtitle, f"background-color: {button_color}; color: {button_text_color}; border-radius: 5px; padding: 10px; font-size: {button_font_size}px;")
-        self.main_file_preview = self.add_label(main_file_layout, "", f"color: {text_color}; font-size: {label_font_size}px;")
+        self.main_subtitle_button = self.add_button(main_file_layout, "Select Main Subtitle", self.select_main_subtitle)
+        self.main_file_preview = self.add_label(main_file_layout, "")
         stacked_layout.addLayout(main_file_layout)
     
         # Secondary subtitle file selection (multiple files)
         secondary_file_layout = QVBoxLayout()
-        self.secondary_subtitle_button = self.add_button(secondary_file_layout, "Select Secondary Subtitles", self.select_multiple_secondary_subtitles, f"background-color: {button_color}; color: {button_text_color}; border-radius: 5px; padding: 10px; font-size: {button_font_size}px;")
+        self.secondary_subtitle_button = self.add_button(secondary_file_layout, "Select Secondary Subtitles", self.select_multiple_secondary_subtitles)
         self.secondary_file_list = QListWidget()
-        self.secondary_file_list.setStyleSheet(f"background-color: #3c3f41; color: white; font-size: {label_font_size}px;")
+        set_role(self.secondary_file_list, "field")
         secondary_file_layout.addWidget(self.secondary_file_list)
         stacked_layout.addLayout(secondary_file_layout)
     
         # Color options
-        self.setup_color_options(stacked_layout, input_font_size, label_font_size)
+        self.setup_color_options(stacked_layout)
     
         # Export button
-        self.stacked_export_button = self.add_button(stacked_layout, "Export", self.stacked_merge, f"background-color: {button_color}; color: {button_text_color}; border-radius: 5px; padding: 10px; font-size: {button_font_size}px;")
+        self.stacked_export_button = self.add_button(stacked_layout, "Export", self.stacked_merge)
         stacked_layout.addWidget(self.stacked_export_button, alignment=Qt.AlignRight)
     
         self.stacked_widget.addWidget(self.stacked_merge_widget)
         
-    def setup_color_options(self, layout, input_font_size, label_font_size):
+    def setup_color_options(self, layout):
         color_layout = QVBoxLayout()
     
         # Create a horizontal layout for the label and toggle switch
@@ -167,7 +152,6 @@ class MergeSRT(QWidget):
         label_toggle_layout.setContentsMargins(0, 0, 0, 0)  # Set margins to 0
     
         self.color_label = QLabel("Color the merged subtitles?")
-        self.color_label.setStyleSheet(f"color: {self.text_color}; font-size: {label_font_size}px;")
         
         self.color_toggle = ToggleSwitch()
         self.color_toggle.set_state("light")
@@ -184,10 +168,10 @@ class MergeSRT(QWidget):
         self.color_palette_layout = QHBoxLayout()
         self.color_palette = QComboBox()
         self.add_color_options_to_palette()
-        self.color_palette.setStyleSheet(f"background-color: {self.button_color}; color: {self.text_color}; font-size: {input_font_size}px;")
+        set_role(self.color_palette, "field")
         self.color_palette_layout.addWidget(self.color_palette)
     
-        self.hex_input = self.add_input(self.color_palette_layout, "#000000", 100, f"background-color: {self.button_color}; color: {self.text_color}; font-size: {input_font_size}px; padding: 10px;")
+        self.hex_input = self.add_input(self.color_palette_layout, "#000000", 100)
         color_layout.addLayout(self.color_palette_layout)
     
         # Initially hide color options
@@ -195,44 +179,15 @@ class MergeSRT(QWidget):
     
         layout.addLayout(color_layout)
     
-    def get_mode_button_style(self, selected, font_size, button_color, text_color, highlight_color):
-        if selected:
-            return f"background-color: {highlight_color}; color: {text_color}; border-radius: 5px; padding: 10px; font-size: {font_size}px;"
-        return f"background-color: {button_color}; color: {text_color}; border-radius: 5px; padding: 10px; font-size: {font_size}px;"    
-       
     def show_glue_end_to_end(self):
         self.stacked_widget.setCurrentWidget(self.glue_end_to_end_widget)
-        self.glue_end_to_end_button.setStyleSheet(self.get_mode_button_style(
-            selected=True, 
-            font_size=self.font_size - 12,
-            button_color=self.button_color,
-            text_color=self.button_text_color,
-            highlight_color=self.highlight_color
-        ))
-        self.stacked_merge_button.setStyleSheet(self.get_mode_button_style(
-            selected=False, 
-            font_size=self.font_size - 12,
-            button_color=self.button_color,
-            text_color=self.button_text_color,
-            highlight_color=self.highlight_color
-        ))
+        set_selected(self.glue_end_to_end_button, True)
+        set_selected(self.stacked_merge_button, False)
 
     def show_stacked_merge(self):
         self.stacked_widget.setCurrentWidget(self.stacked_merge_widget)
-        self.glue_end_to_end_button.setStyleSheet(self.get_mode_button_style(
-            selected=False, 
-            font_size=self.font_size - 12,
-            button_color=self.button_color,
-            text_color=self.button_text_color,
-            highlight_color=self.highlight_color
-        ))
-        self.stacked_merge_button.setStyleSheet(self.get_mode_button_style(
-            selected=True, 
-            font_size=self.font_size - 12,
-            button_color=self.button_color,
-            text_color=self.button_text_color,
-            highlight_color=self.highlight_color
-        ))
+        set_selected(self.glue_end_to_end_button, False)
+        set_selected(self.stacked_merge_button, True)
 
     def select_main_subtitle(self):
         file_path = self.select_subtitle_file()
@@ -292,39 +247,13 @@ class MergeSRT(QWidget):
         return hours * 3600 + minutes * 60 + seconds
 
     def merge_subtitles_end_to_end(self, main_path, secondary_path, offset_seconds):
-        try:
-            main_content = read_file(main_path)
-            secondary_content = read_file(secondary_path)
-
-            offset_content = self.offset_subtitle_times(secondary_content, offset_seconds)
-            merged_content = main_content + '\n\n' + offset_content
-
-            save_path = self.save_file("Save Merged File", "merged.srt")
-            if save_path:
-                write_file(save_path, merged_content)
-                self.show_success("Merged file saved successfully!")
-        except Exception as e:
-            self.show_error(f"An error occurred while merging the files.\n\n{e}")
-
-    def offset_subtitle_times(self, content, offset_seconds):
-        return '\n'.join(self.offset_line(line, offset_seconds) if ' --> ' in line else line for line in content.split('\n'))
-
-    def offset_line(self, line, offset_seconds):
-        try:
-            start, end = line.split(' --> ')
-            new_start = self.add_seconds_to_time(start, offset_seconds)
-            new_end = self.add_seconds_to_time(end, offset_seconds)
-            return f"{new_start} --> {new_end}"
-        except ValueError:
-            return line
-
-    def add_seconds_to_time(self, time_str, seconds):
-        hours, minutes, secs, millis = map(int, time_str.replace(',', ':').split(':'))
-        total_seconds = hours * 3600 + minutes * 60 + secs + seconds
-        new_hours = total_seconds // 3600
-        new_minutes = (total_seconds % 3600) // 60
-        new_seconds = total_seconds % 60
-        return f"{new_hours:02}:{new_minutes:02}:{new_seconds:02},{millis:03}"
+        if self.job_progress.is_busy():
+            return
+        save_path = self.save_file("Save Merged File", "merged.srt")
+        if save_path:
+            self.job_progress.run(glue_subtitles, main_path, secondary_path, offset_seconds * 1000, save_path,
+                                  on_finished=lambda _: self.show_success("Merged file saved successfully!"),
+                                  on_failed=self.show_merge_error)
 
     def toggle_color_options(self):
         is_visible = self.color_toggle.get_state() == "dark"
@@ -352,15 +281,14 @@ class MergeSRT(QWidget):
             self.show_error("Please select the main subtitle and at least one secondary subtitle file.")
             return
 
+        if self.job_progress.is_busy():
+            return
         color_hex = self.get_selected_color()
-        try:
-            merged_content = merge_subtitles(self.main_subtitle_path, self.secondary_subtitle_paths, color_hex)
-            save_path = self.save_file("Save Merged File", "merged.srt")
-            if save_path:
-                write_file(save_path, merged_content)
-                self.show_success("Merged file saved successfully!")
-        except Exception as e:
-            self.show_error(f"An error occurred while merging the files.\n\n{e}")
+        save_path = self.save_file("Save Merged File", "merged.srt")
+        if save_path:
+            self.job_progress.run(save_merged_subtitles, save_path, self.main_subtitle_path, self.secondary_subtitle_paths, color_hex,
+                                  on_finished=lambda _: self.show_success("Merged file saved successfully!"),
+                                  on_failed=self.show_merge_error)
 
     def get_selected_color(self):
         if self.color_toggle.get_state() == "dark":
@@ -383,6 +311,9 @@ class MergeSRT(QWidget):
         save_path, _ = QFileDialog.getSaveFileName(self, dialog_title, default_name, "Subtitle Files (*.srt)")
         return save_path
 
+    def show_merge_error(self, message):
+        self.show_error(f"An error occurred while merging the files.\n\n{message}")
+
     def show_error(self, message):
         QMessageBox.critical(self, "Error", message)
 
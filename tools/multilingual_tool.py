@@ -1,50 +1,49 @@
 import os
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, 
                              QMessageBox, QLabel, QListWidget, QColorDialog, QListWidgetItem, QStyledItemDelegate)
-from PyQt5.QtGui import QFont, QColor, QPalette
+from PyQt5.QtGui import QFont, QColor
 from PyQt5.QtCore import Qt
-from assets.modules.config import Config
-from .smprocessing import merge_subtitles, read_file, write_file
+from assets.modules.config import get_config
+from assets.modules.job_runner import JobProgress
+from assets.modules.theme import set_role
+from subtl.core import save_merged_subtitles
 
 class MultilingualTool(QWidget):
     def __init__(self, parent=None, back_callback=None):
         super().__init__(parent)
         self.back_callback = back_callback
         self.setFont(QFont("Inter Regular"))
-        self.config = Config()
+        # Styled by the application stylesheet, see assets/modules/theme.py
+        self.setObjectName("toolPage")
+        self.config = get_config()
         self.subtitle_paths = []
         self.colors = []
         self.setup_ui()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
-        palette = self.parent().palette()
-        self.text_color = palette.color(QPalette.WindowText).name()
-        self.background_color = palette.color(QPalette.Window).name()
-        self.button_color = palette.color(QPalette.Button).name()
-        self.button_text_color = palette.color(QPalette.ButtonText).name()
-        self.setStyleSheet(f"background-color: {self.background_color};")
 
         # Back button
-        self.add_button(layout, "Back to Home", self.back_callback, 
-                       f"background-color: {self.button_color}; color: {self.button_text_color}; border-radius: 5px; padding: 10px;")
+        self.add_button(layout, "Back to Home", self.back_callback)
 
         # File selection
-        self.add_button(layout, "Select Subtitles", self.select_subtitles, 
-                       f"background-color: {self.button_color}; color: {self.button_text_color}; border-radius: 5px; padding: 10px;")
+        self.add_button(layout, "Select Subtitles", self.select_subtitles)
 
         # List widget for files and colors
         self.list_widget = QListWidget()
-        self.list_widget.setStyleSheet(f"background-color: {self.button_color}; color: {self.text_color};")
+        set_role(self.list_widget, "field")
         layout.addWidget(self.list_widget)
 
         # Export button
-        self.add_button(layout, "Export", self.export_merged, 
-                       f"background-color: {self.button_color}; color: {self.button_text_color}; border-radius: 5px; padding: 10px;")
+        self.add_button(layout, "Export", self.export_merged)
 
-    def add_button(self, layout, text, callback, style):
+        # Progress of the running export, hidden while idle
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
+    def add_button(self, layout, text, callback, role="flat"):
         button = QPushButton(text)
-        button.setStyleSheet(style)
+        set_role(button, role)
         button.clicked.connect(callback)
         layout.addWidget(button)
         return button
@@ -78,23 +77,14 @@ class MultilingualTool(QWidget):
             QMessageBox.critical(self, "Error", "Please select at least one subtitle file.")
             return
 
-        # Create a dummy main subtitle (empty content)
-        dummy_main = "dummy_main.srt"
-        with open(dummy_main, 'w') as f:
-            f.write("")
+        if self.job_progress.is_busy():
+            return
 
-        try:
-            merged_content = merge_subtitles(
-                dummy_main,
-                self.subtitle_paths,
-                self.colors
+        save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", "multilingual.srt", "Subtitle Files (*.srt)")
+        if save_path:
+            # Every track is a colored secondary; there is no main subtitle
+            self.job_progress.run(
+                save_merged_subtitles, save_path, None, list(self.subtitle_paths), list(self.colors),
+                on_finished=lambda _: QMessageBox.information(self, "Success", "Merged file saved successfully!"),
+                on_failed=lambda message: QMessageBox.critical(self, "Error", f"An error occurred:\n\n{message}"),
             )
-            save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", "multilingual.srt", "Subtitle Files (*.srt)")
-            if save_path:
-                write_file(save_path, merged_content)
-                QMessageBox.information(self, "Success", "Merged file saved successfully!")
-            os.remove(dummy_main)  # Cleanup
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred:\n\n{str(e)}")
-            if os.path.exists(dummy_main):
-                os.remove(dummy_main)
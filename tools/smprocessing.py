@@ -1,5 +1,15 @@
-import re
-from datetime import datetime, timedelta
+import heapq
+import os
+from array import array
+from operator import itemgetter
+from .cuestore import CueStore
+from .timecodes import NUMPY_MIN_BATCH, format_srt_time, get_numpy
+from .srtstream import iter_srt_file
+
+# Buffer size for written files, so streamed output reaches the disk in large writes
+WRITE_BUFFER_SIZE = 1 << 20
+# Read size for each file of a k-way merge, kept small since every input holds one chunk at a time
+MERGE_CHUNK_SIZE = 1 << 16
 
 def read_file(file_path):
     """Reads the content of a subtitle file."""
@@ -7,106 +17,167 @@ def read_file(file_path):
         return file.read()
 
 def write_file(file_path, content):
-    """Writes content to a subtitle file."""
-    with open(file_path, 'w', encoding='utf-8') as file:
-        file.write(content)
+    """Writes content, either a string or an iterable of chunks, to a subtitle file.
+
+    The content goes to a temporary file that replaces the target only once it
+    is complete, so a failed or cancelled write leaves any existing file intact.
+    """
+    temp_path = f"{file_path}.part"
+    try:
+        with open(temp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as file:
+            if isinstance(content, str):
+                file.write(content)
+            else:
+                file.writelines(content)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class UnsortedTrackError(ValueError):
+    """Raised when a subtitle file streamed into a k-way merge is not in start order."""
 
 def merge_subtitles(main_file_path, secondary_file_paths, color_hex=None):
     """Merges multiple subtitle files into one, ensuring blocks with overlapping timestamps are unified."""
-    main_content = read_file(main_file_path)
-    secondary_contents = [read_file(path) for path in secondary_file_paths]
-
-    if color_hex:
-        if isinstance(color_hex, list):
-            if len(color_hex) != len(secondary_contents):
-                raise ValueError("Number of colors must match number of secondary files.")
-            secondary_contents = [color_subtitles(content, hex) for content, hex in zip(secondary_contents, color_hex)]
-        secondary_contents = [color_subtitles(content, color_hex) for content in secondary_contents]
-
-    merged_blocks = parse_subtitle_blocks(main_content)
-    for content in secondary_contents:
-        secondary_blocks = parse_subtitle_blocks(content)
-        for timestamp, text in secondary_blocks.items():
-            if timestamp in merged_blocks:
-                merged_blocks[timestamp] += '\n' + text
-            else:
-                merged_blocks[timestamp] = text
-
-    unified_blocks = unify_overlapping_blocks(merged_blocks)
-    sorted_unified_blocks = dict(sorted(unified_blocks.items(), key=lambda x: parse_timestamp(x[0].split(' --> ')[0])))
-    merged_content = format_subtitle_blocks(sorted_unified_blocks)
-    return merged_content
-
-def parse_subtitle_blocks(content):
-    """Parses subtitle content into blocks and removes existing numbering."""
-    blocks = {}
-    pattern = re.compile(r'\d+\n(\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3})\n(.+?)(?=\n\d+\n|\Z)', re.DOTALL)
-    matches = pattern.findall(content)
-    for match in matches:
-        timestamp, text = match
-        text = text.strip()
-        if timestamp in blocks:
-            blocks[timestamp] += '\n' + text
-        else:
-            blocks[timestamp] = text
-    return blocks
-
-def format_subtitle_blocks(blocks):
-    """Formats subtitle blocks into content with corrected numbering."""
-    formatted_content = ""
-    for index, (timestamp, text) in enumerate(blocks.items(), start=1):
-        formatted_content += f"{index}\n{timestamp}\n{text}\n\n"
-    return formatted_content.strip()
-
-def color_subtitles(content, color_hex):
-    """Colors the subtitle text with the given hex color."""
-    def replace_text_with_color(match):
-        text = match.group(2).strip()
-        return f'{match.group(1)}\n<font color="{color_hex}">{text}</font>'
-
-    colored_content = re.sub(r'(\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3})\n(.+?)(?=\n\d+\n|\Z)', replace_text_with_color, content, flags=re.DOTALL)
-    return colored_content
-
-def unify_overlapping_blocks(blocks):
-    """Combines subtitle blocks with overlapping timestamps into unified blocks."""
-    sorted_blocks = sorted(blocks.items(), key=lambda x: parse_timestamp(x[0].split(' --> ')[0]))
-    unified_blocks = {}
-    
-    current_start = None
-    current_end = None
-    current_text = ""
-    
-    for timestamp, text in sorted_blocks:
-        start, end = timestamp.split(' --> ')
-        start_time = parse_timestamp(start)
-        end_time = parse_timestamp(end)
-        
-        if current_start is None:
-            current_start = start_time
-            current_end = end_time
-            current_text = text
+    tracks = merge_tracks(main_file_path, secondary_file_paths, color_hex)
+    try:
+        return "".join(iter_merged_srt(tracks))
+    except UnsortedTrackError:
+        return merge_unsorted_subtitles(tracks)
+
+def merge_tracks(main_file_path, secondary_file_paths, color_hex=None):
+    """Pairs every input file with its text color; the main file, if any, stays uncolored."""
+    if isinstance(color_hex, list):
+        if len(color_hex) != len(secondary_file_paths):
+            raise ValueError("Number of colors must match number of secondary files.")
+        colors = color_hex
+    else:
+        colors = [color_hex] * len(secondary_file_paths)
+    tracks = list(zip(secondary_file_paths, colors))
+    if main_file_path:
+        tracks.insert(0, (main_file_path, None))
+    return tracks
+
+def iter_track_cues(file_path, color_hex=None):
+    """Streams the (start_ms, end_ms, text) cues of a subtitle file, raising UnsortedTrackError if they go out of start order."""
+    previous_start = 0
+    for _, start_ms, end_ms, text in iter_srt_file(file_path, chunk_size=MERGE_CHUNK_SIZE):
+        if start_ms < previous_start:
+            raise UnsortedTrackError(f"{file_path} is not sorted by start time.")
+        previous_start = start_ms
+        yield start_ms, end_ms, color_text(text, color_hex) if color_hex else text.strip()
+
+def iter_merged_cues(tracks):
+    """Yields the unified cues of (file_path, color_hex) tracks, streamed through a k-way heap merge."""
+    return unify_sorted_cues(iter_sorted_cues(tracks))
+
+def iter_sorted_cues(tracks):
+    """Yields the cues of (file_path, color_hex) tracks in start order through a k-way heap merge of their streams.
+
+    Each file is read as a stream and the heap holds one cue per file, so memory
+    grows with the number of files, not with the total number of cues. Ties
+    keep the order of the tracks.
+    """
+    streams = [iter_track_cues(path, color) for path, color in tracks]
+    return heapq.merge(*streams, key=itemgetter(0))
+
+def unify_sorted_cues(cues):
+    """Combines overlapping (start_ms, end_ms, text) cues of a stream already in start order, holding only the current run."""
+    group = []
+    group_start = group_end = 0
+    for start, end, text in cues:
+        if group and start <= group_end:
+            group.append(text)
+            if end > group_end:
+                group_end = end
         else:
-            if start_time <= current_end:
-                current_end = max(current_end, end_time)
-                current_text += '\n' + text
+            if group:
+                yield group_start, group_end, '\n'.join(group)
+            group = [text]
+            group_start, group_end = start, end
+    if group:
+        yield group_start, group_end, '\n'.join(group)
+
+def iter_merged_srt(tracks):
+    """Yields the merged tracks as SRT blocks with fresh numbering."""
+    return iter_srt_blocks(iter_merged_cues(tracks))
+
+def iter_srt_blocks(cues):
+    """Yields (start_ms, end_ms, text) cues as SRT blocks with fresh numbering."""
+    for index, (start_ms, end_ms, text) in enumerate(cues, start=1):
+        separator = "\n" if index > 1 else ""
+        yield f"{separator}{index}\n{format_srt_time(start_ms)} --> {format_srt_time(end_ms)}\n{text}\n"
+
+def merge_unsorted_subtitles(tracks):
+    """Merges (file_path, color_hex) tracks in memory with one sort and a sweep, for files that are not in start order."""
+    starts, ends, texts = array('q'), array('q'), []
+    for path, color in tracks:
+        with CueStore.from_srt_mmap(path) as track:
+            starts.extend(track.start)
+            ends.extend(track.end)
+            if color:
+                texts.extend(color_text(text, color) for text in track.texts())
             else:
-                unified_blocks[f"{format_timestamp(current_start)} --> {format_timestamp(current_end)}"] = current_text
-                current_start = start_time
-                current_end = end_time
-                current_text = text
-    
-    if current_start is not None:
-        unified_blocks[f"{format_timestamp(current_start)} --> {format_timestamp(current_end)}"] = current_text
-        
-    return unified_blocks
-
-def parse_timestamp(timestamp):
-    """Parses a timestamp string into a datetime object."""
-    return datetime.strptime(timestamp, "%H:%M:%S,%f")
-
-def format_timestamp(timestamp):
-    """Formats a datetime object into a timestamp string."""
-    return timestamp.strftime("%H:%M:%S,%f")[:-3]
+                texts.extend(text.strip() for text in track.texts())
+
+    # The unified cues come out in start order, so no second sort is needed
+    return unify_overlapping(CueStore.from_columns(starts, ends, texts)).to_srt()
+
+def color_text(text, color_hex):
+    """Wraps subtitle text in a font tag with the given hex color."""
+    return f'<font color="{color_hex}">{text.strip()}</font>'
+
+def unify_overlapping(store):
+    """Combines overlapping cues of a CueStore into unified cues, in start order.
+
+    Runs as one stable sort of the start times followed by one linear sweep
+    over the int arrays; the texts of each run are joined once from its index list.
+    """
+    texts = list(store.texts())
+    starts, ends, unified_texts = array('q'), array('q'), []
+    for start, end, group in iter_overlap_groups(store.start, store.end):
+        starts.append(start)
+        ends.append(end)
+        unified_texts.append(texts[group[0]] if len(group) == 1 else '\n'.join([texts[index] for index in group]))
+    return CueStore.from_columns(starts, ends, unified_texts)
+
+def iter_overlap_groups(starts, ends):
+    """Yields (start, end, indices) for every run of overlapping cues, in start order."""
+    numpy = get_numpy()
+    if numpy is not None and len(starts) >= NUMPY_MIN_BATCH:
+        yield from _iter_overlap_groups_numpy(numpy, starts, ends)
+        return
+    group = []
+    group_start = group_end = 0
+    for index in sorted(range(len(starts)), key=starts.__getitem__):
+        start, end = starts[index], ends[index]
+        if group and start <= group_end:
+            group.append(index)
+            if end > group_end:
+                group_end = end
+        else:
+            if group:
+                yield group_start, group_end, group
+            group = [index]
+            group_start, group_end = start, end
+    if group:
+        yield group_start, group_end, group
+
+def _iter_overlap_groups_numpy(numpy, starts, ends):
+    starts = numpy.frombuffer(starts, dtype=numpy.int64)
+    ends = numpy.frombuffer(ends, dtype=numpy.int64)
+    order = numpy.argsort(starts, kind='stable')
+    sorted_starts = starts[order]
+    # A run ends where the next start is past the furthest end seen so far
+    furthest_end = numpy.maximum.accumulate(ends[order])
+    breaks = numpy.flatnonzero(sorted_starts[1:] > furthest_end[:-1]) + 1
+    bounds = numpy.concatenate(([0], breaks, [len(order)])).tolist()
+    order = order.tolist()
+    group_starts = sorted_starts[bounds[:-1]].tolist()
+    group_ends = furthest_end[numpy.array(bounds[1:]) - 1].tolist()
+    for position, (begin, end) in enumerate(zip(bounds, bounds[1:])):
+        yield group_starts[position], group_ends[position], order[begin:end]
 
 # Example usage:
 if __name__ == "__main__":
@@ -0,0 +1,270 @@
+import re
+from .timecodes import HOURS_MINUTES_MS as _HOURS_MINUTES_MS, MILLIS as _MILLIS, SECONDS_MS as _SECONDS_MS
+from .timecodes import try_parse_clock
+
+UTF8_BOM = b'\xef\xbb\xbf'
+CHUNK_SIZE = 1 << 20
+
+# Numbered cue header with a regular HH:MM:SS,mmm timing line, as found in nearly every SRT file
+CUE_HEADER_PATTERN = re.compile(
+    rb'[ \t]*\d+[ \t]*\r?\n(\d\d:\d\d):(\d\d),(\d\d\d) --> (\d\d:\d\d):(\d\d),(\d\d\d)[ \t]*\r?\n')
+
+def parse_timing_line(line):
+    """Parses an SRT timing line into (start_ms, end_ms), or None if it is not one."""
+    if isinstance(line, bytes):
+        line = line.decode('ascii', 'replace')
+    start, sep, end = line.partition('-->')
+    if not sep:
+        return None
+    start = start.strip()
+    end = end.strip().split(' ', 1)[0]  # Drop VTT-style cue settings if any
+    start_ms = _parse_timestamp(start)
+    end_ms = _parse_timestamp(end)
+    if start_ms is None or end_ms is None:
+        return None
+    return start_ms, end_ms
+
+def _parse_timestamp(timestamp):
+    if len(timestamp) == 12 and timestamp[2] == ':' and timestamp[5] == ':':
+        try:
+            return (int(timestamp[0:2]) * 3600000 + int(timestamp[3:5]) * 60000
+                    + int(timestamp[6:8]) * 1000 + int(timestamp[9:12]))
+        except ValueError:
+            pass
+    # Not in the fixed-width form, e.g. the hour-less MM:SS.mmm form WebVTT allows
+    return try_parse_clock(timestamp)
+
+def iter_srt_lines(lines, encoding='utf-8', counter=0):
+    """Tokenizes an iterable of SRT lines (bytes or str) into (index, start_ms, end_ms, text) records.
+
+    Works line by line in a single pass, so memory stays constant regardless of
+    input size. Handles a leading BOM, CRLF line endings, missing cue numbers and
+    missing blank lines between cues.
+    """
+    index = None
+    timing = None
+    text_lines = []
+    pending_number = None
+    first = True
+
+    def finish():
+        if isinstance(text_lines[0] if text_lines else '', bytes):
+            text = b'\n'.join(text_lines).decode(encoding, 'replace')
+        else:
+            text = '\n'.join(text_lines)
+        return index if index is not None else counter, timing[0], timing[1], text
+
+    for line in lines:
+        if first:
+            first = False
+            if isinstance(line, bytes):
+                if line.startswith(UTF8_BOM):
+                    line = line[3:]
+            elif line.startswith('\ufeff'):
+                line = line[1:]
+        line = line.rstrip('\r\n' if isinstance(line, str) else b'\r\n')
+        stripped = line.strip()
+
+        if timing is None:
+            # Looking for the next cue header
+            if not stripped:
+                continue
+            if stripped.isdigit():
+                index = int(stripped)
+                continue
+            parsed = parse_timing_line(stripped)
+            if parsed is not None:
+                counter += 1
+                timing = parsed
+            continue
+
+        # Inside a cue body
+        if not stripped:
+            if pending_number is not None:
+                text_lines.append(pending_number)
+                pending_number = None
+            yield finish()
+            index, timing, text_lines = None, None, []
+            continue
+        if pending_number is not None:
+            parsed = parse_timing_line(stripped)
+            if parsed is not None:
+                # A cue number followed by a timing line starts a new cue
+                yield finish()
+                counter += 1
+                index, timing, text_lines = int(pending_number), parsed, []
+                pending_number = None
+                continue
+            text_lines.append(pending_number)
+            pending_number = None
+        if stripped.isdigit():
+            pending_number = line
+            continue
+        text_lines.append(line)
+
+    if timing is not None:
+        if pending_number is not None:
+            text_lines.append(pending_number)
+        yield finish()
+
+def iter_srt_records(stream, encoding='utf-8', chunk_size=CHUNK_SIZE):
+    """Tokenizes a binary SRT stream into (index, start_ms, end_ms, text) records.
+
+    The stream is read once in fixed-size chunks and split on blank lines, so the
+    per-cue work is a few slices and table lookups. Blocks that do not
+    look like a regular cue are handed to iter_srt_lines.
+    """
+    carry = b''
+    counter = 0
+    first = True
+    while True:
+        chunk = stream.read(chunk_size)
+        if first:
+            first = False
+            if chunk.startswith(UTF8_BOM):
+                chunk = chunk[3:]
+        if not chunk:
+            break
+        data = carry + chunk
+        if data.endswith(b'\r'):
+            # Keep a split CRLF together for the next round
+            data, carry_cr = data[:-1], b'\r'
+        else:
+            carry_cr = b''
+        blocks = data.replace(b'\r\n', b'\n').split(b'\n\n')
+        carry = blocks.pop() + carry_cr
+        for block in blocks:
+            record = _parse_block(block, encoding)
+            if record is not None:
+                counter += 1
+                yield record
+            elif block.strip(b'\n'):
+                for record in iter_srt_lines(block.split(b'\n'), encoding, counter):
+                    counter += 1
+                    yield record
+    carry = carry.replace(b'\r\n', b'\n')
+    record = _parse_block(carry, encoding)
+    if record is not None:
+        yield record
+    elif carry.strip(b'\n'):
+        yield from iter_srt_lines(carry.split(b'\n'), encoding, counter)
+
+def _parse_block(block, encoding):
+    """Parses a regular numbered cue block, or returns None for anything unusual."""
+    number, _, rest = block.lstrip(b'\n').partition(b'\n')
+    timing, _, text = rest.partition(b'\n')
+    if (len(timing) != 29 or timing[12:17] != b' --> ' or not number.isdigit()
+            or b'-->' in text):
+        return None
+    try:
+        start_ms = _HOURS_MINUTES_MS[timing[0:5]] + _SECONDS_MS[timing[6:8]] + _MILLIS[timing[9:12]]
+        end_ms = _HOURS_MINUTES_MS[timing[17:22]] + _SECONDS_MS[timing[23:25]] + _MILLIS[timing[26:29]]
+    except KeyError:
+        return None
+    return int(number), start_ms, end_ms, text.rstrip(b'\n').decode(encoding, 'replace')
+
+def _parse_timing_bytes(line):
+    """Parses a timing line held in bytes, using the lookup tables when it has the regular layout."""
+    if len(line) == 29 and line[12:17] == b' --> ':
+        try:
+            return (_HOURS_MINUTES_MS[line[0:5]] + _SECONDS_MS[line[6:8]] + _MILLIS[line[9:12]],
+                    _HOURS_MINUTES_MS[line[17:22]] + _SECONDS_MS[line[23:25]] + _MILLIS[line[26:29]])
+        except KeyError:
+            pass
+    if b'-->' not in line:
+        return None
+    return parse_timing_line(line)
+
+def _next_line(buffer, position, size):
+    """Returns (line, line_end, next_position) for the line starting at position, without its line ending."""
+    newline = buffer.find(b'\n', position)
+    if newline < 0:
+        newline = size
+    line_end = newline
+    if line_end > position and buffer[line_end - 1] == 13:  # \r
+        line_end -= 1
+    return buffer[position:line_end], line_end, newline + 1
+
+def iter_srt_spans(buffer):
+    """Tokenizes SRT held in a bytes-like buffer into (start_ms, end_ms, text_begin, text_end) records.
+
+    The buffer can be bytes or an mmap. Cue text is neither copied nor decoded;
+    callers slice buffer[text_begin:text_end] for the cues they actually need.
+    Follows the same rules as iter_srt_lines.
+    """
+    size = len(buffer)
+    position = len(UTF8_BOM) if buffer[:len(UTF8_BOM)] == UTF8_BOM else 0
+    first_newline = buffer.find(b'\n')
+    separator = b'\r\n\r\n' if first_newline > 0 and buffer[first_newline - 1] == 13 else b'\n\n'
+    line_ending = len(separator) // 2
+    match_header = CUE_HEADER_PATTERN.match
+    find = buffer.find
+    timing = None
+    text_begin = text_end = 0
+    while position < size:
+        if timing is None:
+            # Regular cue: number, timing line and text up to the next blank line
+            match = match_header(buffer, position)
+            if match is not None:
+                text_begin = match.end()
+                block_end = find(separator, text_begin - line_ending)
+                if block_end < 0:
+                    block_end = size
+                    while block_end > text_begin and buffer[block_end - 1] in (10, 13):
+                        block_end -= 1
+                if find(b'-->', text_begin, block_end) < 0:
+                    hours_minutes, seconds, millis, end_hours_minutes, end_seconds, end_millis = match.groups()
+                    yield (_HOURS_MINUTES_MS[hours_minutes] + _SECONDS_MS[seconds] + _MILLIS[millis],
+                           _HOURS_MINUTES_MS[end_hours_minutes] + _SECONDS_MS[end_seconds] + _MILLIS[end_millis],
+                           text_begin, max(block_end, text_begin))
+                    position = block_end + len(separator)
+                    continue
+
+        line, line_end, next_position = _next_line(buffer, position, size)
+        stripped = line.strip()
+        if timing is None:
+            # Looking for the next cue header
+            if stripped and not stripped.isdigit():
+                timing = _parse_timing_bytes(stripped)
+                text_begin = text_end = next_position
+        elif not stripped:
+            yield timing[0], timing[1], text_begin, text_end
+            timing = None
+        else:
+            parsed = None
+            if stripped.isdigit() and next_position < size:
+                # A cue number followed by a timing line starts a new cue
+                parsed = _parse_timing_bytes(_next_line(buffer, next_position, size)[0].strip())
+            if parsed is not None:
+                yield timing[0], timing[1], text_begin, text_end
+                timing = parsed
+                next_position = _next_line(buffer, next_position, size)[2]
+                text_begin = text_end = next_position
+            else:
+                text_end = line_end
+        position = next_position
+    if timing is not None:
+        yield timing[0], timing[1], text_begin, text_end
+
+def iter_srt_file(file_path, encoding='utf-8', chunk_size=CHUNK_SIZE):
+    """Tokenizes an SRT file on disk without reading it fully into memory."""
+    with open(file_path, 'rb') as stream:
+        yield from iter_srt_records(stream, encoding, chunk_size)
+
+def count_srt_cues(file_path):
+    """Counts the timing lines of an SRT file without tokenizing it, for sizing progress reports."""
+    count = 0
+    carry = b''
+    with open(file_path, 'rb') as stream:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                return count
+            # Keep the tail so an arrow split across two chunks is still counted once
+            data = carry + chunk
+            count += data.count(b'-->')
+            carry = data[-2:] if not data.endswith(b'-->') else b''
+
+def iter_srt_string(content):
+    """Tokenizes SRT content that is already held in a string."""
+    return iter_srt_lines(content.splitlines())
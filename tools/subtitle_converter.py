@@ -1,41 +1,33 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox, QListWidget, QComboBox
-from PyQt5.QtGui import QFont, QPalette
-from tools.subtitleconverter.vtt_converter import convert_to_vtt
-from tools.subtitleconverter.ass_converter import convert_to_ass
-from tools.subtitleconverter.sub_converter import convert_to_sub
-from tools.subtitleconverter.ssa_converter import convert_to_ssa
-from tools.subtitleconverter.sbv_converter import convert_to_sbv
-from tools.subtitleconverter.dfp_converter import convert_to_dfxp
-from tools.subtitleconverter.stl_converter import convert_to_stl
-from tools.subtitleconverter.mpl_converter import convert_to_mpl
-from tools.subtitleconverter.usf_converter import convert_to_usf
-from tools.subtitleconverter.lrc_converter import convert_to_lrc
-from tools.subtitleconverter.rt_converter import convert_to_rt
-from tools.subtitleconverter.ttml_converter import convert_to_ttml
-from tools.subtitleconverter.cap_converter import convert_to_cap
-from assets.modules.config import Config
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox, QListWidget, QListWidgetItem, QComboBox
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+from subtl.core import convert_subtitle, convert_subtitle_many, planned_targets, run_parallel
+from tools.subtitleconverter import AUTO_FORMAT
+from assets.modules.batch_output import BatchOutputOptions, flat_outputs
+from assets.modules.job_runner import JobProgress
+from assets.modules.config import get_config
+from assets.modules.theme import set_role
 import os
 
+FORMAT_CHOICES = [
+    "SRT (.srt)", "SUB (.sub)", "TXT (.txt)", "ASS (.ass)", "SSA (.ssa)",
+    "VTT (.vtt)", "SBV (.sbv)", "DFXP (.dfxp)", "STL (.stl)",
+    "MPL (.mpl)", "USF (.usf)", "LRC (.lrc)", "RT (.rt)", "TTML (.ttml)", "CAP (.cap)"
+]
+
 class SubtitleConverter(QWidget):
     def __init__(self, parent=None, back_callback=None):
         super().__init__(parent)
         self.back_callback = back_callback
         self.setFont(QFont("Inter Regular"))
-        self.config = Config()
+        # Styled by the application stylesheet, see assets/modules/theme.py
+        self.setObjectName("toolPage")
+        self.config = get_config()
         self.init_ui()
-        self.apply_theme()
 
     def init_ui(self):
         layout = QVBoxLayout()
 
-        text_size = self.config.get_text_size()
-        font_size = {
-            "small": 18,
-            "default": 26,
-            "large": 34,
-            "huge": 42
-        }.get(text_size, 26)
-
         # Back to Home button
         self.back_button = QPushButton("Back to Home")
         self.back_button.clicked.connect(self.back_callback)
@@ -53,104 +45,126 @@ class SubtitleConverter(QWidget):
 
         layout.addLayout(file_layout)
 
-        # Target format dropdown
+        # Source and target format dropdowns
         format_layout = QHBoxLayout()
 
-        self.format_label = QLabel("Select Source Format:")
+        self.source_label = QLabel("Source Format:")
+        format_layout.addWidget(self.source_label)
+
+        self.source_dropdown = QComboBox()
+        # Auto-detect sniffs each file's format, so a mixed batch converts in one go
+        self.source_dropdown.addItem("Auto-detect")
+        self.source_dropdown.addItems(FORMAT_CHOICES)
+        format_layout.addWidget(self.source_dropdown)
+
+        self.format_label = QLabel("Select Target Format:")
         format_layout.addWidget(self.format_label)
 
         self.format_dropdown = QComboBox()
-        self.format_dropdown.addItems([
-            "SRT (.srt)", "SUB (.sub)", "TXT (.txt)", "ASS (.ass)", "SSA (.ssa)",
-            "VTT (.vtt)", "SBV (.sbv)", "DFXP (.dfxp)", "STL (.stl)", "IDX (.idx)",
-            "MPL (.mpl)", "USF (.usf)", "LRC (.lrc)", "RT (.rt)", "TTML (.ttml)", "CAP (.cap)"
-        ])
+        self.format_dropdown.addItems(FORMAT_CHOICES)
         self.format_dropdown.currentIndexChanged.connect(self.update_convert_button)
         format_layout.addWidget(self.format_dropdown)
 
         layout.addLayout(format_layout)
 
+        # Extra target formats, all written from the same parse as the main target format
+        extra_layout = QHBoxLayout()
+        self.extra_label = QLabel("Also Convert To:")
+        extra_layout.addWidget(self.extra_label)
+        self.extra_formats = QListWidget()
+        self.extra_formats.setFlow(QListWidget.LeftToRight)
+        self.extra_formats.setWrapping(True)
+        self.extra_formats.setMaximumHeight(90)
+        for choice in FORMAT_CHOICES:
+            item = QListWidgetItem(choice)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self.extra_formats.addItem(item)
+        self.extra_formats.itemChanged.connect(self.update_convert_button)
+        extra_layout.addWidget(self.extra_formats, 1)
+        layout.addLayout(extra_layout)
+
+        # Where the converted files go and how they are named, so a batch needs no dialog per file
+        self.batch_output = BatchOutputOptions("{stem}.{fmt}")
+        layout.addWidget(self.batch_output)
+
         # Convert button
-        self.convert_button = QPushButton("Convert to CAP")
+        self.convert_button = QPushButton("Convert to SRT")
         self.convert_button.clicked.connect(self.convert_subtitle)
         layout.addWidget(self.convert_button)
 
+        # Progress of the running conversion, hidden while idle
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
         self.setLayout(layout)
 
         # Apply the same style to all buttons
-        self.apply_button_styles([self.back_button, self.select_file_button, self.convert_button])
-
-    def apply_theme(self):
-        # Retrieve the current palette colors
-        palette = self.parent().palette()
-        text_color = palette.color(QPalette.WindowText).name()
-        background_color = palette.color(QPalette.Window).name()
-        button_color = palette.color(QPalette.Button).name()
-        button_text_color = palette.color(QPalette.ButtonText).name()
-        highlight_color = palette.color(QPalette.Highlight).name()
-        hover_color = palette.color(QPalette.Highlight).darker().name()
-
-        self.setStyleSheet(f"background-color: {background_color};")
-        self.file_list.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
-        self.format_label.setStyleSheet(f"color: {text_color};")
-        self.format_dropdown.setStyleSheet(f"background-color: {background_color}; color: {text_color};")
-
-        self.back_button.setStyleSheet(f"""
-            QPushButton {{
-                border: 2px solid {highlight_color};
-                color: {button_text_color};
-                border-radius: 10px;
-                padding: 10px;
-                background-color: {button_color};
-            }}
-            QPushButton:hover {{
-                border-color: {hover_color};
-                background-color: {hover_color};
-            }}
-        """)
-
-        self.select_file_button.setStyleSheet(self.back_button.styleSheet())
-        self.convert_button.setStyleSheet(self.back_button.styleSheet())
-
-    def apply_button_styles(self, buttons):
-        for button in buttons:
-            button.setStyleSheet(self.back_button.styleSheet())
+        for button in (self.back_button, self.select_file_button, self.convert_button):
+            set_role(button, "action")
 
     def select_files(self):
-        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Subtitle Files", "", "Subtitle Files (*.srt *.ass *.sub *.txt *.ssa *.vtt *.sbv *.dfxp *.stl *.idx *.mpl *.usf *.lrc *.rt *.ttml *.cap)")
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Subtitle Files", "", "Subtitle Files (*.srt *.ass *.sub *.txt *.ssa *.vtt *.sbv *.dfxp *.stl *.mpl *.usf *.lrc *.rt *.ttml *.cap)")
         if file_paths:
             self.file_list.clear()
             for file_path in file_paths:
                 self.file_list.addItem(os.path.basename(file_path))
             self.file_list.file_paths = file_paths
 
+    def target_formats(self):
+        """Returns the main target format followed by every other checked format, in lower case."""
+        formats = [self.format_dropdown.currentText().split(' ')[0].lower()]
+        for index in range(self.extra_formats.count()):
+            item = self.extra_formats.item(index)
+            fmt = item.text().split(' ')[0].lower()
+            if item.checkState() == Qt.Checked and fmt not in formats:
+                formats.append(fmt)
+        return formats
+
     def update_convert_button(self):
-        target_format = self.format_dropdown.currentText().split(' ')[0]
-        self.convert_button.setText(f"Convert to {target_format}")
+        formats = self.target_formats()
+        text = f"Convert to {formats[0].upper()}"
+        if len(formats) > 1:
+            text += f" + {len(formats) - 1} more"
+        self.convert_button.setText(text)
 
     def convert_subtitle(self):
         if self.file_list.count() == 0:
             QMessageBox.warning(self, "Error", "Please select at least one file to convert.")
             return
 
-        target_format = self.format_dropdown.currentText().split(' ')[0].lower()  # Extract format (e.g., "srt")
-        for index in range(self.file_list.count()):
-            subtitle_path = self.file_list.file_paths[index]
-            save_path, _ = QFileDialog.getSaveFileName(self, "Save Converted File", "", f"{target_format.upper()} Files (*.{target_format})")
-            if not save_path:
-                continue
-
-            try:
-                with open(subtitle_path, 'r') as file:
-                    content = file.read()
-
-                # Convert the content to the selected format (example for CAP)
-                converted_content = convert_to_cap(content, target_format)
-
-                with open(save_path, 'w') as file:
-                    file.write(converted_content)
-
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to convert file: {e}")
+        if self.job_progress.is_busy():
+            return
 
-        QMessageBox.information(self, "Success", f"Subtitle files converted to {target_format.upper()} successfully!")
+        if self.source_dropdown.currentIndex() == 0:
+            source_format = AUTO_FORMAT
+        else:
+            source_format = self.source_dropdown.currentText().split(' ')[0].lower()  # Extract format (e.g., "srt")
+        target_formats = self.target_formats()
+        target_format = ", ".join(fmt.upper() for fmt in target_formats)
+        if len(target_formats) > 1:
+            # Parse each file once and write every format from it
+            outputs = self.batch_output.plan(self.file_list.file_paths, target_formats)
+            if outputs is None:
+                return
+            function = convert_subtitle_many
+            jobs = [(subtitle_path, source_format, planned_targets(targets)) for subtitle_path, targets in outputs
+                    if planned_targets(targets)]
+        else:
+            # Plan every output path up front, then convert the files in parallel in the background
+            outputs = self.batch_output.plan(self.file_list.file_paths, target_formats[0])
+            if outputs is None:
+                return
+            function = convert_subtitle
+            jobs = [(subtitle_path, source_format, target_formats[0], save_path) for subtitle_path, save_path in outputs if save_path]
+
+        self.job_progress.run(run_parallel, function, jobs,
+                              on_finished=lambda converted: self.show_converted(converted, outputs, target_format),
+                              on_failed=lambda message: QMessageBox.critical(self, "Error", message))
+
+    def show_converted(self, converted, outputs, target_format):
+        message = self.batch_output.summary(converted, outputs)
+        if converted < sum(1 for _, save_path in flat_outputs(outputs) if save_path):
+            QMessageBox.critical(self, "Error", message)
+        else:
+            QMessageBox.information(self, "Success", f"Subtitle files converted to {target_format} successfully!\n\n{message}")
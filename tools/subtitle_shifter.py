@@ -1,21 +1,27 @@
 import os
-import re
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit, QStackedWidget, QFrame
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit, QStackedWidget, QFrame, QComboBox, QListWidget
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPalette, QColor, QFont
-from assets.modules.config import Config
+from assets.modules.batch_output import BatchOutputOptions
+from assets.modules.config import get_config
+from assets.modules.job_runner import JobProgress
+from assets.modules.theme import set_role, set_selected
+from subtl.core import run_parallel, shift_subtitle, shift_subtitle_ranges
+from .timecodes import parse_srt_time
 
 class SubtitleShifter(QWidget):
     def __init__(self, parent=None, back_callback=None):
         super().__init__(parent)
         self.back_callback = back_callback
         self.setFont(QFont("Inter Regular"))
+        # Styled by the application stylesheet, see assets/modules/theme.py
+        self.setObjectName("toolPage")
         self.subtitle_path = ""
-        self.config = Config()
-        self.font_size = None  # Initialize font_size attribute
+        self.subtitle_paths = []
+        self.shift_ranges = []
+        self.config = get_config()
         self.setup_ui()
-        self.apply_theme()  # Ensure apply_theme is called before show_whole_shift
-        self.show_whole_shift()  # Move show_whole_shift here
+        self.show_whole_shift()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -39,8 +45,13 @@ class SubtitleShifter(QWidget):
         # Partial Shift mode
         self.setup_partial_shift_mode()
 
-    def add_button(self, layout, text, callback):
+        # Progress of the running shift, hidden while idle
+        self.job_progress = JobProgress(self)
+        layout.addWidget(self.job_progress)
+
+    def add_button(self, layout, text, callback, role="action"):
         button = QPushButton(text)
+        set_role(button, role)
         button.clicked.connect(callback)
         layout.addWidget(button)
         return button
@@ -67,8 +78,8 @@ class SubtitleShifter(QWidget):
         mode_layout = QHBoxLayout()
         self.mode_label = self.add_label(mode_layout, "Select Mode:")
 
-        self.whole_shift_button = self.add_button(mode_layout, "Whole Shift", self.show_whole_shift)
-        self.partial_shift_button = self.add_button(mode_layout, "Partial Shift", self.show_partial_shift)
+        self.whole_shift_button = self.add_button(mode_layout, "Whole Shift", self.show_whole_shift, "flat")
+        self.partial_shift_button = self.add_button(mode_layout, "Partial Shift", self.show_partial_shift, "flat")
 
         layout.addLayout(mode_layout)
 
@@ -78,7 +89,7 @@ class SubtitleShifter(QWidget):
 
         # Subtitle file selection
         file_layout = QHBoxLayout()
-        self.select_file_button = self.add_button(file_layout, "Select Subtitle File", self.select_subtitle)
+        self.select_file_button = self.add_button(file_layout, "Select Subtitle Files", self.select_subtitle)
         self.file_preview = self.add_label(file_layout, "")
         whole_layout.addLayout(file_layout)
 
@@ -88,6 +99,10 @@ class SubtitleShifter(QWidget):
         self.ms_input = self.add_input(ms_layout, "1000", 100)
         whole_layout.addLayout(ms_layout)
 
+        # Where the shifted files go and how they are named, so a batch needs no dialog per file
+        self.batch_output = BatchOutputOptions("{stem}.{ext}")
+        whole_layout.addWidget(self.batch_output)
+
         # Shift button
         self.shift_button = self.add_button(whole_layout, "Shift", self.whole_shift)
 
@@ -103,6 +118,15 @@ class SubtitleShifter(QWidget):
         self.file_preview_partial = self.add_label(file_layout, "")
         partial_layout.addLayout(file_layout)
 
+        # Ranges can be given as times or as cue numbers
+        range_type_layout = QHBoxLayout()
+        self.range_type_label = self.add_label(range_type_layout, "Range by:")
+        self.range_type_dropdown = QComboBox()
+        self.range_type_dropdown.addItems(["Time", "Cue number"])
+        self.range_type_dropdown.currentIndexChanged.connect(self.update_range_type)
+        range_type_layout.addWidget(self.range_type_dropdown)
+        partial_layout.addLayout(range_type_layout)
+
         # Start time input
         start_layout = QHBoxLayout()
         self.start_label = self.add_label(start_layout, "Start time (hh:mm:ss,fff):")
@@ -123,109 +147,105 @@ class SubtitleShifter(QWidget):
         self.ms_input_partial = self.add_input(ms_layout, "1000", 100)
         partial_layout.addLayout(ms_layout)
 
+        # Ranges to apply together in one pass
+        range_buttons_layout = QHBoxLayout()
+        self.add_range_button = self.add_button(range_buttons_layout, "Add Range", self.add_range)
+        self.clear_ranges_button = self.add_button(range_buttons_layout, "Clear Ranges", self.clear_ranges)
+        partial_layout.addLayout(range_buttons_layout)
+        self.range_list = QListWidget()
+        partial_layout.addWidget(self.range_list)
+
         # Shift button
         self.shift_button_partial = self.add_button(partial_layout, "Shift", self.partial_shift)
 
         self.stacked_widget.addWidget(self.partial_shift_widget)
 
-    def apply_theme(self):
-        # Retrieve the current palette colors
-        palette = self.parent().palette()
-        self.text_color = palette.color(QPalette.WindowText).name()
-        self.background_color = palette.color(QPalette.Window).name()
-        self.button_color = palette.color(QPalette.Button).name()
-        self.button_text_color = palette.color(QPalette.ButtonText).name()
-        self.highlight_color = palette.color(QPalette.Highlight).name()
-        self.hover_color = palette.color(QPalette.Highlight).darker().name()
-
-        text_size = self.config.get_text_size()
-        self.font_size = {
-            "small": 18,
-            "default": 26,
-            "large": 34,
-            "huge": 42
-        }.get(text_size, 26)
-
-        button_font_size = self.font_size
-        label_font_size = self.font_size
-        input_font_size = self.font_size
-
-        self.setStyleSheet(f"background-color: {self.background_color};")
-        self.file_preview.setStyleSheet(f"color: {self.text_color};")
-        self.file_preview_partial.setStyleSheet(f"color: {self.text_color};")
-        self.mode_label.setStyleSheet(f"color: {self.text_color};")
-        self.ms_label.setStyleSheet(f"color: {self.text_color};")
-        self.ms_label_partial.setStyleSheet(f"color: {self.text_color};")
-        self.start_label.setStyleSheet(f"color: {self.text_color};")
-        self.end_label.setStyleSheet(f"color: {self.text_color};")
-        self.ms_input.setStyleSheet(f"background-color: {self.background_color}; color: {self.text_color};")
-        self.ms_input_partial.setStyleSheet(f"background-color: {self.background_color}; color: {self.text_color};")
-        self.start_input.setStyleSheet(f"background-color: {self.background_color}; color: {self.text_color};")
-        self.end_input.setStyleSheet(f"background-color: {self.background_color}; color: {self.text_color};")
-
-        button_style = self.get_button_style()
-        self.back_button.setStyleSheet(button_style)
-        self.select_file_button.setStyleSheet(button_style)
-        self.select_file_button_partial.setStyleSheet(button_style)
-        self.shift_button.setStyleSheet(button_style)
-        self.shift_button_partial.setStyleSheet(button_style)
-        self.whole_shift_button.setStyleSheet(self.get_mode_button_style(selected=True))
-        self.partial_shift_button.setStyleSheet(self.get_mode_button_style(selected=False))
-
-    def get_button_style(self):
-        return f"""
-            QPushButton {{
-                border: 2px solid {self.highlight_color};
-                color: {self.button_text_color};
-                border-radius: 10px;
-                padding: 10px;
-                background-color: {self.button_color};
-            }}
-            QPushButton:hover {{
-                border-color: {self.hover_color};
-                background-color: {self.hover_color};
-            }}
-        """
-
-    def get_mode_button_style(self, selected):
-        if selected:
-            return f"background-color: {self.highlight_color}; color: {self.button_text_color}; border-radius: 5px; padding: 10px; font-size: {self.font_size}px;"
-        return f"background-color: {self.button_color}; color: {self.button_text_color}; border-radius: 5px; padding: 10px; font-size: {self.font_size}px;"
-
     def show_whole_shift(self):
         self.stacked_widget.setCurrentWidget(self.whole_shift_widget)
-        self.partial_shift_button.setStyleSheet(self.get_mode_button_style(selected=False))
-        self.whole_shift_button.setStyleSheet(self.get_mode_button_style(selected=True))
+        set_selected(self.partial_shift_button, False)
+        set_selected(self.whole_shift_button, True)
 
     def show_partial_shift(self):
         self.stacked_widget.setCurrentWidget(self.partial_shift_widget)
-        self.whole_shift_button.setStyleSheet(self.get_mode_button_style(selected=False))
-        self.partial_shift_button.setStyleSheet(self.get_mode_button_style(selected=True))
+        set_selected(self.whole_shift_button, False)
+        set_selected(self.partial_shift_button, True)
         
     def select_subtitle(self):
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Subtitle File", "", "Subtitle Files (*.srt)")
-        if file_path:
-            self.subtitle_path = file_path
-            self.file_preview.setText(os.path.basename(file_path))
-            self.file_preview_partial.setText(os.path.basename(file_path))
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Subtitle Files", "", "Subtitle Files (*.srt)")
+        if file_paths:
+            # Partial shift works on the first file, whole shift on all of them
+            self.subtitle_paths = file_paths
+            self.subtitle_path = file_paths[0]
+            preview = os.path.basename(file_paths[0]) if len(file_paths) == 1 else f"{len(file_paths)} files selected"
+            self.file_preview.setText(preview)
+            self.file_preview_partial.setText(os.path.basename(file_paths[0]))
 
     def whole_shift(self):
+        if self.job_progress.is_busy():
+            return
         ms_shift = int(self.ms_input.text())
-        if self.subtitle_path:
-            save_path, _ = QFileDialog.getSaveFileName(self, "Save Shifted Subtitles", "", "Subtitle Files (*.srt)")
-            if save_path:
-                shift_subtitle(self.subtitle_path, ms_shift, save_path)
-                self.show_success_message("Subtitles shifted successfully!")
+        if not self.subtitle_paths:
+            return
+        # Plan every output path up front, then shift the files in parallel in the background
+        outputs = self.batch_output.plan(self.subtitle_paths)
+        if outputs is None:
+            return
+        jobs = [(file_path, ms_shift, save_path) for file_path, save_path in outputs if save_path]
+        self.job_progress.run(run_parallel, shift_subtitle, jobs,
+                              on_finished=lambda shifted: self.show_success_message(self.batch_output.summary(shifted, outputs)),
+                              on_failed=self.show_error_message)
+
+    def by_cue_number(self):
+        return self.range_type_dropdown.currentText() == "Cue number"
+
+    def update_range_type(self):
+        if self.by_cue_number():
+            self.start_label.setText("First cue number:")
+            self.end_label.setText("Last cue number:")
+            self.start_input.setPlaceholderText("1")
+            self.end_input.setPlaceholderText("1")
+        else:
+            self.start_label.setText("Start time (hh:mm:ss,fff):")
+            self.end_label.setText("End time (hh:mm:ss,fff):")
+            self.start_input.setPlaceholderText("00:00:00,000")
+            self.end_input.setPlaceholderText("00:00:00,000")
+        self.start_input.clear()
+        self.end_input.clear()
+        self.clear_ranges()
+
+    def current_range(self):
+        parse = int if self.by_cue_number() else parse_srt_time
+        return parse(self.start_input.text()), parse(self.end_input.text()), int(self.ms_input_partial.text())
+
+    def add_range(self):
+        try:
+            shift_range = self.current_range()
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Please enter a valid range and shift.")
+            return
+        self.shift_ranges.append(shift_range)
+        self.range_list.addItem(f"{self.start_input.text()} - {self.end_input.text()}: {shift_range[2]:+d} ms")
+
+    def clear_ranges(self):
+        self.shift_ranges = []
+        self.range_list.clear()
 
     def partial_shift(self):
-        start_time = self.start_input.text()
-        end_time = self.end_input.text()
-        ms_shift = int(self.ms_input_partial.text())
-        if self.subtitle_path:
+        try:
+            # Without added ranges, shift the range currently typed in
+            ranges = self.shift_ranges or [self.current_range()]
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Please enter a valid range and shift.")
+            return
+        if self.subtitle_path and not self.job_progress.is_busy():
             save_path, _ = QFileDialog.getSaveFileName(self, "Save Shifted Subtitles", "", "Subtitle Files (*.srt)")
             if save_path:
-                shift_subtitle_partial(self.subtitle_path, start_time, end_time, ms_shift, save_path)
-                self.show_success_message("Subtitles shifted successfully!")
+                self.job_progress.run(shift_subtitle_ranges, self.subtitle_path, ranges, save_path, by_number=self.by_cue_number(),
+                                      on_finished=lambda _: self.show_success_message("Subtitles shifted successfully!"),
+                                      on_failed=self.show_error_message)
+
+    def show_error_message(self, message):
+        QMessageBox.critical(self, "Error", f"An error occurred while shifting the subtitles.\n\n{message}")
 
     def show_success_message(self, message):
         msg_box = QMessageBox()
@@ -241,6 +261,8 @@ class SubtitleShifter(QWidget):
         msg_box.exec_()
 
     def format_time_input(self, input_box):
+        if self.by_cue_number():
+            return
         text = input_box.text()
         formatted_text = text[:]
         if len(text) > 2 and text[2] != ':':
@@ -251,57 +273,3 @@ class SubtitleShifter(QWidget):
             formatted_text = text[:8] + ',' + text[8:]
         if text != formatted_text:
             input_box.setText(formatted_text)
-
-def shift_subtitle(file_path, ms_shift, save_path):
-    with open(file_path, 'r') as file:
-        content = file.readlines()
-
-    shifted_content = []
-    for line in content:
-        if '-->' in line:
-            start, end = line.split(' --> ')
-            new_start = shift_time(start, ms_shift)
-            new_end = shift_time(end, ms_shift)
-            shifted_content.append(f'{new_start} --> {new_end}\n')
-        else:
-            shifted_content.append(line)
-
-    with open(save_path, 'w') as file:
-        file.writelines(shifted_content)
-
-def shift_subtitle_partial(file_path, start_time, end_time, ms_shift, save_path):
-    with open(file_path, 'r') as file:
-        content = file.readlines()
-
-    shifted_content = []
-    for line in content:
-        if '-->' in line:
-            start, end = line.split(' --> ')
-            if start >= start_time and end <= end_time:
-                new_start = shift_time(start, ms_shift)
-                new_end = shift_time(end, ms_shift)
-                shifted_content.append(f'{new_start} --> {new_end}\n')
-            else:
-                shifted_content.append(line)
-        else:
-            shifted_content.append(line)
-
-    with open(save_path, 'w') as file:
-        file.writelines(shifted_content)
-
-def shift_time(time_str, ms_shift):
-    time_pattern = re.compile(r'(\d+):(\d+):(\d+),(\d+)')
-    match = time_pattern.match(time_str)
-    if match:
-        hours, minutes, seconds, milliseconds = map(int, match.groups())
-        total_ms = (hours * 3600 + minutes * 60 + seconds) * 1000 + milliseconds + ms_shift
-
-        new_hours = total_ms // 3600000
-        total_ms %= 3600000
-        new_minutes = total_ms // 60000
-        total_ms %= 60000
-        new_seconds = total_ms // 1000
-        new_ms = total_ms % 1000
-
-        return f'{new_hours:02}:{new_minutes:02}:{new_seconds:02},{new_ms:03}'
-    return time_str
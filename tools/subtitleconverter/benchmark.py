@@ -0,0 +1,33 @@
+"""Times every registered reader and writer on the same synthetic cue list.
+
+Run with: python -m tools.subtitleconverter.benchmark [cue_count]
+"""
+import sys
+import time
+from ..cuestore import CueStore
+from .engine import READERS, WRITERS, supported_formats
+
+def build_store(cue_count):
+    """Builds a store of two-line cues spaced three seconds apart."""
+    store = CueStore()
+    for index in range(cue_count):
+        start = index * 3000
+        store.append(start, start + 2500, f"Line {index} of the benchmark\nsecond line & more")
+    return store
+
+def run(cue_count=50000):
+    """Prints write and read throughput for every supported format."""
+    store = build_store(cue_count)
+    print(f"{'format':<8}{'write ms':>10}{'read ms':>10}{'MB/s read':>12}{'cues':>8}")
+    for format in supported_formats():
+        started = time.perf_counter()
+        content = "".join(WRITERS[format](store))
+        written = time.perf_counter()
+        parsed = READERS[format](content)
+        finished = time.perf_counter()
+        megabytes = len(content.encode('utf-8')) / 1e6
+        print(f"{format:<8}{(written - started) * 1000:>10.0f}{(finished - written) * 1000:>10.0f}"
+              f"{megabytes / (finished - written):>12.1f}{len(parsed):>8}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
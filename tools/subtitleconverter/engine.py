@@ -0,0 +1,125 @@
+"""Hub-and-spoke subtitle conversion.
+
+Every format registers one reader, which parses content into a CueStore, and
+one writer, which yields a CueStore back as chunks of text. Converting between
+any two formats goes through the store, so adding a format means adding one
+reader and one writer instead of a function for every other format.
+Format modules are imported the first time their format is used.
+"""
+
+import os
+from importlib import import_module
+
+# Bump whenever a reader or writer changes its output, so cached conversion results are not reused
+CONVERTER_VERSION = 1
+
+READERS = {}
+WRITERS = {}
+# Optional readers that take a file path, for formats that can map the file instead of reading it
+FILE_READERS = {}
+
+# Buffer size for files written by save(), so output reaches the disk in large writes
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Module that registers the reader and writer of each format
+FORMAT_MODULES = {
+    "ass": "ass_converter", "cap": "cap_converter", "dfxp": "dfp_converter", "lrc": "lrc_converter",
+    "mpl": "mpl_converter", "rt": "rt_converter", "sbv": "sbv_converter", "srt": "srt_converter",
+    "ssa": "ssa_converter", "stl": "stl_converter", "sub": "sub_converter", "ttml": "ttml_converter",
+    "txt": "txt_converter", "usf": "usf_converter", "vtt": "vtt_converter",
+}
+
+def reader(format):
+    """Registers the decorated function as the reader for a format."""
+    def register(function):
+        READERS[format] = function
+        return function
+    return register
+
+def file_reader(format):
+    """Registers the decorated function as the file reader for a format."""
+    def register(function):
+        FILE_READERS[format] = function
+        return function
+    return register
+
+def writer(format):
+    """Registers the decorated function as the writer for a format."""
+    def register(function):
+        WRITERS[format] = function
+        return function
+    return register
+
+def supported_formats():
+    """Returns the formats that can be both read and written."""
+    _load_formats()
+    return sorted(set(READERS) & set(WRITERS))
+
+def read(content, format):
+    """Parses subtitle content in the given format into a CueStore."""
+    _load_format(format)
+    try:
+        read_function = READERS[format]
+    except KeyError:
+        raise ValueError(f"Unsupported source format: {format}") from None
+    return read_function(content)
+
+def load(file_path, format, save_path=None):
+    """Loads a subtitle file in the given format into a CueStore.
+
+    Formats with a file reader are memory-mapped and decode their text lazily;
+    pass save_path so a file that is about to be overwritten is read eagerly.
+    Close the returned store (or use it as a context manager) when done.
+    """
+    _load_format(format)
+    if format in FILE_READERS:
+        return FILE_READERS[format](file_path, save_path)
+    with open(file_path, 'r', encoding='utf-8-sig') as file:
+        return read(file.read(), format)
+
+def iter_chunks(store, format):
+    """Yields a CueStore as chunks of subtitle content in the given format."""
+    _load_format(format)
+    try:
+        write_function = WRITERS[format]
+    except KeyError:
+        raise ValueError(f"Unsupported target format: {format}") from None
+    return write_function(store)
+
+def write(store, format):
+    """Formats a CueStore as subtitle content in the given format."""
+    return "".join(iter_chunks(store, format))
+
+def dump(store, format, stream):
+    """Streams a CueStore in the given format to a text file-like object."""
+    stream.writelines(iter_chunks(store, format))
+
+def save(store, format, file_path, encoding='utf-8'):
+    """Writes a CueStore in the given format to a file without building the whole output in memory.
+
+    The output replaces the file only once it is complete, so a failed or
+    cancelled write leaves any existing file intact.
+    """
+    temp_path = f"{file_path}.part"
+    try:
+        with open(temp_path, 'w', encoding=encoding, buffering=WRITE_BUFFER_SIZE) as stream:
+            dump(store, format, stream)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def convert(content, source_format, target_format):
+    """Converts subtitle content from one format to another."""
+    return write(read(content, source_format), target_format)
+
+def _load_format(format):
+    # Importing a format module registers its reader and writer; later calls hit the module cache
+    module = FORMAT_MODULES.get(format)
+    if module is not None:
+        import_module(f".{module}", __package__)
+
+def _load_formats():
+    for format in FORMAT_MODULES:
+        _load_format(format)
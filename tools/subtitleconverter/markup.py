@@ -0,0 +1,31 @@
+import re
+from html import escape, unescape
+
+ATTRIBUTE_PATTERN = re.compile(r'([\w:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+BREAK_PATTERN = re.compile(r'<br\s*/?>', re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+def iter_elements(content, tag):
+    """Yields (attributes, inner markup) for every <tag ...>...</tag> element, ignoring namespace prefixes."""
+    pattern = re.compile(rf'<(?:[\w-]+:)?{tag}\b([^>]*)>(.*?)</(?:[\w-]+:)?{tag}\s*>', re.DOTALL | re.IGNORECASE)
+    for match in pattern.finditer(content):
+        yield parse_attributes(match.group(1)), match.group(2)
+
+def parse_attributes(source):
+    """Parses XML attributes into a dict keyed by lower-case local name."""
+    attributes = {}
+    for name, double_quoted, single_quoted in ATTRIBUTE_PATTERN.findall(source):
+        local_name = name.rpartition(':')[2].lower()
+        attributes[local_name] = double_quoted or single_quoted
+    return attributes
+
+def markup_to_text(markup):
+    """Converts inline subtitle markup into plain text with newline line breaks."""
+    text = unescape(TAG_PATTERN.sub('', BREAK_PATTERN.sub('\n', markup)))
+    # Whitespace inside XML text is not significant, only explicit breaks are
+    return '\n'.join(' '.join(line.split()) for line in text.split('\n'))
+
+def text_to_markup(text):
+    """Escapes plain text for XML and turns line breaks into <br/> elements."""
+    # html.escape without quotes matches xml.sax.saxutils.escape but skips its slow import
+    return escape(text, quote=False).replace('\n', '<br/>')
@@ -0,0 +1,110 @@
+"""Subtitle format detection from the start of a file.
+
+Only the first SNIFF_BYTES of a file are read. Every format has signatures:
+header patterns, which identify a format from a single match, and cue
+patterns, which only reach their full weight after a few matching lines. Each
+format's confidence is the best score among its signatures, and a matching
+file extension breaks ties between formats the content fits equally well.
+
+Formats are named after the reader that parses them, so MicroDVD
+"{start}{end}text" lines are reported as "mpl" and SubViewer as "sub".
+"""
+
+import os
+import re
+
+# Source format that asks for the format to be detected per file
+AUTO_FORMAT = "auto"
+
+# Bytes read from the start of a file; enough for any header and several cues
+SNIFF_BYTES = 8192
+# Matching lines a cue pattern needs for its full weight
+MIN_CUES = 3
+# Confidence below which a file is not trusted to be in any format
+MIN_CONFIDENCE = 0.5
+# Added to formats whose extension matches the file name
+EXTENSION_BONUS = 0.05
+# Confidence of plain text, the fallback for readable content that matches nothing else
+TXT_CONFIDENCE = 0.2
+
+HEADER = "header"
+CUE = "cue"
+
+# (format, kind, weight, pattern)
+SIGNATURES = [
+    ("vtt", HEADER, 1.0, re.compile(r'\AWEBVTT')),
+    ("vtt", CUE, 0.6, re.compile(r'^(?:\d+:)?\d{2}:\d{2}\.\d{3}[ \t]+-->[ \t]+', re.MULTILINE)),
+    ("srt", CUE, 0.95, re.compile(r'^\d+[ \t]*\r?\n\d{1,2}:\d{2}:\d{2}[,.]\d{1,3}[ \t]*-->', re.MULTILINE)),
+    ("ass", HEADER, 1.0, re.compile(r'^(?:ScriptType:[ \t]*v4\.00\+|\[V4\+ Styles\])', re.MULTILINE | re.IGNORECASE)),
+    ("ssa", HEADER, 1.0, re.compile(r'^(?:ScriptType:[ \t]*v4\.00[ \t]*\r?$|\[V4 Styles\])', re.MULTILINE | re.IGNORECASE)),
+    ("ass", HEADER, 0.8, re.compile(r'^\[(?:Script Info|Events)\]', re.MULTILINE | re.IGNORECASE)),
+    ("ssa", HEADER, 0.75, re.compile(r'^\[(?:Script Info|Events)\]', re.MULTILINE | re.IGNORECASE)),
+    ("ass", CUE, 0.7, re.compile(r'^Dialogue:', re.MULTILINE)),
+    ("sbv", CUE, 0.9, re.compile(r'^\d+:\d{2}:\d{2}\.\d{3},\d+:\d{2}:\d{2}\.\d{3}[ \t]*\r?$', re.MULTILINE)),
+    ("sub", HEADER, 0.95, re.compile(r'^\[(?:INFORMATION|END INFORMATION|SUBTITLE)\]', re.MULTILINE)),
+    ("sub", CUE, 0.85, re.compile(r'^\d{2}:\d{2}:\d{2}\.\d{2},\d{2}:\d{2}:\d{2}\.\d{2}[ \t]*\r?$', re.MULTILINE)),
+    ("dfxp", HEADER, 1.0, re.compile(r'<tt[\s>][^>]*ttaf1', re.IGNORECASE)),
+    ("ttml", HEADER, 0.95, re.compile(r'<tt[\s>]', re.IGNORECASE)),
+    ("dfxp", HEADER, 0.95, re.compile(r'<tt[\s>]', re.IGNORECASE)),
+    ("usf", HEADER, 1.0, re.compile(r'<(?:USFSubtitles|usf)[\s>]', re.IGNORECASE)),
+    ("rt", HEADER, 0.9, re.compile(r'<(?:window|rt)[\s>]', re.IGNORECASE)),
+    ("rt", CUE, 0.8, re.compile(r'<Time\s+begin\s*=', re.IGNORECASE)),
+    ("stl", HEADER, 0.9, re.compile(r'^\$(?:FontName|FontSize|TapeOffset|HorzAlign|VertAlign)', re.MULTILINE | re.IGNORECASE)),
+    ("stl", CUE, 0.9, re.compile(r'^\d+:\d{1,2}:\d{1,2}[:.]\d{1,3}[ \t]*,[ \t]*\d+:\d{1,2}:\d{1,2}[:.]\d{1,3}[ \t]*,', re.MULTILINE)),
+    ("stl", CUE, 0.9, re.compile(r'<Subtitle\s[^>]*TC_IN\s*=', re.IGNORECASE)),
+    ("cap", CUE, 0.9, re.compile(r'^\d{2}:\d{2}:\d{2}:\d{2}[ \t]*-[ \t]*\d{2}:\d{2}:\d{2}:\d{2}', re.MULTILINE)),
+    ("mpl", CUE, 0.9, re.compile(r'^\{\d+\}\{\d*\}', re.MULTILINE)),
+    ("mpl", CUE, 0.9, re.compile(r'^\[\d+\]\[\d*\]', re.MULTILINE)),
+    ("lrc", HEADER, 0.9, re.compile(r'^\[(?:ar|ti|al|au|by|re|ve|offset|length):', re.MULTILINE | re.IGNORECASE)),
+    ("lrc", CUE, 0.85, re.compile(r'^\[\d+:\d{1,2}(?:[.:]\d{1,3})?\]', re.MULTILINE)),
+]
+
+def sniff(content, file_name=None):
+    """Returns (format, confidence) pairs for text content, most likely first.
+
+    Confidences are between 0 and 1; formats with no evidence are left out.
+    """
+    content = content.lstrip('\ufeff')
+    scores = {}
+    for fmt, kind, weight, pattern in SIGNATURES:
+        if kind == HEADER:
+            score = weight if pattern.search(content) else 0.0
+        else:
+            hits = 0
+            for _ in pattern.finditer(content):
+                hits += 1
+                if hits == MIN_CUES:
+                    break
+            # One cue is already good evidence, so a file with a single cue is still detected
+            score = weight * (hits + MIN_CUES) / (2 * MIN_CUES) if hits else 0.0
+        if score > scores.get(fmt, 0.0):
+            scores[fmt] = score
+    extension = os.path.splitext(file_name)[1][1:].lower() if file_name else ""
+    if content.strip() and '\x00' not in content:
+        # Plain text fits any readable content, so it is only trusted for .txt files
+        scores["txt"] = MIN_CONFIDENCE if extension == "txt" else TXT_CONFIDENCE
+    if extension in scores:
+        scores[extension] = min(1.0, scores[extension] + EXTENSION_BONUS)
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+def read_prefix(file_path, size=SNIFF_BYTES):
+    """Returns the first size bytes of a file decoded as text."""
+    with open(file_path, 'rb') as file:
+        data = file.read(size)
+    # A multi-byte character cut off at the end of the prefix decodes as a replacement character
+    return data.decode('utf-8-sig', 'replace')
+
+def sniff_file(file_path):
+    """Returns (format, confidence) pairs for a file, most likely first, from its first SNIFF_BYTES."""
+    return sniff(read_prefix(file_path), os.path.basename(file_path))
+
+def detect_format(file_path):
+    """Returns the most likely format of a file; raises ValueError when no format is likely enough."""
+    candidates = sniff_file(file_path)
+    if not candidates or candidates[0][1] < MIN_CONFIDENCE:
+        raise ValueError(f"Could not detect the subtitle format of {file_path}")
+    return candidates[0][0]
+
+def resolve_format(file_path, format):
+    """Returns format, or the detected format of the file when format is AUTO_FORMAT."""
+    return detect_format(file_path) if format == AUTO_FORMAT else format
@@ -0,0 +1,27 @@
+from ..cuestore import CueStore
+from .engine import reader, writer
+
+# Plain text has no timing, so every paragraph gets a fixed slot
+TXT_CUE_DURATION_MS = 2000
+
+@reader("txt")
+def read_txt(content):
+    """Parses plain text into a CueStore, one cue per paragraph."""
+    store = CueStore()
+    paragraph = []
+    for line in content.splitlines() + ['']:
+        line = line.strip()
+        if line:
+            paragraph.append(line)
+        elif paragraph:
+            start = len(store) * TXT_CUE_DURATION_MS
+            store.append(start, start + TXT_CUE_DURATION_MS, '\n'.join(paragraph))
+            paragraph = []
+    return store
+
+@writer("txt")
+def write_txt(store):
+    """Yields a CueStore as plain text, one paragraph per cue."""
+    for index, text in enumerate(store.texts()):
+        separator = "\n" if index else ""
+        yield f"{separator}{text}\n"
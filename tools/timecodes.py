@@ -0,0 +1,245 @@
+"""Integer-millisecond timestamp codec shared by the tools and the converters.
+
+Every clock string is parsed straight to int milliseconds and formatted back
+from them. Fixed-width fields go through small lookup tables instead of int()
+and format specs, and the batch functions use NumPy when it is installed.
+"""
+import re
+from array import array
+
+# Frame rate assumed by the frame-based formats (CAP, STL, MicroDVD)
+DEFAULT_FRAME_RATE = 25
+
+# Below this many values the NumPy round trip costs more than it saves
+NUMPY_MIN_BATCH = 256
+# Values formatted per batch when streaming, so memory stays flat
+FORMAT_BATCH_SIZE = 4096
+
+# Lookup tables for the fixed-width HH:MM:SS,mmm fields, keyed by bytes for the
+# tokenizers and by str for parsed strings
+HOURS_MINUTES_MS = {b'%02d:%02d' % (h, m): (h * 60 + m) * 60000 for h in range(100) for m in range(60)}
+SECONDS_MS = {b'%02d' % s: s * 1000 for s in range(60)}
+MILLIS = {b'%03d' % ms: ms for ms in range(1000)}
+_HOURS_MINUTES_STR = {key.decode(): value for key, value in HOURS_MINUTES_MS.items()}
+_SECONDS_STR = {key.decode(): value for key, value in SECONDS_MS.items()}
+_MILLIS_STR = {key.decode(): value for key, value in MILLIS.items()}
+_TWO_DIGITS = [f"{n:02}" for n in range(100)]
+_THREE_DIGITS = [f"{n:03}" for n in range(1000)]
+
+CLOCK_PATTERN = re.compile(r'(?:(\d+):)?(\d{1,2}):(\d{1,2})(?:[.,](\d+))?')
+FRAME_CLOCK_PATTERN = re.compile(r'(\d+):(\d{1,2}):(\d{1,2})[:;.](\d{1,3})')
+LRC_TIME_PATTERN = re.compile(r'(\d+):(\d{1,2})(?:[.:](\d{1,3}))?')
+TTML_OFFSET_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(h|ms|m|s|f|t)')
+TTML_OFFSET_UNITS_MS = {'h': 3600000, 'm': 60000, 's': 1000, 'ms': 1}
+
+_numpy = None
+
+def get_numpy():
+    """Imports NumPy on first use, returning None when it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+def try_parse_clock(timestamp):
+    """Parses an [H:]MM:SS[.fff] clock value into milliseconds, or returns None if it is not one."""
+    match = CLOCK_PATTERN.fullmatch(timestamp.strip())
+    if not match:
+        return None
+    hours, minutes, seconds, fraction = match.groups()
+    millis = int((fraction or '0')[:3].ljust(3, '0'))
+    return ((int(hours or 0) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + millis
+
+def parse_clock(timestamp):
+    """Parses an [H:]MM:SS[.fff] clock value into milliseconds."""
+    ms = try_parse_clock(timestamp)
+    if ms is None:
+        raise ValueError(f"Invalid timestamp: {timestamp}")
+    return ms
+
+def format_clock(ms, separator='.', digits=3, hour_digits=2):
+    """Formats milliseconds as an HH:MM:SS.fff clock value."""
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    hours = _TWO_DIGITS[hours] if hour_digits == 2 and hours < 100 else f"{hours:0{hour_digits}}"
+    return f"{hours}:{_TWO_DIGITS[minutes]}:{_TWO_DIGITS[seconds]}{separator}{_THREE_DIGITS[millis][:digits]}"
+
+def parse_srt_time(timestamp):
+    """Parses an HH:MM:SS,mmm timestamp into milliseconds."""
+    if len(timestamp) == 12:
+        try:
+            return _HOURS_MINUTES_STR[timestamp[0:5]] + _SECONDS_STR[timestamp[6:8]] + _MILLIS_STR[timestamp[9:12]]
+        except KeyError:
+            pass
+    return parse_clock(timestamp)
+
+def format_srt_time(ms):
+    """Formats milliseconds as an HH:MM:SS,mmm timestamp."""
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours < 100:
+        return f"{_TWO_DIGITS[hours]}:{_TWO_DIGITS[minutes]}:{_TWO_DIGITS[seconds]},{_THREE_DIGITS[millis]}"
+    return f"{hours}:{_TWO_DIGITS[minutes]}:{_TWO_DIGITS[seconds]},{_THREE_DIGITS[millis]}"
+
+def format_vtt_time(ms):
+    """Formats milliseconds as an HH:MM:SS.mmm timestamp."""
+    return format_clock(ms)
+
+def format_ass_time(ms):
+    """Formats milliseconds as an H:MM:SS.cc timestamp."""
+    return format_clock(ms, digits=2, hour_digits=1)
+
+def format_sbv_time(ms):
+    """Formats milliseconds as an H:MM:SS.mmm timestamp."""
+    return format_clock(ms, hour_digits=1)
+
+def format_subviewer_time(ms):
+    """Formats milliseconds as an HH:MM:SS.cc timestamp."""
+    return format_clock(ms, digits=2)
+
+def parse_lrc_time(timestamp):
+    """Parses an LRC mm:ss.xx timestamp into milliseconds."""
+    match = LRC_TIME_PATTERN.fullmatch(timestamp.strip())
+    if not match:
+        raise ValueError(f"Invalid LRC timestamp: {timestamp}")
+    minutes, seconds, fraction = match.groups()
+    return (int(minutes) * 60 + int(seconds)) * 1000 + int((fraction or '0').ljust(3, '0'))
+
+def format_lrc_time(ms):
+    """Formats milliseconds as an LRC mm:ss.xx timestamp."""
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    minutes = _TWO_DIGITS[minutes] if minutes < 100 else str(minutes)
+    return f"{minutes}:{_TWO_DIGITS[seconds]}.{_TWO_DIGITS[millis // 10]}"
+
+def frames_to_ms(frames, fps=DEFAULT_FRAME_RATE):
+    """Converts a frame number into milliseconds."""
+    return round(frames * 1000 / fps)
+
+def ms_to_frames(ms, fps=DEFAULT_FRAME_RATE):
+    """Converts milliseconds into a frame number."""
+    return int(ms * fps / 1000)
+
+def parse_frame_clock(timestamp, fps=DEFAULT_FRAME_RATE):
+    """Parses an HH:MM:SS:FF timecode into milliseconds."""
+    match = FRAME_CLOCK_PATTERN.fullmatch(timestamp.strip())
+    if not match:
+        raise ValueError(f"Invalid timecode: {timestamp}")
+    hours, minutes, seconds, frames = map(int, match.groups())
+    return ((hours * 60 + minutes) * 60 + seconds) * 1000 + frames_to_ms(frames, fps)
+
+def format_frame_clock(ms, fps=DEFAULT_FRAME_RATE):
+    """Formats milliseconds as an HH:MM:SS:FF timecode."""
+    seconds, millis = divmod(ms, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02}:{_TWO_DIGITS[minutes]}:{_TWO_DIGITS[seconds]}:{ms_to_frames(millis, fps):02}"
+
+def parse_ttml_time(value, fps=DEFAULT_FRAME_RATE, tick_rate=1):
+    """Parses a TTML clock time or offset time expression into milliseconds."""
+    value = value.strip()
+    if value.startswith('t') and value.endswith('s') and ':' in value:
+        value = value[1:-1]  # t00:00:01.000s, as written by older versions of this tool
+    if ':' in value:
+        parts = value.split(':')
+        if len(parts) == 4:
+            hours, minutes, seconds, frames = parts
+            return parse_clock(f"{hours}:{minutes}:{seconds}") + frames_to_ms(float(frames), fps)
+        return parse_clock(value)
+    match = TTML_OFFSET_PATTERN.fullmatch(value)
+    if not match:
+        raise ValueError(f"Invalid time expression: {value}")
+    amount, unit = float(match.group(1)), match.group(2)
+    if unit == 'f':
+        return frames_to_ms(amount, fps)
+    if unit == 't':
+        return round(amount * 1000 / tick_rate)
+    return round(amount * TTML_OFFSET_UNITS_MS[unit])
+
+# (parse, format) per clock style
+CODECS = {
+    "srt": (parse_srt_time, format_srt_time),
+    "vtt": (parse_clock, format_vtt_time),
+    "ass": (parse_clock, format_ass_time),
+    "ssa": (parse_clock, format_ass_time),
+    "sbv": (parse_clock, format_sbv_time),
+    "sub": (parse_clock, format_subviewer_time),
+    "lrc": (parse_lrc_time, format_lrc_time),
+    "rt": (parse_clock, format_vtt_time),
+    "usf": (parse_clock, format_vtt_time),
+    "ttml": (parse_ttml_time, format_vtt_time),
+    "dfxp": (parse_ttml_time, format_vtt_time),
+    "cap": (parse_frame_clock, format_frame_clock),
+    "stl": (parse_frame_clock, format_frame_clock),
+}
+
+# Fixed-width clock styles the NumPy path handles: separator before the milliseconds
+_FIXED_WIDTH_SEPARATORS = {"srt": ",", "vtt": ".", "rt": ".", "usf": ".", "ttml": ".", "dfxp": "."}
+
+def parse_times(timestamps, format="srt"):
+    """Parses a sequence of clock strings into an array of int milliseconds."""
+    timestamps = list(timestamps)
+    if format in _FIXED_WIDTH_SEPARATORS and len(timestamps) >= NUMPY_MIN_BATCH:
+        parsed = _parse_fixed_width_numpy(timestamps)
+        if parsed is not None:
+            return parsed
+    parse = CODECS[format][0]
+    return array('q', [parse(timestamp) for timestamp in timestamps])
+
+def format_times(values, format="srt"):
+    """Formats a sequence of int milliseconds into a list of clock strings."""
+    separator = _FIXED_WIDTH_SEPARATORS.get(format)
+    if separator is not None and len(values) >= NUMPY_MIN_BATCH:
+        formatted = _format_fixed_width_numpy(values, separator)
+        if formatted is not None:
+            return formatted
+    format_time = CODECS[format][1]
+    return [format_time(value) for value in values]
+
+def iter_formatted_times(values, format="srt", batch_size=FORMAT_BATCH_SIZE):
+    """Yields formatted clock strings for a sequence of int milliseconds, one batch at a time."""
+    for offset in range(0, len(values), batch_size):
+        yield from format_times(values[offset:offset + batch_size], format)
+
+def _parse_fixed_width_numpy(timestamps):
+    numpy = get_numpy()
+    if numpy is None:
+        return None
+    try:
+        data = "".join(timestamps).encode('ascii')
+    except UnicodeEncodeError:
+        return None
+    if len(data) != 12 * len(timestamps):
+        return None
+    digits = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, 12).astype(numpy.int64) - 48
+    fields = digits[:, [0, 1, 3, 4, 6, 7, 9, 10, 11]]
+    # Reject anything that is not HH:MM:SS,mmm / HH:MM:SS.mmm
+    if ((fields < 0) | (fields > 9)).any() or (digits[:, 2] != 10).any() or (digits[:, 5] != 10).any():
+        return None
+    if not numpy.isin(digits[:, 8], (ord(',') - 48, ord('.') - 48)).all():
+        return None
+    weights = numpy.array([36000000, 3600000, 600000, 60000, 10000, 1000, 100, 10, 1], dtype=numpy.int64)
+    return array('q', (fields @ weights).tobytes())
+
+def _format_fixed_width_numpy(values, separator):
+    numpy = get_numpy()
+    if numpy is None:
+        return None
+    ms = numpy.asarray(values, dtype=numpy.int64)
+    if ms.size and (ms.min() < 0 or ms.max() >= 100 * 3600000):
+        return None
+    out = numpy.empty((ms.size, 12), dtype=numpy.uint8)
+    out[:, 2] = out[:, 5] = ord(':')
+    out[:, 8] = ord(separator)
+    # Split into digits, most significant first, and place them around the separators
+    for column, divisor, modulus in ((0, 36000000, 10), (1, 3600000, 10), (3, 600000, 6), (4, 60000, 10),
+                                     (6, 10000, 6), (7, 1000, 10), (9, 100, 10), (10, 10, 10), (11, 1, 10)):
+        out[:, column] = ms // divisor % modulus + 48
+    text = out.tobytes().decode('ascii')
+    return [text[offset:offset + 12] for offset in range(0, len(text), 12)]